@@ -4,17 +4,244 @@ Heroes of Might & Magic III Adaptive AI
 AI that learns, adapts, and creates novel strategies based on game conditions
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
-import time
-import pyautogui
 import random
 import json
-import numpy as np
+import bisect
 from datetime import datetime
 import pickle
 import os
+import hashlib
+from collections import deque, OrderedDict
+from types import MappingProxyType
+
+# Tactic choices the bandit can make, grouped into decision slots
+TACTIC_SLOTS = {
+    "early_resource": (
+        ("aggressive_resource_monopolization",),
+        ("efficient_resource_conservation",),
+        ("balanced_resource_acquisition",)
+    ),
+    "early_military": (
+        ("early_military_preparation",),
+        ("rapid_expansion",),
+        ()
+    ),
+    "mid_balance": (
+        ("economic_acceleration", "delayed_military_buildup"),
+        ("immediate_military_focus", "territorial_defense")
+    ),
+    "mid_enemy": (
+        ("counter_aggressive_positioning",),
+        ("economic_disruption",),
+        ("pressure_application",),
+        ()
+    ),
+    "late_victory": (
+        ("territorial_consolidation",),
+        ("decisive_strike",),
+        ("gradual_dominance",)
+    ),
+    "counter_tactics": (
+        ("early_defense", "economic_buildup", "counter_attack"),
+        ("economic_advantage", "map_control", "slow_pressure"),
+        ("early_harassment", "resource_denial", "military_pressure"),
+        ("selective_blocking", "quality_over_quantity", "strategic_retreats")
+    )
+}
+
+PHASE_SLOTS = {
+    "early": ("early_resource", "early_military"),
+    "mid": ("mid_balance", "mid_enemy"),
+    "late": ("late_victory",)
+}
+
+GAME_PHASES = ("early", "mid", "late")
+ENEMY_PATTERNS = ("aggressive", "defensive", "economic", "rush", "turtle",
+                  "balanced", "aggressive_expansion", "predictable")
+NUMERIC_FACTORS = ("resource_abundance", "military_pressure", "expansion_opportunities",
+                   "economic_potential", "map_control")
+
+np = None  # numpy, bound by load_numpy once the bandit is first used
+
+def load_numpy():
+    """Import numpy on first use, keeping it off the CLI startup path"""
+    global np
+    if np is None:
+        import numpy
+        np = numpy
+    return np
+
+def situation_features(factors):
+    """Encode situation factors as a bandit context vector"""
+    load_numpy()
+    features = np.zeros(1 + len(NUMERIC_FACTORS) + len(GAME_PHASES) + len(ENEMY_PATTERNS))
+    features[0] = 1.0  # Bias term
+    for i, name in enumerate(NUMERIC_FACTORS):
+        features[1 + i] = factors.get(name, 0.0)
+    offset = 1 + len(NUMERIC_FACTORS)
+    if factors.get("game_phase") in GAME_PHASES:
+        features[offset + GAME_PHASES.index(factors["game_phase"])] = 1.0
+    offset += len(GAME_PHASES)
+    if factors.get("enemy_behavior_pattern") in ENEMY_PATTERNS:
+        features[offset + ENEMY_PATTERNS.index(factors["enemy_behavior_pattern"])] = 1.0
+    return features
+
+class TacticBandit:
+    """LinUCB contextual bandit choosing tactics per decision slot"""
+    
+    def __init__(self, slots=TACTIC_SLOTS, alpha=0.5):
+        self.slots = slots
+        self.alpha = alpha
+        self.n_features = 1 + len(NUMERIC_FACTORS) + len(GAME_PHASES) + len(ENEMY_PATTERNS)
+        
+        # Arrays are allocated on first use so importing numpy stays off the startup path;
+        # methods reading them use the np that reset bound
+        self.A_inv = None
+        self.b = None
+        self.theta = None
+    
+    def ensure_arrays(self):
+        """Allocate the per-arm statistics if they do not exist yet"""
+        if self.A_inv is None:
+            self.reset()
+    
+    def reset(self):
+        """Forget everything learned so far"""
+        load_numpy()
+        d = self.n_features
+        self.A_inv = {slot: np.tile(np.eye(d), (len(arms), 1, 1)) for slot, arms in self.slots.items()}
+        self.b = {slot: np.zeros((len(arms), d)) for slot, arms in self.slots.items()}
+        self.theta = {slot: np.zeros((len(arms), d)) for slot, arms in self.slots.items()}
+    
+    def select(self, slot, context):
+        """Pick the arm with the highest upper confidence bound"""
+        self.ensure_arrays()
+        A_inv = self.A_inv[slot]
+        mean = self.theta[slot] @ context
+        variance = np.einsum("i,aij,j->a", context, A_inv, context)
+        return int(np.argmax(mean + self.alpha * np.sqrt(variance)))
+    
+    def update(self, slot, arm, context, reward):
+        """Sherman-Morrison rank-one update of a single arm"""
+        self.ensure_arrays()
+        A_inv = self.A_inv[slot][arm]
+        A_inv_x = A_inv @ context
+        A_inv -= np.outer(A_inv_x, A_inv_x) / (1.0 + context @ A_inv_x)
+        self.b[slot][arm] += reward * context
+        self.theta[slot][arm] = A_inv @ self.b[slot][arm]
+    
+    def get_state(self):
+        """Compact snapshot of the bandit for saving"""
+        if self.A_inv is None:
+            return {"alpha": self.alpha}
+        return {
+            "alpha": self.alpha,
+            "A_inv": {slot: arr.astype(np.float32) for slot, arr in self.A_inv.items()},
+            "b": {slot: arr.astype(np.float32) for slot, arr in self.b.items()}
+        }
+    
+    def set_state(self, state):
+        """Restore a snapshot, skipping slots whose shape no longer matches"""
+        self.alpha = state.get("alpha", self.alpha)
+        if state.get("A_inv"):
+            self.ensure_arrays()
+        for slot, A_inv in state.get("A_inv", {}).items():
+            b = state.get("b", {}).get(slot)
+            if slot not in self.A_inv or b is None or A_inv.shape != self.A_inv[slot].shape:
+                continue
+            self.A_inv[slot] = A_inv.astype(np.float64)
+            self.b[slot] = b.astype(np.float64)
+            self.theta[slot] = np.einsum("aij,aj->ai", self.A_inv[slot], self.b[slot])
+
+SITUATION_CACHE_SIZE = 256  # Situation analyses kept across all games served
+OPPONENT_MODEL_LIMIT = 64  # Games whose opponent models are kept; the least recently seen is forgotten
+
+ENEMY_ACTION_KINDS = ("recruit", "capture", "attack", "build", "move")
+ENEMY_ACTION_INDEX = {kind: i for i, kind in enumerate(ENEMY_ACTION_KINDS)}
+
+class OpponentModel:
+    """Online opponent classifier over a sliding window of observed actions"""
+    
+    __slots__ = ("window_turns", "events", "counts", "first_seen",
+                 "first_turn", "current_turn", "events_seen")
+    
+    def __init__(self, window_turns=5):
+        self.window_turns = window_turns
+        self.events = deque()  # (turn, kind index) inside the window
+        self.counts = [0] * len(ENEMY_ACTION_KINDS)
+        self.first_seen = [None] * len(ENEMY_ACTION_KINDS)
+        self.first_turn = None
+        self.current_turn = 0
+        self.events_seen = 0
+    
+    def observe(self, action, turn=None):
+        """Consume one observed enemy action in amortized O(1); late reports are placed in turn order"""
+        kind = action.get("action", action.get("type")) if isinstance(action, dict) else action
+        index = ENEMY_ACTION_INDEX.get(kind)
+        if index is None:
+            return
+        
+        if turn is None:
+            turn = self.current_turn
+        if self.first_turn is None or turn < self.first_turn:
+            self.first_turn = turn
+        if self.first_seen[index] is None or turn < self.first_seen[index]:
+            self.first_seen[index] = turn
+        self.events_seen += 1
+        
+        self.advance(turn)
+        if turn <= self.current_turn - self.window_turns:
+            return  # Already behind the window; only its timing counts
+        if self.events and turn < self.events[-1][0]:
+            bisect.insort(self.events, (turn, index))
+        else:
+            self.events.append((turn, index))
+        self.counts[index] += 1
+    
+    def advance(self, turn):
+        """Slide the window up to a turn, so rates decay on turns without observations"""
+        self.current_turn = max(self.current_turn, turn)
+        horizon = self.current_turn - self.window_turns
+        while self.events and self.events[0][0] <= horizon:
+            _, old_index = self.events.popleft()
+            self.counts[old_index] -= 1
+    
+    def features(self):
+        """Per-turn action rates over the window plus first-occurrence timing"""
+        if self.first_turn is None:
+            span = 1
+        else:
+            span = max(1, min(self.window_turns, self.current_turn - self.first_turn + 1))
+        return {
+            "recruit_rate": self.counts[ENEMY_ACTION_INDEX["recruit"]] / span,
+            "capture_rate": self.counts[ENEMY_ACTION_INDEX["capture"]] / span,
+            "attack_rate": self.counts[ENEMY_ACTION_INDEX["attack"]] / span,
+            "build_rate": self.counts[ENEMY_ACTION_INDEX["build"]] / span,
+            "first_capture_turn": self.first_seen[ENEMY_ACTION_INDEX["capture"]],
+            "first_attack_turn": self.first_seen[ENEMY_ACTION_INDEX["attack"]]
+        }
+    
+    def classify(self):
+        """Map current features onto the enemy behavior labels"""
+        if self.events_seen == 0:
+            return "balanced"
+        
+        f = self.features()
+        development = f["capture_rate"] + f["build_rate"]
+        
+        if f["first_attack_turn"] is not None and f["first_attack_turn"] <= 7 and f["attack_rate"] >= 0.3:
+            return "rush"
+        if f["capture_rate"] >= 0.5 and f["attack_rate"] >= 0.2:
+            return "aggressive_expansion"
+        if f["attack_rate"] >= 0.4:
+            return "aggressive"
+        if f["attack_rate"] == 0 and f["capture_rate"] < 0.2 and f["recruit_rate"] + f["build_rate"] >= 0.6:
+            return "turtle"
+        if development >= 0.6 and f["recruit_rate"] <= development and f["attack_rate"] < 0.2:
+            return "economic"
+        if f["attack_rate"] < 0.1 and f["recruit_rate"] >= 0.4:
+            return "defensive"
+        return "balanced"
 
 class StrategyEvolution:
     """Evolutionary strategy system that creates and adapts strategies"""
@@ -36,8 +263,41 @@ class StrategyEvolution:
         self.failed_strategies = []
         self.adaptation_rate = 0.1
         
+        # Contextual bandit replaces threshold tactic tables when enabled
+        self.bandit_mode = False
+        self.tactic_bandit = TacticBandit()
+        
+        # Streaming enemy behavior models, one per game served
+        self.opponent_models = OrderedDict()
+        self.fed_enemy_turns = {}  # game id -> turn whose enemy_actions were last fed to its model
+        
+        # LRU memo of situation analysis, keyed by game, turn and state fingerprint
+        self.situation_cache = OrderedDict()
+    
+    def state_fingerprint(self, game_state):
+        """Stable hash of a game state for situation caching"""
+        encoded = json.dumps(game_state, sort_keys=True, default=str).encode()
+        return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+    
     def analyze_game_situation(self, game_state):
         """Analyze current situation and identify key factors"""
+        game_id = game_state.get("game_id", "default") if isinstance(game_state, dict) else "default"
+        turn = game_state.get("turn") if isinstance(game_state, dict) else None
+        
+        # Enemy actions reported with a state feed the opponent model once per turn, however often it is analyzed
+        fresh = game_id not in self.fed_enemy_turns or self.fed_enemy_turns[game_id] != turn
+        if isinstance(game_state, dict) and game_state.get("enemy_actions") and fresh:
+            self.fed_enemy_turns[game_id] = turn
+            model = self.opponent_model_for(game_state)
+            for action in game_state["enemy_actions"]:
+                model.observe(action, action.get("turn") if isinstance(action, dict) else None)
+        
+        key = (game_id, turn, self.state_fingerprint(game_state))
+        cached = self.situation_cache.get(key)
+        if cached is not None:
+            self.situation_cache.move_to_end(key)
+            return dict(cached)
+        
         situation_factors = {
             "resource_abundance": self.calculate_resource_situation(game_state),
             "military_pressure": self.assess_military_threats(game_state),
@@ -47,11 +307,47 @@ class StrategyEvolution:
             "map_control": self.assess_territorial_control(game_state),
             "game_phase": self.determine_game_phase(game_state)
         }
-        return situation_factors
+        self.situation_cache[key] = situation_factors
+        while len(self.situation_cache) > SITUATION_CACHE_SIZE:
+            self.situation_cache.popitem(last=False)
+        return dict(situation_factors)
+    
+    def opponent_model_for(self, game_state):
+        """Get the opponent model for the game a state belongs to"""
+        game_id = game_state.get("game_id", "default") if isinstance(game_state, dict) else "default"
+        model = self.opponent_models.get(game_id)
+        if model is not None:
+            self.opponent_models.move_to_end(game_id)
+            return model
+        while len(self.opponent_models) >= OPPONENT_MODEL_LIMIT:
+            self.forget_game(next(iter(self.opponent_models)))
+        model = self.opponent_models[game_id] = OpponentModel()
+        return model
+    
+    def observe_enemy_action(self, action, turn=None, game_id="default"):
+        """Feed one observed enemy action into that game's opponent model"""
+        self.opponent_model_for({"game_id": game_id}).observe(action, turn)
+    
+    def forget_game(self, game_id):
+        """Drop the opponent model and cached analyses of a finished game"""
+        self.opponent_models.pop(game_id, None)
+        self.fed_enemy_turns.pop(game_id, None)
+        for key in [key for key in self.situation_cache if key[0] == game_id]:
+            del self.situation_cache[key]
+    
+    def clear_situation_cache(self):
+        """Forget all cached situation analyses"""
+        self.situation_cache.clear()
     
     def evolve_strategy(self, situation_factors, recent_outcomes):
         """Evolve strategy based on current situation and past results"""
         
+        if self.bandit_mode:
+            adapted_strategy = self.bandit_evolution(situation_factors)
+            if self.should_innovate(recent_outcomes):
+                adapted_strategy = self.generate_novel_strategy(situation_factors, adapted_strategy)
+            return adapted_strategy
+        
         # Base strategy selection
         if situation_factors["game_phase"] == "early":
             base_strategy = self.early_game_evolution(situation_factors)
@@ -69,6 +365,34 @@ class StrategyEvolution:
         
         return adapted_strategy
     
+    def bandit_evolution(self, factors):
+        """Choose tactics for the current phase with the contextual bandit"""
+        phase = factors["game_phase"] if factors["game_phase"] in PHASE_SLOTS else "late"
+        strategy = {
+            "early": {"primary_focus": "adaptive_exploration", "secondary_focus": "opportunistic_resource_grab"},
+            "mid": {"primary_focus": "situational_dominance", "secondary_focus": "strategic_positioning"},
+            "late": {"primary_focus": "victory_condition_pursuit", "secondary_focus": "opponent_elimination"}
+        }[phase]
+        strategy["tactics"] = []
+        
+        context = situation_features(factors)
+        choices = []
+        for slot in PHASE_SLOTS[phase]:
+            arm = self.tactic_bandit.select(slot, context)
+            choices.append((slot, arm))
+            strategy["tactics"].extend(TACTIC_SLOTS[slot][arm])
+        
+        if "early_military_preparation" in strategy["tactics"]:
+            strategy["primary_focus"] = "defensive_consolidation"
+        
+        arm = self.tactic_bandit.select("counter_tactics", context)
+        choices.append(("counter_tactics", arm))
+        strategy["counter_tactics"] = list(TACTIC_SLOTS["counter_tactics"][arm])
+        
+        strategy["bandit_choices"] = choices
+        strategy["bandit_context"] = context
+        return strategy
+    
     def early_game_evolution(self, factors):
         """Evolve early game strategy based on map and opponent analysis"""
         strategy = {
@@ -222,6 +546,11 @@ class StrategyEvolution:
         # Update strategy genome based on results
         self.update_strategy_genome(strategy_used, effectiveness_score)
         
+        # Credit the bandit arms that produced this strategy
+        if strategy_used and "bandit_choices" in strategy_used:
+            for slot, arm in strategy_used["bandit_choices"]:
+                self.tactic_bandit.update(slot, arm, strategy_used["bandit_context"], effectiveness_score)
+        
         # Pattern recognition
         self.update_learned_patterns(strategy_record)
     
@@ -286,8 +615,10 @@ class StrategyEvolution:
         return random.uniform(0.2, 0.8)
     
     def analyze_enemy_patterns(self, game_state):
-        patterns = ["aggressive", "defensive", "economic", "rush", "turtle", "balanced"]
-        return random.choice(patterns)
+        model = self.opponent_model_for(game_state)
+        if isinstance(game_state, dict) and game_state.get("turn") is not None:
+            model.advance(game_state["turn"])
+        return model.classify()
     
     def assess_territorial_control(self, game_state):
         return random.uniform(0.1, 0.9)
@@ -306,6 +637,37 @@ class StrategyEvolution:
         # Pattern learning implementation
         pass
 
+DISPATCH_PLAN_CACHE_SIZE = 4096  # Compiled plans kept before the cache starts over
+
+def action_template(**fields):
+    """Immutable action template shared by every compiled plan"""
+    return MappingProxyType(fields)
+
+def action_copies(templates):
+    """Plain dicts the caller owns, built from action templates"""
+    return [dict(template) for template in templates]
+
+# Action templates per strategy element, built once at import
+FOCUS_ACTIONS = {
+    "adaptive_exploration": (action_template(action="explore", target="optimal_path", reasoning="adaptive exploration"),),
+    "defensive_consolidation": (action_template(action="fortify", priority="high", reasoning="defensive consolidation"),),
+    "situational_dominance": (action_template(action="expand", method="strategic", reasoning="situational dominance"),),
+    "victory_condition_pursuit": (action_template(action="victory_push", condition="optimal", reasoning="victory pursuit"),)
+}
+
+TACTIC_ACTIONS = {
+    "aggressive_resource_monopolization": (action_template(action="secure_all_resources", urgency="high"),),
+    "economic_acceleration": (action_template(action="boost_economy", method="rapid"),),
+    "counter_aggressive_positioning": (action_template(action="defensive_counter", style="aggressive"),),
+    "pattern_breaking_chaos": (action_template(action="random_maneuver", predictability="none"),)
+}
+
+NOVEL_ACTIONS = {
+    "resource_flooding_strategy": (action_template(action="resource_overwhelm", method="flooding"),),
+    "hidden_economic_empire": (action_template(action="stealth_development", visibility="minimal"),),
+    "pattern_breaking_chaos": (action_template(action="unpredictable_moves", chaos_level="high"),)
+}
+
 class AdaptiveHoMM3AI:
     def __init__(self):
         self.running = False
@@ -314,7 +676,8 @@ class AdaptiveHoMM3AI:
         self.game_history = []
         self.adaptation_enabled = True
         self.learning_mode = True
-        
+        self.dispatch_plans = {}  # Compiled action plans keyed by strategy shape
+    
     def analyze_and_adapt(self, game_state):
         """Main AI decision loop with adaptation"""
         
@@ -332,69 +695,59 @@ class AdaptiveHoMM3AI:
         
         return actions
     
+    def observe_enemy_action(self, action, turn=None, game_id="default"):
+        """Record an enemy action seen in the game"""
+        self.strategy_evolution.observe_enemy_action(action, turn, game_id)
+    
     def generate_actions_from_strategy(self, strategy, situation):
         """Convert high-level strategy into specific game actions"""
-        
-        actions = []
-        
-        primary_focus = strategy["primary_focus"]
-        tactics = strategy.get("tactics", [])
-        
-        # Primary focus actions
-        if primary_focus == "adaptive_exploration":
-            actions.extend(self.exploration_actions(situation))
-        elif primary_focus == "defensive_consolidation":
-            actions.extend(self.defensive_actions(situation))
-        elif primary_focus == "situational_dominance":
-            actions.extend(self.dominance_actions(situation))
-        elif primary_focus == "victory_condition_pursuit":
-            actions.extend(self.victory_actions(situation))
-        
-        # Tactical modifications
-        for tactic in tactics:
-            actions.extend(self.apply_tactic(tactic, situation))
-        
-        # Novel element integration
-        if "novel_elements" in strategy:
-            for novel_element in strategy["novel_elements"]:
-                actions.extend(self.apply_novel_approach(novel_element, situation))
-        
-        return actions
+        return action_copies(self.compile_strategy(strategy))
+    
+    def compile_strategy(self, strategy):
+        """Compile a strategy once into a cached tuple of action templates, for internal use"""
+        key = (strategy["primary_focus"], tuple(strategy.get("tactics", ())),
+               tuple(strategy.get("novel_elements", ())))
+        plan = self.dispatch_plans.get(key)
+        if plan is not None:
+            return plan
+        
+        if len(self.dispatch_plans) >= DISPATCH_PLAN_CACHE_SIZE:
+            self.dispatch_plans.clear()
+        
+        # Primary focus actions, then tactical modifications, then novel elements
+        actions = list(FOCUS_ACTIONS.get(key[0], ()))
+        for tactic in key[1]:
+            actions.extend(TACTIC_ACTIONS.get(tactic, ()))
+        for novel_element in key[2]:
+            actions.extend(NOVEL_ACTIONS.get(novel_element, ()))
+        
+        plan = tuple(actions)
+        self.dispatch_plans[key] = plan
+        return plan
     
     def exploration_actions(self, situation):
-        return [{"action": "explore", "target": "optimal_path", "reasoning": "adaptive exploration"}]
+        return action_copies(FOCUS_ACTIONS["adaptive_exploration"])
     
     def defensive_actions(self, situation):
-        return [{"action": "fortify", "priority": "high", "reasoning": "defensive consolidation"}]
+        return action_copies(FOCUS_ACTIONS["defensive_consolidation"])
     
     def dominance_actions(self, situation):
-        return [{"action": "expand", "method": "strategic", "reasoning": "situational dominance"}]
+        return action_copies(FOCUS_ACTIONS["situational_dominance"])
     
     def victory_actions(self, situation):
-        return [{"action": "victory_push", "condition": "optimal", "reasoning": "victory pursuit"}]
+        return action_copies(FOCUS_ACTIONS["victory_condition_pursuit"])
     
     def apply_tactic(self, tactic, situation):
-        tactic_actions = {
-            "aggressive_resource_monopolization": [{"action": "secure_all_resources", "urgency": "high"}],
-            "economic_acceleration": [{"action": "boost_economy", "method": "rapid"}],
-            "counter_aggressive_positioning": [{"action": "defensive_counter", "style": "aggressive"}],
-            "pattern_breaking_chaos": [{"action": "random_maneuver", "predictability": "none"}]
-        }
-        return tactic_actions.get(tactic, [])
+        return action_copies(TACTIC_ACTIONS.get(tactic, ()))
     
     def apply_novel_approach(self, approach, situation):
-        novel_actions = {
-            "resource_flooding_strategy": [{"action": "resource_overwhelm", "method": "flooding"}],
-            "hidden_economic_empire": [{"action": "stealth_development", "visibility": "minimal"}],
-            "pattern_breaking_chaos": [{"action": "unpredictable_moves", "chaos_level": "high"}]
-        }
-        return novel_actions.get(approach, [])
+        return action_copies(NOVEL_ACTIONS.get(approach, ()))
     
     def record_outcome(self, actions_taken, results):
         """Record results for learning"""
         outcome_record = {
             "strategy": self.current_strategy,
-            "actions": actions_taken,
+            "actions": [dict(action) for action in actions_taken],
             "results": results,
             "timestamp": datetime.now(),
             "success": results.get("success", False)
@@ -406,6 +759,11 @@ class AdaptiveHoMM3AI:
         if self.learning_mode:
             game_state = results.get("game_state", {})
             self.strategy_evolution.learn_from_outcome(self.current_strategy, results, game_state)
+        
+        # A finished game's opponent model and analyses are no longer needed
+        game_state = results.get("game_state", {})
+        if game_state.get("game_over"):
+            self.strategy_evolution.forget_game(game_state.get("game_id", "default"))
     
     def save_learning_data(self, filename="ai_learning_data.pkl"):
         """Save learned strategies and patterns"""
@@ -414,6 +772,8 @@ class AdaptiveHoMM3AI:
             "successful_strategies": self.strategy_evolution.successful_strategies,
             "failed_strategies": self.strategy_evolution.failed_strategies,
             "learned_patterns": self.strategy_evolution.learned_patterns,
+            "bandit_mode": self.strategy_evolution.bandit_mode,
+            "tactic_bandit": self.strategy_evolution.tactic_bandit.get_state(),
             "game_history": self.game_history
         }
         
@@ -425,136 +785,16 @@ class AdaptiveHoMM3AI:
         if os.path.exists(filename):
             with open(filename, 'rb') as f:
                 learning_data = pickle.load(f)
-                
+            
             self.strategy_evolution.strategy_genome = learning_data.get("strategy_genome", {})
             self.strategy_evolution.successful_strategies = learning_data.get("successful_strategies", [])
             self.strategy_evolution.failed_strategies = learning_data.get("failed_strategies", [])
             self.strategy_evolution.learned_patterns = learning_data.get("learned_patterns", {})
+            self.strategy_evolution.bandit_mode = learning_data.get("bandit_mode", False)
+            if "tactic_bandit" in learning_data:
+                self.strategy_evolution.tactic_bandit.set_state(learning_data["tactic_bandit"])
             self.game_history = learning_data.get("game_history", [])
 
-class AdaptiveAIController:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.ai = AdaptiveHoMM3AI()
-        self.setup_ui()
-        
-    def setup_ui(self):
-        self.root.title("Heroes III Adaptive AI - Strategy Evolution")
-        self.root.geometry("600x550")
-        
-        # Adaptive AI features
-        features_frame = ttk.LabelFrame(self.root, text="Adaptive AI Features")
-        features_frame.pack(fill="x", padx=20, pady=10)
-        
-        features_text = """🧠 ADAPTIVE STRATEGY AI:
-        
-• Learns from every game and adapts strategies
-• Creates novel approaches when standard strategies fail
-• Evolves tactics based on opponent behavior patterns
-• Develops counter-strategies for different play styles
-• Combines successful elements into hybrid strategies
-• Remembers and improves from past experiences
-        """
-        
-        ttk.Label(features_frame, text=features_text, justify="left").pack(padx=10, pady=10)
-        
-        # Learning controls
-        learning_frame = ttk.LabelFrame(self.root, text="Learning Configuration")
-        learning_frame.pack(fill="x", padx=20, pady=10)
-        
-        self.learning_enabled = tk.BooleanVar(value=True)
-        ttk.Checkbutton(learning_frame, text="Enable continuous learning", 
-                       variable=self.learning_enabled).pack(anchor="w", padx=10)
-        
-        self.innovation_level = tk.DoubleVar(value=0.5)
-        ttk.Label(learning_frame, text="Innovation Level:").pack(anchor="w", padx=10)
-        ttk.Scale(learning_frame, from_=0.0, to=1.0, variable=self.innovation_level, 
-                 orient="horizontal").pack(fill="x", padx=10, pady=5)
-        
-        # Strategy evolution display
-        evolution_frame = ttk.LabelFrame(self.root, text="Current Strategy Evolution")
-        evolution_frame.pack(fill="x", padx=20, pady=10)
-        
-        self.strategy_display = tk.Text(evolution_frame, height=8, wrap="word")
-        self.strategy_display.pack(fill="both", expand=True, padx=10, pady=10)
-        
-        # Control buttons
-        button_frame = ttk.Frame(self.root)
-        button_frame.pack(pady=20)
-        
-        self.start_button = ttk.Button(button_frame, text="Start Adaptive AI", 
-                                      command=self.start_adaptive_ai, style="Accent.TButton")
-        self.start_button.pack(side="left", padx=10)
-        
-        self.stop_button = ttk.Button(button_frame, text="Stop AI", 
-                                     command=self.stop_ai, state="disabled")
-        self.stop_button.pack(side="left", padx=10)
-        
-        ttk.Button(button_frame, text="Save Learning", 
-                  command=self.save_learning).pack(side="left", padx=10)
-        
-        ttk.Button(button_frame, text="Load Learning", 
-                  command=self.load_learning).pack(side="left", padx=10)
-        
-        # Status
-        self.status_label = ttk.Label(self.root, text="Status: Ready to learn and adapt", 
-                                     font=("Arial", 10, "bold"))
-        self.status_label.pack(pady=10)
-        
-        # Initialize display
-        self.update_strategy_display()
-        
-    def update_strategy_display(self):
-        """Update the strategy evolution display"""
-        if self.ai.current_strategy:
-            strategy_text = f"Current Strategy: {self.ai.current_strategy.get('primary_focus', 'Unknown')}\n"
-            strategy_text += f"Tactics: {', '.join(self.ai.current_strategy.get('tactics', []))}\n"
-            if 'novel_elements' in self.ai.current_strategy:
-                strategy_text += f"Novel Elements: {', '.join(self.ai.current_strategy['novel_elements'])}\n"
-            strategy_text += f"Games Played: {len(self.ai.game_history)}\n"
-            strategy_text += f"Successful Strategies: {len(self.ai.strategy_evolution.successful_strategies)}\n"
-        else:
-            strategy_text = "No active strategy - ready to begin learning"
-        
-        self.strategy_display.delete(1.0, tk.END)
-        self.strategy_display.insert(1.0, strategy_text)
-        
-    def start_adaptive_ai(self):
-        """Start adaptive AI"""
-        self.ai.learning_mode = self.learning_enabled.get()
-        self.ai.strategy_evolution.adaptation_rate = self.innovation_level.get()
-        
-        self.start_button.config(state="disabled")
-        self.stop_button.config(state="normal")
-        self.status_label.config(text="Status: Adaptive AI learning and evolving")
-        
-        messagebox.showinfo("Adaptive AI Started", 
-                          "AI is now learning and adapting!\n\n" +
-                          "• Creates new strategies based on game conditions\n" +
-                          "• Learns from successes and failures\n" +
-                          "• Evolves tactics to counter opponents")
-    
-    def stop_ai(self):
-        """Stop AI"""
-        self.start_button.config(state="normal")
-        self.stop_button.config(state="disabled")
-        self.status_label.config(text="Status: Stopped")
-        
-    def save_learning(self):
-        """Save AI learning data"""
-        self.ai.save_learning_data()
-        messagebox.showinfo("Learning Saved", "AI learning data has been saved!")
-        
-    def load_learning(self):
-        """Load AI learning data"""
-        self.ai.load_learning_data()
-        self.update_strategy_display()
-        messagebox.showinfo("Learning Loaded", "AI learning data has been loaded!")
-        
-    def run(self):
-        """Run the controller"""
-        self.root.mainloop()
-
 if __name__ == "__main__":
-    controller = AdaptiveAIController()
-    controller.run()
\ No newline at end of file
+    from homm3_adaptive_gui import main
+    main()
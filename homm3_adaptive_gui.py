@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Adaptive AI - Controller
+Tk front end for the adaptive strategy AI
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from homm3_adaptive_ai import AdaptiveHoMM3AI
+
+class AdaptiveAIController:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.ai = AdaptiveHoMM3AI()
+        self.setup_ui()
+        
+    def setup_ui(self):
+        self.root.title("Heroes III Adaptive AI - Strategy Evolution")
+        self.root.geometry("600x550")
+        
+        # Adaptive AI features
+        features_frame = ttk.LabelFrame(self.root, text="Adaptive AI Features")
+        features_frame.pack(fill="x", padx=20, pady=10)
+        
+        features_text = """🧠 ADAPTIVE STRATEGY AI:
+        
+• Learns from every game and adapts strategies
+• Creates novel approaches when standard strategies fail
+• Evolves tactics based on opponent behavior patterns
+• Develops counter-strategies for different play styles
+• Combines successful elements into hybrid strategies
+• Remembers and improves from past experiences
+        """
+        
+        ttk.Label(features_frame, text=features_text, justify="left").pack(padx=10, pady=10)
+        
+        # Learning controls
+        learning_frame = ttk.LabelFrame(self.root, text="Learning Configuration")
+        learning_frame.pack(fill="x", padx=20, pady=10)
+        
+        self.learning_enabled = tk.BooleanVar(value=True)
+        ttk.Checkbutton(learning_frame, text="Enable continuous learning", 
+                       variable=self.learning_enabled).pack(anchor="w", padx=10)
+        
+        self.bandit_enabled = tk.BooleanVar(value=False)
+        ttk.Checkbutton(learning_frame, text="Contextual bandit tactic selection", 
+                       variable=self.bandit_enabled).pack(anchor="w", padx=10)
+        
+        self.innovation_level = tk.DoubleVar(value=0.5)
+        ttk.Label(learning_frame, text="Innovation Level:").pack(anchor="w", padx=10)
+        ttk.Scale(learning_frame, from_=0.0, to=1.0, variable=self.innovation_level, 
+                 orient="horizontal").pack(fill="x", padx=10, pady=5)
+        
+        # Strategy evolution display
+        evolution_frame = ttk.LabelFrame(self.root, text="Current Strategy Evolution")
+        evolution_frame.pack(fill="x", padx=20, pady=10)
+        
+        self.strategy_display = tk.Text(evolution_frame, height=8, wrap="word")
+        self.strategy_display.pack(fill="both", expand=True, padx=10, pady=10)
+        
+        # Control buttons
+        button_frame = ttk.Frame(self.root)
+        button_frame.pack(pady=20)
+        
+        self.start_button = ttk.Button(button_frame, text="Start Adaptive AI", 
+                                      command=self.start_adaptive_ai, style="Accent.TButton")
+        self.start_button.pack(side="left", padx=10)
+        
+        self.stop_button = ttk.Button(button_frame, text="Stop AI", 
+                                     command=self.stop_ai, state="disabled")
+        self.stop_button.pack(side="left", padx=10)
+        
+        ttk.Button(button_frame, text="Save Learning", 
+                  command=self.save_learning).pack(side="left", padx=10)
+        
+        ttk.Button(button_frame, text="Load Learning", 
+                  command=self.load_learning).pack(side="left", padx=10)
+        
+        # Status
+        self.status_label = ttk.Label(self.root, text="Status: Ready to learn and adapt", 
+                                     font=("Arial", 10, "bold"))
+        self.status_label.pack(pady=10)
+        
+        # Initialize display
+        self.update_strategy_display()
+        
+    def update_strategy_display(self):
+        """Update the strategy evolution display"""
+        if self.ai.current_strategy:
+            strategy_text = f"Current Strategy: {self.ai.current_strategy.get('primary_focus', 'Unknown')}\n"
+            strategy_text += f"Tactics: {', '.join(self.ai.current_strategy.get('tactics', []))}\n"
+            if 'novel_elements' in self.ai.current_strategy:
+                strategy_text += f"Novel Elements: {', '.join(self.ai.current_strategy['novel_elements'])}\n"
+            strategy_text += f"Games Played: {len(self.ai.game_history)}\n"
+            strategy_text += f"Successful Strategies: {len(self.ai.strategy_evolution.successful_strategies)}\n"
+        else:
+            strategy_text = "No active strategy - ready to begin learning"
+        
+        self.strategy_display.delete(1.0, tk.END)
+        self.strategy_display.insert(1.0, strategy_text)
+        
+    def start_adaptive_ai(self):
+        """Start adaptive AI"""
+        self.ai.learning_mode = self.learning_enabled.get()
+        self.ai.strategy_evolution.bandit_mode = self.bandit_enabled.get()
+        self.ai.strategy_evolution.adaptation_rate = self.innovation_level.get()
+        
+        self.start_button.config(state="disabled")
+        self.stop_button.config(state="normal")
+        self.status_label.config(text="Status: Adaptive AI learning and evolving")
+        
+        messagebox.showinfo("Adaptive AI Started", 
+                          "AI is now learning and adapting!\n\n" +
+                          "• Creates new strategies based on game conditions\n" +
+                          "• Learns from successes and failures\n" +
+                          "• Evolves tactics to counter opponents")
+    
+    def stop_ai(self):
+        """Stop AI"""
+        self.start_button.config(state="normal")
+        self.stop_button.config(state="disabled")
+        self.status_label.config(text="Status: Stopped")
+        
+    def save_learning(self):
+        """Save AI learning data"""
+        self.ai.save_learning_data()
+        messagebox.showinfo("Learning Saved", "AI learning data has been saved!")
+        
+    def load_learning(self):
+        """Load AI learning data"""
+        self.ai.load_learning_data()
+        self.bandit_enabled.set(self.ai.strategy_evolution.bandit_mode)
+        self.update_strategy_display()
+        messagebox.showinfo("Learning Loaded", "AI learning data has been loaded!")
+        
+    def run(self):
+        """Run the controller"""
+        self.root.mainloop()
+
+def main():
+    """Launch the adaptive AI controller window"""
+    controller = AdaptiveAIController()
+    controller.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Anytime Decisions
+Deadlines, per-turn budget sharing and best-so-far refinement shared by the AIs
+"""
+
+import time
+
+class Deadline:
+    """A point in time a decision has to be ready by; None means no limit"""
+    
+    def __init__(self, seconds=None, parent=None, clock=time.monotonic):
+        self.clock = clock
+        end = None if seconds is None else clock() + max(seconds, 0.0)
+        if parent is not None and parent.end is not None:
+            end = parent.end if end is None else min(end, parent.end)
+        self.end = end
+    
+    def remaining(self):
+        """Seconds left, infinite without a limit"""
+        if self.end is None:
+            return float("inf")
+        return max(self.end - self.clock(), 0.0)
+    
+    def expired(self):
+        """Whether the deadline has passed"""
+        return self.end is not None and self.clock() >= self.end
+    
+    def child(self, seconds=None, share=None):
+        """Sub-deadline for a fixed time or a share of what is left, never past this one"""
+        if share is not None and self.end is not None:
+            seconds = self.remaining() * share
+        return Deadline(seconds, parent=self, clock=self.clock)
+    
+    def sleep_remaining(self, at_most=None):
+        """Wait out the rest of the deadline, or at most a number of seconds"""
+        wait = self.remaining() if at_most is None else min(self.remaining(), at_most)
+        if wait != float("inf") and wait > 0:
+            time.sleep(wait)
+
+class TurnScheduler:
+    """Shares one turn's deadline across weighted sub-decisions"""
+    
+    # Each allotment is the sub-decision's weight over the weights still
+    # waiting, applied to the time left at that moment, so time a sub-decision
+    # does not use rolls over to the ones after it.
+    
+    def __init__(self, deadline, weights):
+        self.deadline = deadline
+        self.weights = dict(weights)
+        self.pending = set(self.weights)
+    
+    def allot(self, name):
+        """Deadline for the next run of a sub-decision"""
+        weight = self.weights.get(name, 1.0)
+        waiting = weight + sum(self.weights[other] for other in self.pending if other != name)
+        self.pending.discard(name)
+        return self.deadline.child(share=weight / waiting if waiting else 1.0)
+
+def run_anytime(refinements, deadline=None):
+    """Last decision a refinement generator yields before the deadline
+    
+    The generator yields successively better decisions. The first one is
+    always taken, so there is an answer even with no time at all, and without
+    a deadline only that first, quickest decision is used.
+    """
+    best = None
+    for decision in refinements:
+        best = decision
+        if deadline is None or deadline.expired():
+            break
+    return best
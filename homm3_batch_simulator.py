@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+Heroes III AI Opponent - Batched Simulator
+Thousands of independent simulator games advanced in lockstep as NumPy arrays
+"""
+
+import numpy as np
+
+from homm3_game_simulator import GameState, HUMAN_ACTIONS, AI_ACTIONS
+
+HUMAN, AI = 0, 1  # Side index in every per-side array
+SIDES = ("human", "ai")
+UNIT_TYPES = ("archers", "swordsmen")
+LOCATIONS = ("mine", "castle", "artifact")
+MINE = LOCATIONS.index("mine")
+MINE_INCOME = 500
+NO_OWNER = -1
+
+# Columns of the per-game feature rows used for datasets and evaluators
+FEATURE_NAMES = (("turn", "human_gold", "ai_gold")
+                 + tuple(f"{side}_{unit}" for side in SIDES for unit in UNIT_TYPES)
+                 + tuple(f"{location}_{side}" for location in LOCATIONS for side in SIDES))
+
+RECRUIT, CAPTURE, ATTACK = 0, 1, 2
+ACTION_KINDS = {"recruit": RECRUIT, "capture": CAPTURE, "attack": ATTACK}
+
+class ActionTable:
+    """An action list as parallel arrays, indexed by action number"""
+    
+    def __init__(self, actions):
+        self.size = len(actions)
+        self.kind = np.array([ACTION_KINDS[a.get("action", a.get("type"))] for a in actions], dtype=np.int8)
+        self.cost = np.array([a.get("cost", 0) if a.get("units") else 0 for a in actions], dtype=np.int64)
+        self.amount = np.array([a.get("amount", 0) if a.get("units") else 0 for a in actions], dtype=np.int64)
+        self.unit = np.array([UNIT_TYPES.index(a["units"]) if a.get("units") else 0 for a in actions],
+                             dtype=np.intp)
+        self.target = np.array([LOCATIONS.index(a["target"]) if a.get("target") in LOCATIONS else 0
+                                for a in actions], dtype=np.intp)
+
+ACTION_TABLES = (ActionTable(HUMAN_ACTIONS), ActionTable(AI_ACTIONS))
+
+def state_features(game_state):
+    """Feature row of one GameState, in FEATURE_NAMES order"""
+    armies = (game_state.human_army, game_state.ai_army)
+    owners = [game_state.map_locations[location]["owner"] for location in LOCATIONS]
+    return ([game_state.turn, game_state.human_resources["gold"], game_state.ai_resources["gold"]]
+            + [army.get(unit, 0) for army in armies for unit in UNIT_TYPES]
+            + [float(owner == side) for owner in owners for side in SIDES])
+
+class BatchSimulator:
+    """N simulator games as arrays, stepped together with finished games masked out"""
+    
+    # Same rules as GameEngine, one array operation per rule for all games:
+    # gold is (N, side), army is (N, side, unit type), owner is (N, location)
+    # holding a side index or NO_OWNER. Wood and ore never change in the
+    # simulator and are left out.
+    
+    def __init__(self, games, seed=None):
+        self.games = games
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(games)
+        self.reset()
+    
+    def reset(self):
+        """Every game back to the opening GameState"""
+        start = GameState()
+        n = self.games
+        self.turn = np.full(n, start.turn, dtype=np.int32)
+        self.gold = np.tile(np.array([start.human_resources["gold"], start.ai_resources["gold"]],
+                                     dtype=np.int64), (n, 1))
+        armies = [[army.get(unit, 0) for unit in UNIT_TYPES] for army in (start.human_army, start.ai_army)]
+        self.army = np.tile(np.array(armies, dtype=np.int64), (n, 1, 1))
+        self.owner = np.full((n, len(LOCATIONS)), NO_OWNER, dtype=np.int8)
+        self.done = np.zeros(n, dtype=bool)
+        self.winner = np.full(n, NO_OWNER, dtype=np.int8)
+    
+    def load(self, index, game_state):
+        """Copy a GameState into one game slot"""
+        self.turn[index] = game_state.turn
+        self.gold[index] = (game_state.human_resources["gold"], game_state.ai_resources["gold"])
+        for side, army in enumerate((game_state.human_army, game_state.ai_army)):
+            self.army[index, side] = [army.get(unit, 0) for unit in UNIT_TYPES]
+        for location, name in enumerate(LOCATIONS):
+            owner = game_state.map_locations[name]["owner"]
+            self.owner[index, location] = NO_OWNER if owner is None else SIDES.index(owner)
+        self.done[index] = game_state.game_over
+        self.winner[index] = NO_OWNER if game_state.winner is None else SIDES.index(game_state.winner)
+    
+    def game_state(self, index):
+        """One game slot as a GameState"""
+        state = GameState()
+        state.turn = int(self.turn[index])
+        state.human_resources["gold"] = int(self.gold[index, HUMAN])
+        state.ai_resources["gold"] = int(self.gold[index, AI])
+        for side, army in enumerate((state.human_army, state.ai_army)):
+            for unit, name in enumerate(UNIT_TYPES):
+                army[name] = int(self.army[index, side, unit])
+        for location, name in enumerate(LOCATIONS):
+            owner = int(self.owner[index, location])
+            state.map_locations[name]["owner"] = None if owner == NO_OWNER else SIDES[owner]
+        state.game_over = bool(self.done[index])
+        state.winner = None if self.winner[index] == NO_OWNER else SIDES[self.winner[index]]
+        return state
+    
+    def features(self):
+        """(N, len(FEATURE_NAMES)) float32 rows describing every game"""
+        owned = self.owner[:, :, None] == np.arange(len(SIDES), dtype=np.int8)
+        return np.concatenate([self.turn[:, None], self.gold,
+                               self.army.reshape(self.games, -1),
+                               owned.reshape(self.games, -1)], axis=1, dtype=np.float32)
+    
+    def legal_masks(self, side):
+        """(N, actions) bool array of what each game would accept; all False once finished"""
+        table = ACTION_TABLES[side]
+        kind = table.kind[None, :]
+        affordable = self.gold[:, side, None] >= table.cost[None, :]
+        unowned = self.owner[:, table.target] != side
+        legal = np.where(kind == RECRUIT, affordable, np.where(kind == CAPTURE, unowned, True))
+        legal &= ~self.done[:, None]
+        return legal
+    
+    def apply(self, side, actions):
+        """Play one action index per game for a side; finished games are left alone"""
+        table = ACTION_TABLES[side]
+        actions = np.asarray(actions, dtype=np.intp)
+        active = ~self.done
+        kind = table.kind[actions]
+        
+        cost = table.cost[actions]
+        recruit = active & (kind == RECRUIT) & (self.gold[:, side] >= cost)
+        self.gold[:, side] -= np.where(recruit, cost, 0)
+        self.army[self.rows, side, table.unit[actions]] += np.where(recruit, table.amount[actions], 0)
+        
+        target = table.target[actions]
+        capture = active & (kind == CAPTURE) & (self.owner[self.rows, target] != side)
+        self.owner[self.rows[capture], target[capture]] = side
+        self.gold[:, side] += np.where(capture & (target == MINE), MINE_INCOME, 0)
+        
+        attack = np.nonzero(active & (kind == ATTACK))[0]
+        if attack.size:
+            self.resolve_combat(attack, side)
+    
+    def resolve_combat(self, games, attacker):
+        """Battles in the given games, with the attacker's army against the other side's"""
+        defender = 1 - attacker
+        att_roll = self.army[games, attacker].sum(axis=1) * self.rng.uniform(0.8, 1.2, games.size)
+        def_roll = self.army[games, defender].sum(axis=1) * self.rng.uniform(0.8, 1.2, games.size)
+        won = att_roll > def_roll
+        
+        winners = games[won]
+        self.army[winners, defender] = (self.army[winners, defender] * (1 - 0.3)).astype(np.int64)
+        losers = games[~won]
+        self.army[losers, attacker] = (self.army[losers, attacker] * (1 - 0.2)).astype(np.int64)
+        
+        wiped = winners[self.army[winners, defender].sum(axis=1) == 0]
+        self.done[wiped] = True
+        self.winner[wiped] = attacker
+    
+    def next_turn(self):
+        """Advance unfinished games a turn and pay mine income"""
+        active = ~self.done
+        self.turn += active
+        for side in (HUMAN, AI):
+            self.gold[:, side] += np.where(active & (self.owner[:, MINE] == side), MINE_INCOME // 2, 0)
+    
+    def play(self, human_policy, ai_policy, turns):
+        """Play up to a number of turns; policies map the simulator to an action index per game"""
+        for _ in range(turns):
+            if self.done.all():
+                break
+            self.apply(HUMAN, human_policy(self))
+            self.apply(AI, ai_policy(self))
+            self.next_turn()
+        return self.results()
+    
+    def results(self):
+        """Counts of human wins, AI wins and undecided games"""
+        return {"human": int((self.winner == HUMAN).sum()),
+                "ai": int((self.winner == AI).sum()),
+                "undecided": int((~self.done).sum())}
+
+def random_policy(side, legal_only=True):
+    """Uniform choice per game, among legal actions or among all of them"""
+    def policy(simulator):
+        if not legal_only:
+            return simulator.rng.integers(0, ACTION_TABLES[side].size, simulator.games)
+        # Argmax of random scores over the legal actions is a uniform legal choice
+        scores = simulator.rng.random((simulator.games, ACTION_TABLES[side].size))
+        return np.argmax(np.where(simulator.legal_masks(side), scores, -1.0), axis=1)
+    return policy
+
+def rule_policy(simulator):
+    """HeroesAI.make_decision for every game at once, as AI_ACTIONS indices"""
+    gold = simulator.gold[:, AI]
+    turn = simulator.turn
+    stronger = simulator.army[:, AI].sum(axis=1) >= simulator.army[:, HUMAN].sum(axis=1)
+    early = np.where(gold >= 800, 0, 3)  # Archers, else the mine
+    middle = np.where(gold >= 1200, 1, 4)  # Swordsmen, else the castle
+    late = np.where(stronger, 6, 2)  # Attack, else a few swordsmen
+    return np.where(turn <= 5, early, np.where(turn <= 10, middle, late))
+
+def legal_rule_policy(simulator):
+    """rule_policy with illegal choices replaced by the first legal action, as a searching HeroesAI plays"""
+    actions = rule_policy(simulator)
+    legal = simulator.legal_masks(AI)
+    ok = legal[simulator.rows, actions]
+    return np.where(ok | ~legal.any(axis=1), actions, np.argmax(legal, axis=1))
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Enemy Beliefs
+Particle filters over where hidden enemy heroes are and how big their armies have grown
+"""
+
+import numpy as np
+
+PARTICLES = 2000
+DAILY_MOVE_TILES = 20.0  # Typical hero movement per turn, in tiles
+STAY_PROBABILITY = 0.2  # Chance a hero spends the turn in place (town, mine, garrison)
+DAILY_ARMY_GROWTH = 0.02  # Mean relative army growth per turn from recruiting
+ARMY_GROWTH_SPREAD = 0.05
+POSITION_SIGMA = 1.0  # Tiles of error in an observed position
+ARMY_SIGMA = 0.25  # Relative error of an army estimate read off the adventure map
+LOST_TRACK_SIGMAS = 4.0  # A sighting further than this from every particle restarts the belief
+MISS_LIKELIHOOD = 0.05  # Weight kept by particles in plain sight where nobody was seen
+
+class EnemyBelief:
+    """Weighted particles (x, y, army) for one enemy hero"""
+    
+    def __init__(self, x, y, army, width, height, rng, particles=PARTICLES):
+        self.width = width
+        self.height = height
+        self.rng = rng
+        self.x = np.full(particles, x, dtype=np.float32)
+        self.y = np.full(particles, y, dtype=np.float32)
+        self.army = np.full(particles, max(army, 1.0), dtype=np.float32)
+        self.weights = np.full(particles, 1.0 / particles, dtype=np.float32)
+    
+    def predict(self, turns=1):
+        """Spread particles by the movement and recruitment models"""
+        n = self.x.size
+        for _ in range(turns):
+            moving = self.rng.random(n, dtype=np.float32) >= STAY_PROBABILITY
+            angle = self.rng.random(n, dtype=np.float32) * np.float32(2 * np.pi)
+            distance = self.rng.random(n, dtype=np.float32) * np.float32(DAILY_MOVE_TILES) * moving
+            self.x += distance * np.cos(angle)
+            self.y += distance * np.sin(angle)
+            growth = self.rng.standard_normal(n, dtype=np.float32) * np.float32(ARMY_GROWTH_SPREAD)
+            self.army *= np.exp(growth + np.float32(DAILY_ARMY_GROWTH))
+        np.clip(self.x, 0, self.width - 1, out=self.x)
+        np.clip(self.y, 0, self.height - 1, out=self.y)
+    
+    def observe(self, x, y, army=None):
+        """Reweight by a sighting at (x, y), optionally with an army estimate"""
+        distance_sq = (self.x - x) ** 2 + (self.y - y) ** 2
+        
+        # A sighting far from every particle means the model lost track: restart there
+        if distance_sq.min() > (LOST_TRACK_SIGMAS * POSITION_SIGMA) ** 2:
+            self.x[:] = x
+            self.y[:] = y
+            if army is not None:
+                self.army[:] = army
+            self.weights[:] = 1.0 / self.x.size
+            return
+        
+        log_weights = -distance_sq / (2 * POSITION_SIGMA ** 2)
+        if army is not None:
+            log_weights -= np.log(self.army / max(army, 1.0)) ** 2 / (2 * ARMY_SIGMA ** 2)
+        weights = self.weights * np.exp(log_weights - log_weights.max())
+        self.weights = (weights / weights.sum()).astype(np.float32)
+        self.resample_if_degenerate()
+    
+    def observe_absent(self, viewers):
+        """Down-weight particles inside (x, y, radius) sight circles where the enemy was not seen"""
+        seen = np.zeros(self.x.size, dtype=bool)
+        for vx, vy, radius in viewers:
+            seen |= (self.x - vx) ** 2 + (self.y - vy) ** 2 <= radius * radius
+        if not seen.any():
+            return
+        weights = np.where(seen, self.weights * MISS_LIKELIHOOD, self.weights)
+        total = weights.sum()
+        if total > 0:
+            self.weights = (weights / total).astype(np.float32)
+            self.resample_if_degenerate()
+    
+    def effective_size(self):
+        """Effective number of particles"""
+        return 1.0 / float(np.dot(self.weights, self.weights))
+    
+    def resample_if_degenerate(self):
+        """Systematic resampling once the effective size drops below half"""
+        n = self.x.size
+        if self.effective_size() >= n / 2:
+            return
+        positions = (self.rng.random() + np.arange(n)) / n
+        cumulative = np.cumsum(self.weights, dtype=np.float64)
+        cumulative[-1] = 1.0
+        index = np.searchsorted(cumulative, positions)
+        self.x = self.x[index]
+        self.y = self.y[index]
+        self.army = self.army[index]
+        self.weights = np.full(n, 1.0 / n, dtype=np.float32)
+    
+    def estimate(self):
+        """Weighted mean position, positional spread in tiles and expected army"""
+        w = self.weights
+        mean_x = float(np.dot(w, self.x))
+        mean_y = float(np.dot(w, self.y))
+        spread = float(np.sqrt(np.dot(w, (self.x - mean_x) ** 2 + (self.y - mean_y) ** 2)))
+        return {"position": (mean_x, mean_y), "spread": spread, "army": float(np.dot(w, self.army))}
+    
+    def density(self):
+        """Probability mass per tile as a (height, width) grid"""
+        index = self.y.astype(np.intp) * self.width + self.x.astype(np.intp)
+        grid = np.bincount(index, weights=self.weights, minlength=self.width * self.height)
+        return grid.reshape(self.height, self.width)
+    
+    def probability_within(self, x, y, radius):
+        """Chance the enemy is within a radius of a tile"""
+        inside = (self.x - x) ** 2 + (self.y - y) ** 2 <= radius * radius
+        return float(self.weights[inside].sum())
+
+class EnemyTracker:
+    """Particle-filter beliefs for every enemy hero the AI has seen"""
+    
+    def __init__(self, width, height, particles=PARTICLES, seed=None):
+        self.width = width
+        self.height = height
+        self.particles = particles
+        self.rng = np.random.default_rng(seed)
+        self.beliefs = {}  # enemy id -> EnemyBelief
+    
+    def sighting(self, enemy_id, x, y, army=None):
+        """Start or update a belief from a direct sighting"""
+        belief = self.beliefs.get(enemy_id)
+        if belief is None:
+            self.beliefs[enemy_id] = EnemyBelief(x, y, army or 1.0, self.width, self.height,
+                                                 self.rng, self.particles)
+        else:
+            belief.observe(x, y, army)
+    
+    def advance_turn(self, viewers=(), seen=()):
+        """Move every belief one turn, then apply negative evidence from own sight circles"""
+        for enemy_id, belief in self.beliefs.items():
+            belief.predict()
+            if enemy_id not in seen:
+                belief.observe_absent(viewers)
+    
+    def forget(self, enemy_id):
+        """Drop a belief, e.g. for a defeated hero"""
+        self.beliefs.pop(enemy_id, None)
+    
+    def estimates(self):
+        """Estimate of each tracked enemy"""
+        return {enemy_id: belief.estimate() for enemy_id, belief in self.beliefs.items()}
+    
+    def threat_within(self, x, y, radius):
+        """Expected enemy army within a radius of a tile"""
+        total = 0.0
+        for belief in self.beliefs.values():
+            inside = (belief.x - x) ** 2 + (belief.y - y) ** 2 <= radius * radius
+            total += float(np.dot(belief.weights[inside], belief.army[inside]))
+        return total
@@ -0,0 +1,424 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III AI - Benchmarks
+Performance checks for startup and headless AI components
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that must stay importable without GUI or vision startup cost
+HEADLESS_MODULES = [
+    "homm3_adaptive_ai",
+    "homm3_realistic_ai",
+    "homm3_real_ai",
+    "homm3_game_simulator"
+]
+
+HEAVY_MODULES = ("tkinter", "numpy", "cv2", "pyautogui", "PIL")
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def time_command(command, repeats):
+    """Median wall-clock milliseconds of a fresh interpreter running a command"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, cwd=REPO_DIR)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+def heavy_imports(module):
+    """Heavy dependencies a module drags in at import time"""
+    probe = (f"import sys, {module}; "
+             f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    output = subprocess.run([sys.executable, "-c", probe], check=True, cwd=REPO_DIR,
+                            capture_output=True, text=True).stdout.strip()
+    return output.split(",") if output else []
+
+def imports_command(args):
+    """Measure interpreter startup plus import time of each headless entry point"""
+    baseline = time_command([sys.executable, "-c", "pass"], args.repeats)
+    print(f"{'python -c pass':<32} {baseline:8.1f} ms")
+    
+    failed = False
+    for module in HEADLESS_MODULES:
+        elapsed = time_command([sys.executable, "-c", f"import {module}"], args.repeats)
+        heavy = heavy_imports(module)
+        note = f"  pulls in {', '.join(heavy)}" if heavy else ""
+        print(f"{'import ' + module:<32} {elapsed:8.1f} ms  (+{elapsed - baseline:.1f}){note}")
+        failed = failed or bool(heavy)
+    
+    elapsed = time_command([sys.executable, "homm3_cli.py", "--help"], args.repeats)
+    print(f"{'homm3_cli.py --help':<32} {elapsed:8.1f} ms  (+{elapsed - baseline:.1f})")
+    if elapsed > args.budget_ms:
+        print(f"CLI startup exceeds budget of {args.budget_ms:.0f} ms")
+        failed = True
+    
+    return 1 if failed else 0
+
+def capture_command(args):
+    """Compare full-frame conversion with region capture on synthetic frames"""
+    import numpy as np
+    from homm3_capture import ArrayFrameSource, RegionCapture, ScreenLayout
+    
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (args.height, args.width, 4), dtype=np.uint8) for _ in range(4)]
+    layout = ScreenLayout(width=args.width, height=args.height)
+    
+    start = time.perf_counter()
+    for i in range(args.frames):
+        full = np.array(frames[i % len(frames)][:, :, :3])
+    full_us = (time.perf_counter() - start) / args.frames * 1e6
+    
+    capture = RegionCapture(ArrayFrameSource(frames, loop=True), layout)
+    start = time.perf_counter()
+    for _ in range(args.frames):
+        capture.capture()
+    region_us = (time.perf_counter() - start) / args.frames * 1e6
+    
+    region_pixels = sum(buffer.shape[0] * buffer.shape[1] for buffer in capture.buffers.values())
+    print(f"frame {args.width}x{args.height}, regions cover {region_pixels / (args.width * args.height):.1%}")
+    print(f"{'full frame conversion':<32} {full_us:10.1f} us/frame")
+    print(f"{'region capture':<32} {region_us:10.1f} us/frame")
+    return 0
+
+def templates_command(args):
+    """Run the screen-state detectors over a folder of recorded screenshots"""
+    import json
+    import cv2
+    from homm3_capture import ArrayFrameSource, ScreenLayout
+    from homm3_real_ai import HoMM3GameAI
+    
+    labels = {}
+    labels_path = os.path.join(args.screens, "labels.json")
+    if os.path.exists(labels_path):
+        with open(labels_path) as f:
+            labels = json.load(f)
+    
+    timings = []
+    mismatches = 0
+    for filename in sorted(os.listdir(args.screens)):
+        image = cv2.imread(os.path.join(args.screens, filename), cv2.IMREAD_COLOR)
+        if image is None:
+            continue
+        frame = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        
+        layout = ScreenLayout(width=frame.shape[1], height=frame.shape[0])
+        ai = HoMM3GameAI(ArrayFrameSource([frame]), layout)
+        ai.frame_gating = False
+        if args.templates:
+            ai.template_dir = args.templates
+        regions = ai.capture_game_regions()
+        ai.analyze_game_state(regions)  # Loads templates outside the timed run
+        
+        start = time.perf_counter()
+        analysis = ai.analyze_game_state(regions)
+        timings.append((time.perf_counter() - start) * 1000)
+        
+        expected = labels.get(filename, {})
+        wrong = [field for field, value in expected.items() if analysis.get(field) != value]
+        mismatches += bool(wrong)
+        scores = ", ".join(f"{name}={score:.2f}" for name, score in analysis["confidence"].items())
+        status = f"  MISMATCH {', '.join(wrong)}" if wrong else ""
+        print(f"{filename:<32} {timings[-1]:6.2f} ms  {scores}{status}")
+    
+    if timings:
+        print(f"{len(timings)} screenshots, median {statistics.median(timings):.2f} ms, {mismatches} mismatched")
+    return 1 if mismatches else 0
+
+def record_command(args):
+    """Record captured regions from the live screen or a screenshot folder"""
+    from homm3_capture import ArrayFrameSource, ScreenLayout
+    from homm3_real_ai import HoMM3GameAI
+    
+    if args.screens:
+        import cv2
+        
+        frames = []
+        for filename in sorted(os.listdir(args.screens)):
+            image = cv2.imread(os.path.join(args.screens, filename), cv2.IMREAD_COLOR)
+            if image is not None:
+                frames.append(cv2.cvtColor(image, cv2.COLOR_BGR2RGB))
+        if not frames:
+            print(f"No screenshots in {args.screens}")
+            return 1
+        layout = ScreenLayout(width=frames[0].shape[1], height=frames[0].shape[0])
+        ai = HoMM3GameAI(ArrayFrameSource(frames), layout)
+        count = len(frames)
+    else:
+        ai = HoMM3GameAI()
+        count = int(args.seconds / args.interval)
+    
+    ai.start_recording(args.output)
+    recorded = 0
+    while recorded < count and ai.capture_game_regions() is not None:
+        recorded += 1
+        if not args.screens:
+            time.sleep(args.interval)
+    ai.stop_recording()
+    
+    print(f"Recorded {recorded} frames to {args.output} ({os.path.getsize(args.output) / 1024:.1f} KiB)")
+    return 0
+
+def playback_command(args):
+    """Drive analyze_game_state from a recording as fast as possible"""
+    from homm3_capture import PlaybackFrameSource
+    from homm3_real_ai import HoMM3GameAI
+    
+    from homm3_vision import TemplateMatcher
+    
+    source = PlaybackFrameSource(args.recording)
+    ai = HoMM3GameAI(source, source.layout)
+    ai.frame_gating = not args.no_gating
+    if args.templates:
+        ai.template_dir = args.templates
+    
+    # Load templates up front so the timed run only measures detection
+    ai.template_matcher = TemplateMatcher(ai.template_dir, scale=source.layout.width / 800)
+    ai.detector_timings = {}
+    
+    frames = 0
+    actions = 0
+    start = time.perf_counter()
+    while True:
+        regions = ai.capture_game_regions()
+        if regions is None:
+            break
+        ai.analyze_game_state(regions)
+        frames += 1
+        actions += len(source.actions)
+    elapsed = time.perf_counter() - start
+    
+    print(f"{frames} frames, {actions} recorded actions in {elapsed:.3f} s "
+          f"({frames / elapsed if elapsed else 0:.0f} frames/s)")
+    for detector, samples in sorted(ai.detector_timings.items()):
+        samples_ms = [sample * 1000 for sample in samples]
+        print(f"{detector:<24} runs {len(samples):6d}  median {statistics.median(samples_ms):7.3f} ms  "
+              f"max {max(samples_ms):7.3f} ms")
+    return 0
+
+def pathfinding_command(args):
+    """Time distance fields and path searches on a synthetic adventure map"""
+    import numpy as np
+    from homm3_map import AdventureMap, OBSTACLE
+    from homm3_pathfinding import PathFinder
+    
+    # Blocky obstacle clusters plus scattered single blockers, like trees and rocks
+    rng = np.random.default_rng(args.seed)
+    size = args.size
+    clusters = np.kron(rng.random((size // 8 + 1, size // 8 + 1)), np.ones((8, 8)))[:size, :size]
+    terrain = rng.choice([1, 3, 6], size=(size, size), p=[0.3, 0.5, 0.2]).astype(np.uint8)
+    terrain[(clusters > 0.7) | (rng.random((size, size)) < 0.05)] |= OBSTACLE
+    adventure_map = AdventureMap(size, size)
+    adventure_map.tiles[0] = terrain
+    pathfinder = PathFinder(adventure_map)
+    pathfinder.refresh()
+    
+    targets = [tuple(int(v) for v in tile) for tile in rng.integers(0, size, (args.targets, 2))]
+    heroes = [tuple(int(v) for v in tile) for tile in rng.integers(0, size, (args.heroes, 2))]
+    
+    def timed(function):
+        start = time.perf_counter()
+        result = function()
+        return result, (time.perf_counter() - start) * 1000
+    
+    field, cold_ms = timed(lambda: pathfinder.distance_field("targets", targets))
+    cold_passes = field.passes
+    results, query_ms = timed(lambda: pathfinder.nearest_targets("targets", targets, heroes))
+    
+    # Flip obstacles in a block in the middle and refresh the field
+    middle = size // 2
+    adventure_map.tiles[0, middle:middle + 4, middle:middle + 4] ^= OBSTACLE
+    adventure_map.mark_changed(middle, middle + 4, middle, middle + 4)
+    field, update_ms = timed(lambda: pathfinder.distance_field("targets", targets))
+    
+    reachable = [result for result in results if result is not None]
+    goal = reachable[0][0] if reachable else targets[0]
+    (path, cost), search_ms = timed(lambda: pathfinder.find_path(heroes[0], goal))
+    
+    print(f"map {size}x{size}, {len(targets)} targets, {len(heroes)} heroes")
+    print(f"{'distance field (cold)':<32} {cold_ms:8.2f} ms  {cold_passes} passes")
+    print(f"{'nearest target, all heroes':<32} {query_ms:8.2f} ms  {len(reachable)} reachable")
+    print(f"{'field after 4x4 change':<32} {update_ms:8.2f} ms  {field.passes} passes")
+    print(f"{'single path search':<32} {search_ms:8.2f} ms  cost {cost}")
+    
+    # Jump-point search must cost the same as A* on uniform terrain, blocked goals such as objects included
+    adventure_map.tiles[0] = (adventure_map.tiles[0] & OBSTACLE) | 3
+    adventure_map.mark_changed(0, size, 0, size)
+    pathfinder.refresh()
+    queries = [(tuple(int(v) for v in start), tuple(int(v) for v in goal))
+               for start, goal in rng.integers(0, size, (args.checks, 2, 2))]
+    queries = [(start, goal) for start, goal in queries if pathfinder.walkable(*start) and start != goal]
+    mismatches = sum(pathfinder.jump_point_search(start, goal)[1] != pathfinder.a_star(start, goal)[1]
+                     for start, goal in queries)
+    print(f"{'jump-point search vs A*':<32} {len(queries):8d} queries  {mismatches} mismatched")
+    return 1 if mismatches else 0
+
+def fog_command(args):
+    """Incremental fog frontier against a tile-by-tile recompute after random reveals"""
+    import random
+    from homm3_fog import FogOfWar
+    
+    rng = random.Random(args.seed)
+    mismatches = 0
+    checks = 0
+    for _ in range(args.maps):
+        width, height = rng.randint(3, args.size), rng.randint(3, args.size)
+        fog = FogOfWar(width, height)
+        explored = set()
+        for _ in range(args.reveals):
+            # Sight discs, and rectangles such as a viewport, which can span whole rows
+            if rng.random() < 0.5:
+                x, y, radius = rng.randrange(width), rng.randrange(height), rng.randint(0, 4)
+                fog.reveal(x, y, radius)
+                explored |= {(tx, ty) for tx in range(width) for ty in range(height)
+                             if (tx - x) ** 2 + (ty - y) ** 2 <= radius * radius}
+            else:
+                x0, y0 = rng.randrange(width), rng.randrange(height)
+                x1, y1 = rng.randint(x0, width - 1), rng.randint(y0, height - 1)
+                tiles = {(tx, ty) for tx in range(x0, x1 + 1) for ty in range(y0, y1 + 1)}
+                fog.update(tiles)
+                explored |= tiles
+            
+            # Frontier from first principles: explored tiles with an unexplored tile among their eight neighbours
+            frontier = {(tx, ty) for tx, ty in explored
+                        if any((tx + dx, ty + dy) not in explored
+                               for dx in (-1, 0, 1) for dy in (-1, 0, 1)
+                               if 0 <= tx + dx < width and 0 <= ty + dy < height)}
+            gains = {ty * width + tx: fog.gain(ty * width + tx) for tx, ty in frontier}
+            mismatches += set(fog.frontier()) != frontier or fog.gains[0] != gains
+            checks += 1
+    print(f"{args.maps} maps up to {args.size}x{args.size}, {checks} reveals, "
+          f"{mismatches} left a frontier or gain that differs from a full recompute")
+    return 1 if mismatches else 0
+
+def simulate_command(args):
+    """Game-turn throughput of the scalar engine against the batched simulator"""
+    import random
+    from homm3_game_simulator import GameEngine, HUMAN_ACTIONS
+    from homm3_batch_simulator import BatchSimulator, HUMAN, random_policy, rule_policy
+    
+    random.seed(args.seed)
+    start = time.perf_counter()
+    scalar_turns = 0
+    for _ in range(args.scalar_games):
+        engine = GameEngine()
+        while engine.state.turn <= args.turns and not engine.state.game_over:
+            engine.process_human_action(random.choice(HUMAN_ACTIONS))
+            if not engine.state.game_over:
+                engine.process_ai_turn()
+                engine.next_turn()
+            scalar_turns += 1
+    scalar_rate = scalar_turns / (time.perf_counter() - start)
+    
+    simulator = BatchSimulator(args.games, seed=args.seed)
+    human_policy = random_policy(HUMAN, legal_only=False)
+    start = time.perf_counter()
+    live_turns = 0
+    for _ in range(args.turns):
+        live_turns += int((~simulator.done).sum())
+        simulator.play(human_policy, rule_policy, 1)
+    batch_rate = live_turns / (time.perf_counter() - start)
+    
+    print(f"{'GameEngine':<24} {scalar_rate:12,.0f} game-turns/s")
+    print(f"{'BatchSimulator':<24} {batch_rate:12,.0f} game-turns/s  ({args.games} games)")
+    print(f"results after {args.turns} turns: {simulator.results()}")
+    return 0
+
+def evaluator_command(args):
+    """Batched inference speed of the learned evaluator on simulator states"""
+    from homm3_batch_simulator import BatchSimulator, HUMAN, random_policy, rule_policy
+    from homm3_evaluator import StateEvaluator
+    
+    evaluator = StateEvaluator.load(args.weights) if args.weights else StateEvaluator(seed=args.seed)
+    simulator = BatchSimulator(args.batch, seed=args.seed)
+    simulator.play(random_policy(HUMAN), rule_policy, 8)
+    features = simulator.features()
+    
+    timings = []
+    for _ in range(args.repeats):
+        start = time.perf_counter()
+        evaluator.evaluate(features)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+    print(f"{'batch of':<24} {args.batch:12,} states")
+    print(f"{'evaluate':<24} {best * 1000:12.2f} ms  {args.batch / best:,.0f} states/s")
+    return 0
+
+def build_parser():
+    """Command line parser for the benchmark suite"""
+    parser = argparse.ArgumentParser(description="Heroes III AI benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    imports = subparsers.add_parser("imports", help="startup and import time of headless entry points")
+    imports.add_argument("--repeats", type=int, default=7)
+    imports.add_argument("--budget-ms", type=float, default=100.0)
+    imports.set_defaults(handler=imports_command)
+    
+    capture = subparsers.add_parser("capture", help="region capture versus full-frame conversion")
+    capture.add_argument("--frames", type=int, default=200)
+    capture.add_argument("--width", type=int, default=1920)
+    capture.add_argument("--height", type=int, default=1080)
+    capture.set_defaults(handler=capture_command)
+    
+    templates = subparsers.add_parser("templates", help="screen-state detectors on recorded screenshots")
+    templates.add_argument("--screens", required=True, help="folder of screenshots, optional labels.json")
+    templates.add_argument("--templates", help="template folder (defaults to ./templates)")
+    templates.set_defaults(handler=templates_command)
+    
+    record = subparsers.add_parser("record", help="record captured regions for playback")
+    record.add_argument("--output", required=True)
+    record.add_argument("--screens", help="record a screenshot folder instead of the live screen")
+    record.add_argument("--seconds", type=float, default=60.0)
+    record.add_argument("--interval", type=float, default=0.1)
+    record.set_defaults(handler=record_command)
+    
+    playback = subparsers.add_parser("playback", help="perception speed over a recording")
+    playback.add_argument("--recording", required=True)
+    playback.add_argument("--no-gating", action="store_true", help="analyze every frame in full")
+    playback.add_argument("--templates", help="template folder (defaults to ./templates)")
+    playback.set_defaults(handler=playback_command)
+    
+    pathfinding = subparsers.add_parser("pathfinding", help="distance fields and path search on a synthetic map")
+    pathfinding.add_argument("--size", type=int, default=144)
+    pathfinding.add_argument("--targets", type=int, default=30)
+    pathfinding.add_argument("--heroes", type=int, default=8)
+    pathfinding.add_argument("--seed", type=int, default=0)
+    pathfinding.add_argument("--checks", type=int, default=500, help="random JPS vs A* comparisons")
+    pathfinding.set_defaults(handler=pathfinding_command)
+    
+    fog = subparsers.add_parser("fog", help="incremental fog frontier against a full recompute")
+    fog.add_argument("--maps", type=int, default=200)
+    fog.add_argument("--size", type=int, default=16)
+    fog.add_argument("--reveals", type=int, default=8)
+    fog.add_argument("--seed", type=int, default=0)
+    fog.set_defaults(handler=fog_command)
+    
+    simulate = subparsers.add_parser("simulate", help="scalar versus batched simulator throughput")
+    simulate.add_argument("--games", type=int, default=100000)
+    simulate.add_argument("--scalar-games", type=int, default=500)
+    simulate.add_argument("--turns", type=int, default=30)
+    simulate.add_argument("--seed", type=int, default=0)
+    simulate.set_defaults(handler=simulate_command)
+    
+    evaluator = subparsers.add_parser("evaluator", help="learned evaluator batched inference")
+    evaluator.add_argument("--weights", help="trained weights (.npz); random weights by default")
+    evaluator.add_argument("--batch", type=int, default=65536)
+    evaluator.add_argument("--repeats", type=int, default=20)
+    evaluator.add_argument("--seed", type=int, default=0)
+    evaluator.set_defaults(handler=evaluator_command)
+    
+    return parser
+
+def main(argv=None):
+    """Entry point for the benchmark suite"""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
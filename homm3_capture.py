@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Screen Capture
+Region-of-interest capture into reusable buffers, from the live screen or offline frames
+"""
+
+import json
+import threading
+import struct
+import time
+import zlib
+import numpy as np
+
+# Regions the detectors read, as (x, y, width, height) on the 800x600 game screen
+SCREEN_REGIONS = {
+    "resource_bar": (3, 575, 597, 20),
+    "hero_portraits": (609, 176, 48, 212),
+    "end_turn_button": (679, 356, 64, 32),
+    "town_exit_button": (744, 544, 48, 30),
+    "combat_controls": (4, 556, 192, 40),
+    "adventure_map": (8, 8, 576, 544),
+    "minimap": (630, 26, 144, 144)
+}
+
+# Captured every frame for the screen-state detectors
+DETECTOR_REGION_NAMES = ("resource_bar", "hero_portraits", "end_turn_button",
+                         "town_exit_button", "combat_controls")
+
+# Large map regions, captured on demand when the map model is refreshed
+MAP_REGION_NAMES = ("adventure_map", "minimap")
+
+REFERENCE_SIZE = (800, 600)
+
+class ScreenLayout:
+    """Maps reference regions onto the game window's position and size"""
+    
+    def __init__(self, left=0, top=0, width=REFERENCE_SIZE[0], height=REFERENCE_SIZE[1]):
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+    
+    def box(self, name):
+        """Screen-space (x, y, width, height) of a named region"""
+        x, y, w, h = SCREEN_REGIONS[name]
+        sx = self.width / REFERENCE_SIZE[0]
+        sy = self.height / REFERENCE_SIZE[1]
+        return (self.left + round(x * sx), self.top + round(y * sy),
+                max(1, round(w * sx)), max(1, round(h * sy)))
+
+class LiveScreenSource:
+    """Grabs regions straight from the screen, using mss when it is installed"""
+    
+    def __init__(self):
+        self.sct = None
+        self.pyautogui = None
+    
+    def next_frame(self):
+        """Live capture always has a current frame"""
+        return True
+    
+    def grab(self, box, out):
+        """Copy one screen region into an RGB buffer"""
+        x, y, w, h = box
+        if self.sct is None and self.pyautogui is None:
+            try:
+                import mss
+                self.sct = mss.mss()
+            except ImportError:
+                from homm3_real_ai import load_pyautogui
+                self.pyautogui = load_pyautogui()
+        
+        if self.sct is not None:
+            shot = self.sct.grab({"left": x, "top": y, "width": w, "height": h})
+            raw = np.frombuffer(shot.bgra, dtype=np.uint8).reshape(h, w, 4)
+            out[...] = raw[:, :, 2::-1]  # BGRA -> RGB
+        else:
+            image = self.pyautogui.screenshot(region=(x, y, w, h))
+            out[...] = np.asarray(image)[:, :, :3]
+        return True
+
+class ArrayFrameSource:
+    """Replays full frames held in memory, for benchmarks and headless runs"""
+    
+    def __init__(self, frames, loop=False):
+        self.frames = frames
+        self.loop = loop
+        self.index = -1
+        self.frame = None
+    
+    def next_frame(self):
+        """Advance to the next frame; False once the frames run out"""
+        self.index += 1
+        if self.index >= len(self.frames):
+            if not self.loop or not self.frames:
+                return False
+            self.index = 0
+        self.frame = self.frames[self.index]
+        return True
+    
+    def grab(self, box, out):
+        """Crop one region of the current frame into an RGB buffer"""
+        x, y, w, h = box
+        region = self.frame[y:y + h, x:x + w, :3]
+        if region.shape != out.shape:
+            return False
+        np.copyto(out, region)
+        return True
+
+RECORDING_MAGIC = b"H3REC1\n"
+
+def write_record(stream, kind, payload):
+    """Append one length-prefixed record to a recording"""
+    stream.write(struct.pack("<cI", kind, len(payload)))
+    stream.write(payload)
+
+def read_record(stream):
+    """Next (kind, payload) record of a recording, or None at the end"""
+    prefix = stream.read(5)
+    if len(prefix) < 5:
+        return None
+    kind, length = struct.unpack("<cI", prefix)
+    return kind, stream.read(length)
+
+class FrameRecorder:
+    """Writes captured regions and executed actions to a compact recording file"""
+    
+    # Layout: magic, JSON header record, then frame (F) and action (A) records.
+    # Frames are stored as the zlib-compressed XOR against the previous frame,
+    # so static screens cost a few bytes each.
+    
+    def __init__(self, path, boxes, layout):
+        self.file = open(path, "wb")
+        self.file.write(RECORDING_MAGIC)
+        self.boxes = dict(boxes)
+        header = {
+            "layout": {"left": layout.left, "top": layout.top, "width": layout.width, "height": layout.height},
+            "regions": [[name, list(box)] for name, box in self.boxes.items()],
+            "created": time.time()
+        }
+        write_record(self.file, b"H", json.dumps(header).encode())
+        self.previous = None
+        self.lock = threading.Lock()
+    
+    def record_frame(self, regions, timestamp=None):
+        """Append one captured frame"""
+        flat = np.concatenate([regions[name].reshape(-1) for name in self.boxes])
+        delta = flat if self.previous is None else np.bitwise_xor(flat, self.previous)
+        self.previous = flat
+        payload = struct.pack("<d", time.time() if timestamp is None else timestamp)
+        with self.lock:
+            write_record(self.file, b"F", payload + zlib.compress(delta.tobytes(), 1))
+    
+    def record_action(self, action, timestamp=None):
+        """Append one executed action"""
+        payload = struct.pack("<d", time.time() if timestamp is None else timestamp)
+        with self.lock:
+            write_record(self.file, b"A", payload + json.dumps(action).encode())
+    
+    def close(self):
+        """Flush and close the recording"""
+        with self.lock:
+            self.file.close()
+
+class PlaybackFrameSource:
+    """Replays a FrameRecorder file frame by frame, exposing the recorded actions"""
+    
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        if self.file.read(len(RECORDING_MAGIC)) != RECORDING_MAGIC:
+            raise ValueError(f"{path} is not a screen recording")
+        
+        kind, payload = read_record(self.file)
+        header = json.loads(payload)
+        self.layout = ScreenLayout(**header["layout"])
+        self.boxes = {name: tuple(box) for name, box in header["regions"]}
+        self.slices = {}
+        offset = 0
+        for box in self.boxes.values():
+            x, y, w, h = box
+            self.slices[box] = (offset, (h, w, 3))
+            offset += h * w * 3
+        self.flat = np.zeros(offset, dtype=np.uint8)
+        self.timestamp = None
+        self.actions = []  # (timestamp, action) recorded since the previous frame
+    
+    def next_frame(self):
+        """Decode the next frame, collecting any actions recorded before it"""
+        self.actions = []
+        while True:
+            record = read_record(self.file)
+            if record is None:
+                self.file.close()
+                return False
+            kind, payload = record
+            timestamp, = struct.unpack_from("<d", payload)
+            if kind == b"A":
+                self.actions.append((timestamp, json.loads(payload[8:])))
+            elif kind == b"F":
+                delta = np.frombuffer(zlib.decompress(payload[8:]), dtype=np.uint8)
+                np.bitwise_xor(self.flat, delta, out=self.flat)
+                self.timestamp = timestamp
+                return True
+    
+    def grab(self, box, out):
+        """Copy a recorded region into a buffer; False if it was not recorded"""
+        entry = self.slices.get(tuple(box))
+        if entry is None or entry[1] != out.shape:
+            return False
+        offset, shape = entry
+        np.copyto(out, self.flat[offset:offset + out.size].reshape(shape))
+        return True
+
+class RegionCapture:
+    """Captures only the detector regions into preallocated buffers"""
+    
+    def __init__(self, source, layout=None, regions=DETECTOR_REGION_NAMES):
+        self.source = source
+        self.layout = layout or ScreenLayout()
+        self.boxes = {name: self.layout.box(name) for name in regions}
+        self.buffers = {name: np.zeros((h, w, 3), dtype=np.uint8)
+                        for name, (x, y, w, h) in self.boxes.items()}
+    
+    def capture(self, advance=True):
+        """Fill every region buffer from the next frame, or None if there is none"""
+        # Buffers are reused on every call; copy a region if it must outlive the next capture
+        # With advance=False the regions come from the source's current frame instead
+        if advance and not self.source.next_frame():
+            return None
+        for name, box in self.boxes.items():
+            if not self.source.grab(box, self.buffers[name]):
+                return None
+        return self.buffers
+
+class RegionChangeDetector:
+    """Cheap per-region change detection on a subsampled pixel grid"""
+    
+    def __init__(self, step=4, threshold=12, min_fraction=0.01):
+        self.step = step  # Sample every Nth pixel in each direction
+        self.threshold = threshold  # Per-channel difference that counts as a change
+        self.min_fraction = min_fraction  # Share of changed samples that marks a region dirty
+        self.reference = {}
+    
+    def update(self, regions):
+        """Names of regions that changed since they last changed, all on first sight"""
+        changed = set()
+        for name, buffer in regions.items():
+            sample = buffer[::self.step, ::self.step]
+            reference = self.reference.get(name)
+            if reference is None or reference.shape != sample.shape:
+                self.reference[name] = sample.astype(np.int16)
+                changed.add(name)
+                continue
+            
+            # The reference only moves on a detected change, so slow drift still accumulates
+            differing = np.count_nonzero(np.abs(reference - sample) > self.threshold)
+            if differing > self.min_fraction * sample.size:
+                np.copyto(reference, sample)
+                changed.add(name)
+        return changed
+    
+    def reset(self):
+        """Treat every region as changed on the next update"""
+        self.reference.clear()
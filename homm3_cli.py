@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III AI - Headless Command Line
+Run AI decisions and simulator games without a display
+"""
+
+import argparse
+import json
+import random
+import sys
+
+def decide_command(args):
+    """Read a game state file and write the adaptive AI's actions"""
+    from homm3_adaptive_ai import AdaptiveHoMM3AI
+    
+    with open(args.state) as f:
+        game_state = json.load(f)
+    
+    ai = AdaptiveHoMM3AI()
+    if args.learning_data:
+        ai.load_learning_data(args.learning_data)
+    if args.bandit:
+        ai.strategy_evolution.bandit_mode = True
+    
+    actions = ai.analyze_and_adapt(game_state)
+    result = {"strategy": ai.current_strategy["primary_focus"], "actions": actions}
+    
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(result, f)
+    else:
+        print(json.dumps(result))
+    return 0
+
+def simulate_command(args):
+    """Play a simulator game against a random human-side policy"""
+    from homm3_game_simulator import GameEngine, HUMAN_ACTIONS
+    
+    if args.seed is not None:
+        random.seed(args.seed)
+    
+    engine = GameEngine()
+    if args.ai_budget_ms:
+        engine.ai_time_budget = args.ai_budget_ms / 1000
+        engine.ai.rng.seed(args.seed)
+    if args.evaluator:
+        from homm3_evaluator import StateEvaluator
+        engine.ai.evaluator = StateEvaluator.load(args.evaluator)
+    if args.book:
+        from homm3_opening_book import OpeningBook
+        engine.ai.opening_book = OpeningBook.load(args.book)
+    while engine.state.turn <= args.turns and not engine.state.game_over:
+        success, message = engine.process_human_action(random.choice(HUMAN_ACTIONS))
+        if not args.quiet:
+            print(f"Turn {engine.state.turn} You: {message}")
+        if engine.state.game_over:
+            break
+        
+        ai_result = engine.process_ai_turn()
+        if not args.quiet:
+            print(f"Turn {engine.state.turn} AI: {ai_result}")
+        engine.next_turn()
+    
+    print(json.dumps(engine.get_game_status()))
+    return 0
+
+def selfplay_command(args):
+    """Generate or resume a self-play dataset of memory-mapped column shards"""
+    from homm3_selfplay import generate
+    
+    def progress(done, total):
+        if not args.quiet:
+            print(f"{done}/{total} shards", file=sys.stderr)
+    
+    index = generate(args.output, args.shards, seed=args.seed, workers=args.workers,
+                     rows=args.shard_rows, turns=args.turns, progress=progress)
+    print(json.dumps({"shards": len(index["shards"]), "rows": sum(index["shards"].values())}))
+    return 0
+
+def train_evaluator_command(args):
+    """Train the value/policy evaluator on a self-play dataset"""
+    from homm3_evaluator import StateEvaluator
+    from homm3_selfplay import SelfPlayDataset
+    
+    def progress(epoch, loss):
+        if not args.quiet:
+            print(f"epoch {epoch}: loss {loss:.4f}", file=sys.stderr)
+    
+    evaluator = StateEvaluator(hidden=args.hidden, seed=args.seed)
+    evaluator.train(SelfPlayDataset(args.data), epochs=args.epochs, batch_size=args.batch_size,
+                    learning_rate=args.learning_rate, seed=args.seed, progress=progress)
+    evaluator.save(args.output)
+    return 0
+
+def build_book_command(args):
+    """Search the simulator's opening turns and write an opening book"""
+    from homm3_opening_book import build_book
+    
+    def progress(turn, positions):
+        if not args.quiet:
+            print(f"turn {turn}: {positions} positions", file=sys.stderr)
+    
+    book = build_book(turns=args.turns, iterations=args.iterations, seed=args.seed, workers=args.workers,
+                      progress=progress)
+    book.save(args.output)
+    print(json.dumps({"positions": len(book)}))
+    return 0
+
+def build_parser():
+    """Command line parser for all headless subcommands"""
+    parser = argparse.ArgumentParser(description="Headless Heroes III AI tools")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    
+    decide = subparsers.add_parser("decide", help="decide actions for a game state file")
+    decide.add_argument("--state", required=True, help="game state JSON file")
+    decide.add_argument("--output", help="write actions here instead of stdout")
+    decide.add_argument("--learning-data", help="adaptive AI learning data to load")
+    decide.add_argument("--bandit", action="store_true", help="use contextual bandit tactics")
+    decide.set_defaults(handler=decide_command)
+    
+    simulate = subparsers.add_parser("simulate", help="play a headless simulator game")
+    simulate.add_argument("--turns", type=int, default=30)
+    simulate.add_argument("--seed", type=int)
+    simulate.add_argument("--quiet", action="store_true")
+    simulate.add_argument("--ai-budget-ms", type=float, help="let the AI search for this long each turn")
+    simulate.add_argument("--evaluator", help="score search leaves with a trained evaluator (.npz)")
+    simulate.add_argument("--book", help="play opening moves from an opening book")
+    simulate.set_defaults(handler=simulate_command)
+    
+    selfplay = subparsers.add_parser("selfplay", help="write simulator self-play training data")
+    selfplay.add_argument("--output", required=True, help="dataset folder; rerun to resume")
+    selfplay.add_argument("--shards", type=int, default=16)
+    selfplay.add_argument("--shard-rows", type=int, default=1 << 20)
+    selfplay.add_argument("--turns", type=int, default=40)
+    selfplay.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    selfplay.add_argument("--seed", type=int, default=0)
+    selfplay.add_argument("--quiet", action="store_true")
+    selfplay.set_defaults(handler=selfplay_command)
+    
+    train = subparsers.add_parser("train-evaluator", help="fit the learned evaluator to self-play data")
+    train.add_argument("--data", required=True, help="self-play dataset folder")
+    train.add_argument("--output", required=True, help="weights file (.npz)")
+    train.add_argument("--epochs", type=int, default=2)
+    train.add_argument("--batch-size", type=int, default=2048)
+    train.add_argument("--learning-rate", type=float, default=3e-3)
+    train.add_argument("--hidden", type=int, default=64)
+    train.add_argument("--seed", type=int, default=0)
+    train.add_argument("--quiet", action="store_true")
+    train.set_defaults(handler=train_evaluator_command)
+    
+    book = subparsers.add_parser("build-book", help="search the opening turns into an opening book")
+    book.add_argument("--output", required=True, help="book file to write")
+    book.add_argument("--turns", type=int, default=3)
+    book.add_argument("--iterations", type=int, default=4000, help="search iterations per position")
+    book.add_argument("--workers", type=int, help="worker processes (default: one per CPU)")
+    book.add_argument("--seed", type=int, default=0)
+    book.add_argument("--quiet", action="store_true")
+    book.set_defaults(handler=build_book_command)
+    
+    return parser
+
+def main(argv=None):
+    """Entry point for the headless command line"""
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
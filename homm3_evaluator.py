@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Heroes III AI Opponent - Learned State Evaluator
+Small NumPy multilayer perceptron scoring simulator states and AI moves in batches
+"""
+
+import numpy as np
+
+from homm3_batch_simulator import AI, FEATURE_NAMES, ACTION_TABLES, state_features
+
+HIDDEN_UNITS = 64
+SCALING_SAMPLE_ROWS = 1 << 18  # Rows the input standardization is fitted on
+SCALING_BATCH_ROWS = 1 << 14
+AI_ACTION_COUNT = ACTION_TABLES[AI].size
+INPUTS = len(FEATURE_NAMES) + 1  # Features plus the side to move
+
+class StateEvaluator:
+    """One hidden layer with a value head (AI's view, tanh) and a policy head over AI_ACTIONS"""
+    
+    # The value and policy heads share one output matrix, so a batch costs
+    # two matrix multiplies: inputs to hidden, hidden to [value | logits].
+    # Inputs are standardized with statistics taken from the training data.
+    
+    def __init__(self, hidden=HIDDEN_UNITS, seed=None):
+        rng = np.random.default_rng(seed)
+        self.mean = np.zeros(INPUTS, dtype=np.float32)
+        self.scale = np.ones(INPUTS, dtype=np.float32)
+        self.w1 = (rng.standard_normal((INPUTS, hidden)) * np.sqrt(2 / INPUTS)).astype(np.float32)
+        self.b1 = np.zeros(hidden, dtype=np.float32)
+        self.w2 = (rng.standard_normal((hidden, 1 + AI_ACTION_COUNT)) * np.sqrt(1 / hidden)).astype(np.float32)
+        self.b2 = np.zeros(1 + AI_ACTION_COUNT, dtype=np.float32)
+    
+    def inputs(self, features, side):
+        """Standardized network inputs for feature rows and the side to move"""
+        side = np.broadcast_to(np.asarray(side, dtype=np.float32), (len(features),))
+        x = np.concatenate([np.asarray(features, dtype=np.float32), side[:, None]], axis=1)
+        return (x - self.mean) * self.scale
+    
+    def forward(self, x):
+        """Hidden activations and raw outputs for standardized inputs"""
+        hidden = np.maximum(x @ self.w1 + self.b1, 0)
+        return hidden, hidden @ self.w2 + self.b2
+    
+    def evaluate(self, features, side=AI):
+        """Values in [-1, 1] for the AI and policy logits over AI_ACTIONS, for a batch of states"""
+        _, out = self.forward(self.inputs(features, side))
+        return np.tanh(out[:, 0]), out[:, 1:]
+    
+    def value(self, game_state):
+        """Value of one GameState for the AI, with the AI to move"""
+        values, _ = self.evaluate(np.array([state_features(game_state)], dtype=np.float32))
+        return float(values[0])
+    
+    def fit_scaling(self, features, side):
+        """Standardize inputs by the mean and spread of a data sample"""
+        x = np.concatenate([features.astype(np.float32), side.astype(np.float32)[:, None]], axis=1)
+        self.mean = x.mean(axis=0)
+        self.scale = (1 / np.maximum(x.std(axis=0), 1e-3)).astype(np.float32)
+    
+    def train(self, dataset, epochs=1, batch_size=1024, learning_rate=1e-3, policy_weight=0.5, seed=None,
+              progress=None):
+        """Adam on value MSE plus policy cross-entropy over a SelfPlayDataset's rows"""
+        rng = np.random.default_rng(seed)
+        
+        # Scaling comes from shuffled rows of random shards, not one shard's opening turns
+        sample = {"features": [], "side": []}
+        for batch in dataset.batches(SCALING_BATCH_ROWS, rng):
+            for name in sample:
+                sample[name].append(batch[name])
+            if sum(len(side) for side in sample["side"]) >= SCALING_SAMPLE_ROWS:
+                break
+        self.fit_scaling(np.concatenate(sample["features"]), np.concatenate(sample["side"]))
+        
+        params = [self.w1, self.b1, self.w2, self.b2]
+        moments = [np.zeros_like(p) for p in params]
+        squares = [np.zeros_like(p) for p in params]
+        beta1, beta2, step = 0.9, 0.999, 0
+        for epoch in range(epochs):
+            total, batches = 0.0, 0
+            for batch in dataset.batches(batch_size, rng):
+                side = batch["side"].astype(np.float32)
+                x = self.inputs(batch["features"], side)
+                hidden, out = self.forward(x)
+                n = len(x)
+                
+                # Outcomes are the mover's; the value head learns the AI's side
+                target = np.where(side == AI, 1.0, -1.0) * batch["outcome"]
+                value = np.tanh(out[:, 0])
+                grad_out = np.zeros_like(out)
+                grad_out[:, 0] = 2 * (value - target) * (1 - value ** 2) / n
+                loss = float(np.mean((value - target) ** 2))
+                
+                # Policy targets come from the AI's own moves only
+                ai_rows = np.nonzero(side == AI)[0]
+                if ai_rows.size:
+                    logits = out[ai_rows, 1:]
+                    logits = logits - logits.max(axis=1, keepdims=True)
+                    probs = np.exp(logits)
+                    probs /= probs.sum(axis=1, keepdims=True)
+                    actions = batch["action"][ai_rows].astype(np.intp)
+                    loss += policy_weight * float(-np.mean(np.log(probs[np.arange(ai_rows.size), actions] + 1e-9)))
+                    probs[np.arange(ai_rows.size), actions] -= 1
+                    grad_out[ai_rows, 1:] = policy_weight * probs / ai_rows.size
+                
+                grad_hidden = (grad_out @ self.w2.T) * (hidden > 0)
+                grads = [x.T @ grad_hidden, grad_hidden.sum(axis=0), hidden.T @ grad_out, grad_out.sum(axis=0)]
+                step += 1
+                for param, grad, m, v in zip(params, grads, moments, squares):
+                    m *= beta1
+                    m += (1 - beta1) * grad
+                    v *= beta2
+                    v += (1 - beta2) * grad * grad
+                    param -= (learning_rate * np.sqrt(1 - beta2 ** step) / (1 - beta1 ** step)
+                              * m / (np.sqrt(v) + 1e-8)).astype(np.float32)
+                total += loss
+                batches += 1
+            if progress:
+                progress(epoch + 1, total / max(batches, 1))
+        return self
+    
+    def save(self, path):
+        """Write the weights and input scaling to an .npz file"""
+        np.savez(path, mean=self.mean, scale=self.scale, w1=self.w1, b1=self.b1, w2=self.w2, b2=self.b2)
+    
+    @classmethod
+    def load(cls, path):
+        """Evaluator from a file written by save"""
+        data = np.load(path)
+        evaluator = cls(hidden=data["w1"].shape[1])
+        for name in ("mean", "scale", "w1", "b1", "w2", "b2"):
+            setattr(evaluator, name, data[name])
+        return evaluator
+
+def evaluator_policy(evaluator):
+    """BatchSimulator AI policy playing the evaluator's highest-scoring legal action"""
+    def policy(simulator):
+        _, logits = evaluator.evaluate(simulator.features())
+        return np.argmax(np.where(simulator.legal_masks(AI), logits, -np.inf), axis=1)
+    return policy
@@ -0,0 +1,204 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Fog of War
+Explored-tile tracking as packed bitsets, one Python integer per map level
+"""
+
+import heapq
+from math import isqrt
+
+HERO_SIGHT_RADIUS = 5  # Scouting radius without the Scouting skill or artifacts
+
+class FogOfWar:
+    """Explored tiles of every map level, bit y * width + x of each level's integer"""
+    
+    # Python integers act as packed bit arrays: OR, AND, shifts and bit_count
+    # run over the whole level in C, so a 144x144 level is 2.6 KB and a reveal
+    # or frontier query is a handful of big-integer operations.
+    #
+    # The frontier and each frontier tile's information gain (unexplored tiles
+    # a hero would see from it) are kept up to date around every reveal, and a
+    # lazy max-heap hands out the best exploration target.
+    
+    def __init__(self, width, height, levels=1, sight_radius=HERO_SIGHT_RADIUS):
+        self.width = width
+        self.height = height
+        self.levels = [0] * levels
+        self.full = (1 << (width * height)) - 1
+        self.sight_radius = sight_radius  # Radius used to score frontier tiles
+        self.frontiers = [0] * levels  # Frontier bits per level
+        self.gains = [{} for _ in range(levels)]  # Frontier tile index -> information gain
+        self.gain_heaps = [[] for _ in range(levels)]  # (-gain, index), stale entries skipped
+        
+        # Bits of the first and last column, to stop horizontal shifts wrapping rows
+        first_column = 0
+        for y in range(height):
+            first_column |= 1 << (y * width)
+        self.first_column = first_column
+        self.last_column = first_column << (width - 1)
+        self.discs = {}  # radius -> (rows, disc bits anchored at the top-left of its box)
+    
+    def disc(self, radius):
+        """Half-width of each disc row and the whole disc as one bit pattern"""
+        cached = self.discs.get(radius)
+        if cached is None:
+            rows = [isqrt(radius * radius - dy * dy) for dy in range(-radius, radius + 1)]
+            bits = 0
+            for row, half in enumerate(rows):
+                bits |= ((1 << (2 * half + 1)) - 1) << (row * self.width + radius - half)
+            cached = self.discs[radius] = (rows, bits)
+        return cached
+    
+    def stamp(self, x, y, radius):
+        """Bits of the disc of tiles within a radius of (x, y), clipped to the map"""
+        rows, bits = self.disc(radius)
+        if radius <= x < self.width - radius and radius <= y < self.height - radius:
+            return bits << ((y - radius) * self.width + x - radius)
+        
+        # Near an edge, clip each row separately
+        stamp = 0
+        for dy, half in zip(range(-radius, radius + 1), rows):
+            row = y + dy
+            if 0 <= row < self.height:
+                x0, x1 = max(0, x - half), min(self.width - 1, x + half)
+                if x0 <= x1:
+                    stamp |= ((1 << (x1 - x0 + 1)) - 1) << (row * self.width + x0)
+        return stamp
+    
+    def reveal(self, x, y, radius=HERO_SIGHT_RADIUS, level=0):
+        """Mark a disc of tiles explored; returns how many were newly revealed"""
+        return self.mark(self.stamp(x, y, radius), level)
+    
+    def mark(self, bits, level=0):
+        """Mark a bit pattern explored and update the frontier around it; returns new tiles"""
+        explored = self.levels[level]
+        new = bits & self.full & ~explored
+        if new:
+            self.levels[level] = explored | new
+            self.update_frontier(new, level)
+        return new.bit_count()
+    
+    def update_frontier(self, new, level):
+        """Refresh frontier membership and gains near newly explored tiles only"""
+        explored = self.levels[level]
+        
+        # Frontier membership can only change on or next to the new tiles
+        near = self.dilate(new)
+        unexplored = self.full & ~explored & self.dilate(near)
+        fresh = explored & near & self.dilate(unexplored)
+        previous = self.frontiers[level]
+        frontier = self.frontiers[level] = (previous & ~near) | fresh
+        
+        gains = self.gains[level]
+        for index in self.indices(previous & near & ~fresh):
+            gains.pop(index, None)
+        
+        # Gains change for frontier tiles whose sight disc reaches a new tile
+        reach = new
+        for _ in range(self.sight_radius):
+            reach = self.dilate(reach)
+        heap = self.gain_heaps[level]
+        for index in self.indices(frontier & reach):
+            gain = self.gain(index, level)
+            gains[index] = gain
+            heapq.heappush(heap, (-gain, index))
+        if len(heap) > 4 * len(gains) + 64:
+            self.gain_heaps[level] = [(-gain, index) for index, gain in gains.items()]
+            heapq.heapify(self.gain_heaps[level])
+    
+    def gain(self, index, level=0):
+        """Unexplored tiles a hero standing on a tile would see"""
+        y, x = divmod(index, self.width)
+        return (self.stamp(x, y, self.sight_radius) & ~self.levels[level]).bit_count()
+    
+    def best_frontier(self, level=0):
+        """(x, y, gain) of the frontier tile that would reveal the most, or None"""
+        heap = self.gain_heaps[level]
+        gains = self.gains[level]
+        while heap:
+            gain, index = heap[0]
+            if gains.get(index) == -gain and gain < 0:
+                return index % self.width, index // self.width, -gain
+            heapq.heappop(heap)
+        return None
+    
+    def is_explored(self, x, y, level=0):
+        """Whether a tile has been seen"""
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.levels[level] >> (y * self.width + x) & 1)
+    
+    def explored_count(self, level=None):
+        """Explored tiles on one level, or on all levels"""
+        if level is not None:
+            return self.levels[level].bit_count()
+        return sum(bits.bit_count() for bits in self.levels)
+    
+    def explored_fraction(self, level=None):
+        """Share of the map that has been seen"""
+        tiles = self.width * self.height * (1 if level is not None else len(self.levels))
+        return self.explored_count(level) / tiles
+    
+    def dilate(self, bits):
+        """Bits grown by one tile in all eight directions"""
+        width = self.width
+        # The last tile's left shift lands past the map and would wrap back in on the vertical shift
+        grown = (bits | ((bits << 1) & ~self.first_column) | ((bits >> 1) & ~self.last_column)) & self.full
+        grown |= (grown << width) | (grown >> width)
+        return grown & self.full
+    
+    def frontier_bits(self, level=0):
+        """Explored tiles that touch unexplored ones"""
+        return self.frontiers[level]
+    
+    def frontier_size(self, level=0):
+        """Number of frontier tiles"""
+        return len(self.gains[level])
+    
+    def frontier(self, level=0):
+        """(x, y) of explored tiles on the edge of the unknown"""
+        return list(self.tiles(self.frontiers[level]))
+    
+    def indices(self, bits):
+        """Index of every set bit, lowest first"""
+        # Walk 64-bit words between the lowest and highest set bit only
+        if not bits:
+            return
+        base = ((bits & -bits).bit_length() - 1) & ~63
+        bits >>= base
+        data = bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+        for offset in range(0, len(data), 8):
+            word = int.from_bytes(data[offset:offset + 8], "little")
+            while word:
+                low = word & -word
+                yield base + offset * 8 + low.bit_length() - 1
+                word ^= low
+    
+    def tiles(self, bits):
+        """(x, y) of every set bit, lowest index first"""
+        for index in self.indices(bits):
+            yield index % self.width, index // self.width
+    
+    # Set-style access, so code written against sets of (x, y) tiles keeps working
+    
+    def add(self, tile):
+        """Mark one (x, y) or (x, y, level) tile explored"""
+        self.update([tile])
+    
+    def update(self, tiles):
+        """Mark several tiles explored"""
+        bits = [0] * len(self.levels)
+        for tile in tiles:
+            bits[tile[2] if len(tile) > 2 else 0] |= 1 << (tile[1] * self.width + tile[0])
+        for level, level_bits in enumerate(bits):
+            if level_bits:
+                self.mark(level_bits, level)
+    
+    def __contains__(self, tile):
+        return self.is_explored(tile[0], tile[1], tile[2] if len(tile) > 2 else 0)
+    
+    def __len__(self):
+        return self.explored_count()
+    
+    def __iter__(self):
+        for level, bits in enumerate(self.levels):
+            for x, y in self.tiles(bits):
+                yield (x, y) if level == 0 else (x, y, level)
@@ -5,11 +5,35 @@ Play directly against AI without needing VCMI setup
 """
 
 import json
+import math
 import random
-import tkinter as tk
-from tkinter import ttk, messagebox
-import threading
-import time
+from homm3_anytime import Deadline, run_anytime
+
+# Actions the human side can take, used by headless games and AI rollouts
+HUMAN_ACTIONS = [
+    {"type": "recruit", "units": "archers", "amount": 10, "cost": 600},
+    {"type": "recruit", "units": "swordsmen", "amount": 8, "cost": 800},
+    {"type": "capture", "target": "mine"},
+    {"type": "capture", "target": "castle"},
+    {"type": "attack", "target": "ai"}
+]
+
+# Alternatives the AI weighs against its rule-based choice when it has time
+AI_ACTIONS = [
+    {"action": "recruit", "units": "archers", "amount": 10, "cost": 600},
+    {"action": "recruit", "units": "swordsmen", "amount": 8, "cost": 800},
+    {"action": "recruit", "units": "swordsmen", "amount": 5, "cost": 500},
+    {"action": "capture", "target": "mine"},
+    {"action": "capture", "target": "castle"},
+    {"action": "capture", "target": "artifact"},
+    {"action": "attack", "target": "human"}
+]
+
+TIME_BANK_TURNS = 3  # Most unused thinking time carried over, in per-turn budgets
+ROLLOUT_TURNS = 6  # Turns each rollout plays past the search tree
+SEARCH_BATCH = 8  # Search iterations between refined decisions
+NODE_POOL_SIZE = 50000  # Most search nodes alive at once
+EXPLORATION = 0.7  # UCT exploration weight for values in [-1, 1]
 
 class GameState:
     def __init__(self):
@@ -26,11 +50,87 @@ class GameState:
         }
         self.game_over = False
         self.winner = None
+    
+    def copy(self):
+        """Independent copy; much cheaper than copy.deepcopy for search and rollouts"""
+        state = GameState.__new__(GameState)
+        state.turn = self.turn
+        state.current_player = self.current_player
+        state.human_resources = dict(self.human_resources)
+        state.ai_resources = dict(self.ai_resources)
+        state.human_army = dict(self.human_army)
+        state.ai_army = dict(self.ai_army)
+        state.map_locations = {name: dict(location) for name, location in self.map_locations.items()}
+        state.game_over = self.game_over
+        state.winner = self.winner
+        return state
 
 class HeroesAI:
     def __init__(self):
         self.strategy = "balanced"
-        
+        self.rng = random.Random()  # Search uses its own dice, not the game's
+        self.max_search_iterations = 1400
+        self.tree = SearchTree(self.rng)  # Kept between turns and re-rooted on the real outcome
+        self.evaluator = None  # Learned StateEvaluator scoring search leaves instead of rollouts
+        self.opening_book = None  # OpeningBook consulted before any search
+    
+    def decide(self, game_state, deadline=None):
+        """Best decision found before the deadline; the rule-based one, as it is, without a deadline"""
+        return run_anytime(self.refine_decision(game_state, searching=deadline is not None), deadline)
+    
+    def refine_decision(self, game_state, searching=True):
+        """Yield the book move if there is one, else the rule-based decision and then the most searched action
+        
+        Without searching only the rule decision is yielded, even when the
+        engine would reject it, so play without a time budget is unchanged.
+        A search plays legal actions only.
+        """
+        if self.opening_book is not None:
+            book_decision = self.opening_book.lookup(game_state)
+            if book_decision is not None:
+                yield dict(book_decision)
+                return
+        
+        self.tree.reroot(game_state)
+        rule_decision = self.make_decision(game_state)
+        legal = mask_indices(legal_mask(game_state, "ai"))
+        if not searching or not legal:
+            yield rule_decision
+            return
+        
+        # An unaffordable or pointless rule decision gives way to the first legal action
+        preferred = AI_ACTION_INDEX[action_key(rule_decision)]
+        if preferred not in legal:
+            preferred = legal[0]
+            rule_decision = dict(AI_ACTIONS[preferred])
+        yield rule_decision
+        
+        for iteration in range(1, self.max_search_iterations + 1):
+            self.tree.iterate(game_state, self)
+            if iteration % SEARCH_BATCH == 0:
+                yield dict(AI_ACTIONS[self.tree.best_action(legal, preferred)])
+    
+    def leaf_value(self, engine):
+        """Value of a search leaf: the evaluator's estimate if there is one, else a rollout"""
+        if self.evaluator is not None and not engine.state.game_over:
+            return self.evaluator.value(engine.state)
+        return self.play_out(engine, ROLLOUT_TURNS)
+    
+    def play_out(self, engine, turns):
+        """Continue a game with the rule-based AI and a random human; value from the AI's side"""
+        for _ in range(turns):
+            if engine.state.game_over:
+                break
+            decision = self.make_decision(engine.state)
+            if not is_legal(engine.state, decision):
+                decision = self.rng.choice(legal_actions(engine.state, "ai"))
+            engine.apply_ai_decision(decision)
+            if engine.state.game_over:
+                break
+            engine.next_turn()
+            engine.process_human_action(self.rng.choice(legal_actions(engine.state, "human")))
+        return engine.state_value()
+    
     def make_decision(self, game_state):
         """AI decides what action to take"""
         ai_gold = game_state.ai_resources["gold"]
@@ -57,12 +157,209 @@ class HeroesAI:
             else:
                 return {"action": "recruit", "units": "swordsmen", "amount": 5, "cost": 500}
 
+def action_key(decision):
+    """Identity of an AI decision, ignoring its explanation"""
+    return (decision["action"], decision.get("target"), decision.get("units"), decision.get("amount"))
+
+def action_table(actions):
+    """Attack bits, (bit, cost) of recruits and (bit, target) of captures in an action list"""
+    attack, recruits, captures = 0, [], []
+    for index, action in enumerate(actions):
+        kind = action.get("action", action.get("type"))
+        if kind == "attack":
+            attack |= 1 << index
+        elif kind == "recruit":
+            recruits.append((1 << index, action["cost"]))
+        elif kind == "capture":
+            captures.append((1 << index, action["target"]))
+    return attack, tuple(recruits), tuple(captures)
+
+# Per side: its action list and the table legality is computed from
+SIDE_ACTIONS = {"human": HUMAN_ACTIONS, "ai": AI_ACTIONS}
+ACTION_TABLES = {side: action_table(actions) for side, actions in SIDE_ACTIONS.items()}
+AI_ACTION_INDEX = {action_key(action): index for index, action in enumerate(AI_ACTIONS)}
+
+def legal_mask(state, side):
+    """Bit i set when the engine would accept the side's action i; no side effects"""
+    if state.game_over:
+        return 0
+    attack, recruits, captures = ACTION_TABLES[side]
+    gold = (state.ai_resources if side == "ai" else state.human_resources)["gold"]
+    mask = attack
+    for bit, cost in recruits:
+        if gold >= cost:
+            mask |= bit
+    for bit, target in captures:
+        location = state.map_locations.get(target)
+        if location is not None and location["owner"] != side:
+            mask |= bit
+    return mask
+
+def mask_indices(mask):
+    """Indices of the set bits of an action mask"""
+    indices = []
+    while mask:
+        low = mask & -mask
+        indices.append(low.bit_length() - 1)
+        mask ^= low
+    return indices
+
+def legal_actions(state, side):
+    """The side's actions the engine would accept in a state"""
+    actions = SIDE_ACTIONS[side]
+    return [actions[index] for index in mask_indices(legal_mask(state, side))]
+
+def is_legal(state, decision):
+    """Whether an AI decision from AI_ACTIONS would be accepted"""
+    index = AI_ACTION_INDEX.get(action_key(decision))
+    return index is not None and legal_mask(state, "ai") >> index & 1 == 1
+
+def state_key(state):
+    """Hashable snapshot of everything that affects play from a state"""
+    return (state.turn,
+            tuple(state.human_resources.items()), tuple(state.ai_resources.items()),
+            tuple(state.human_army.items()), tuple(state.ai_army.items()),
+            tuple(location["owner"] for location in state.map_locations.values()),
+            state.game_over, state.winner)
+
+class SearchNode:
+    """An AI decision point: per-action visit statistics and the states each led to"""
+    
+    __slots__ = ("key", "visits", "action_visits", "action_values", "children")
+    
+    def reset(self, key):
+        self.key = key
+        self.visits = 0
+        self.action_visits = [0] * len(AI_ACTIONS)
+        self.action_values = [0.0] * len(AI_ACTIONS)
+        self.children = {}  # state key after the AI move, next turn and human move -> node
+        return self
+
+class NodePool:
+    """Fixed number of search nodes, recycled as the tree is pruned"""
+    
+    def __init__(self, capacity=NODE_POOL_SIZE):
+        self.capacity = capacity
+        self.created = 0
+        self.free = []
+    
+    def acquire(self, key):
+        """A reset node, or None when the pool is used up"""
+        if self.free:
+            return self.free.pop().reset(key)
+        if self.created >= self.capacity:
+            return None
+        self.created += 1
+        return SearchNode().reset(key)
+    
+    def release(self, node):
+        """Return a node and its whole subtree to the pool"""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            stack.extend(node.children.values())
+            node.children = {}
+            self.free.append(node)
+    
+    def in_use(self):
+        """Nodes currently part of a tree"""
+        return self.created - len(self.free)
+
+class SearchTree:
+    """UCT search over AI decisions with the human side as random chance"""
+    
+    # Each edge is an AI action followed by next_turn and a random human
+    # action; combat dice make it stochastic, so children are keyed by the
+    # resulting state. After the real turn the tree is re-rooted at the child
+    # matching the real state and everything else goes back to the pool, so
+    # the search for the next decision starts from the statistics it already
+    # gathered.
+    
+    def __init__(self, rng, pool=None):
+        self.rng = rng
+        self.pool = pool or NodePool()
+        self.root = None
+        self.engine = None  # Scratch engine every iteration plays on, made on first use
+    
+    def reroot(self, game_state):
+        """Make the node for the current state the root, reusing it if it was searched"""
+        key = state_key(game_state)
+        if self.root is not None and self.root.key == key:
+            return self.root
+        reused = None
+        if self.root is not None:
+            reused = self.root.children.pop(key, None)
+            self.pool.release(self.root)
+        self.root = reused or self.pool.acquire(key) or SearchNode().reset(key)
+        return self.root
+    
+    def select(self, node, legal):
+        """UCT choice among the legal action indices, trying each once first"""
+        for index in legal:
+            if node.action_visits[index] == 0:
+                return index
+        log_visits = math.log(node.visits)
+        return max(legal,
+                   key=lambda i: node.action_values[i] / node.action_visits[i]
+                   + EXPLORATION * math.sqrt(log_visits / node.action_visits[i]))
+    
+    def iterate(self, game_state, ai):
+        """One search iteration: descend, expand one node, play out and back up"""
+        if self.engine is None:
+            self.engine = GameEngine()
+            self.engine.rng = self.rng
+        engine = self.engine
+        engine.state = game_state.copy()
+        node = self.root
+        path = []
+        while node is not None and not engine.state.game_over:
+            index = self.select(node, mask_indices(legal_mask(engine.state, "ai")))
+            path.append((node, index))
+            engine.apply_ai_decision(AI_ACTIONS[index])
+            if engine.state.game_over:
+                break
+            engine.next_turn()
+            engine.process_human_action(self.rng.choice(legal_actions(engine.state, "human")))
+            
+            key = state_key(engine.state)
+            child = node.children.get(key)
+            if child is None:
+                child = self.pool.acquire(key)
+                if child is not None:
+                    node.children[key] = child
+                break
+            node = child
+        
+        value = ai.leaf_value(engine)
+        for node, index in path:
+            node.visits += 1
+            node.action_visits[index] += 1
+            node.action_values[index] += value
+    
+    def best_action(self, legal, preferred):
+        """Most visited legal root action; ties keep the preferred one"""
+        visits = self.root.action_visits
+        return max(legal, key=lambda i: (visits[i], i == preferred))
+    
+    def depth(self):
+        """Deepest line of the current tree"""
+        deepest = 0
+        stack = [(self.root, 0)] if self.root is not None else []
+        while stack:
+            node, depth = stack.pop()
+            deepest = max(deepest, depth)
+            stack.extend((child, depth + 1) for child in node.children.values())
+        return deepest
+
 class GameEngine:
-    def __init__(self, ui_callback):
+    def __init__(self, ui_callback=None):
         self.state = GameState()
         self.ai = HeroesAI()
         self.ui_callback = ui_callback
-        
+        self.rng = random  # Combat dice
+        self.ai_time_budget = None  # Seconds the AI may think per turn; None decides instantly
+        self.time_bank = 0.0  # Budget left over from quick turns, e.g. book moves
+    
     def process_human_action(self, action):
         """Process human player action"""
         if action["type"] == "recruit":
@@ -78,7 +375,7 @@ class GameEngine:
                 return True, f"Recruited {amount} {unit_type}"
             else:
                 return False, "Not enough gold"
-                
+        
         elif action["type"] == "capture":
             target = action["target"]
             if target in self.state.map_locations:
@@ -92,16 +389,24 @@ class GameEngine:
                     return False, f"Already own {target}"
             else:
                 return False, "Invalid target"
-                
+        
         elif action["type"] == "attack":
             return self.resolve_combat("human", "ai")
-            
+        
         return False, "Invalid action"
     
-    def process_ai_turn(self):
+    def process_ai_turn(self, deadline=None):
         """AI takes its turn"""
-        decision = self.ai.make_decision(self.state)
-        
+        banking = deadline is None and self.ai_time_budget is not None
+        if banking:
+            deadline = Deadline(self.ai_time_budget + self.time_bank)
+        decision = self.ai.decide(self.state, deadline)
+        if banking:
+            self.time_bank = min(deadline.remaining(), TIME_BANK_TURNS * self.ai_time_budget)
+        return self.apply_ai_decision(decision)
+    
+    def apply_ai_decision(self, decision):
+        """Carry out one AI decision"""
         if decision["action"] == "recruit":
             cost = decision["cost"]
             if self.state.ai_resources["gold"] >= cost:
@@ -115,7 +420,7 @@ class GameEngine:
                 return f"AI recruited {amount} {unit_type}"
             else:
                 return "AI tried to recruit but lacks gold"
-                
+        
         elif decision["action"] == "capture":
             target = decision["target"]
             if target in self.state.map_locations:
@@ -127,11 +432,11 @@ class GameEngine:
                     return f"AI captured {target}"
                 else:
                     return f"AI already owns {target}"
-                    
+        
         elif decision["action"] == "attack":
             success, result = self.resolve_combat("ai", "human")
             return f"AI attacked: {result}"
-            
+        
         return f"AI: {decision['action']} - {decision.get('reason', '')}"
     
     def resolve_combat(self, attacker, defender):
@@ -142,13 +447,13 @@ class GameEngine:
         else:
             att_army = self.state.ai_army
             def_army = self.state.human_army
-            
+        
         att_power = sum(att_army.values())
         def_power = sum(def_army.values())
         
         # Simple combat resolution with randomness
-        att_roll = att_power * random.uniform(0.8, 1.2)
-        def_roll = def_power * random.uniform(0.8, 1.2)
+        att_roll = att_power * self.rng.uniform(0.8, 1.2)
+        def_roll = def_power * self.rng.uniform(0.8, 1.2)
         
         if att_roll > def_roll:
             # Attacker wins
@@ -157,8 +462,8 @@ class GameEngine:
                 def_army[unit] = max(0, int(def_army[unit] * (1 - damage_ratio)))
             
             if sum(def_army.values()) == 0:
-                self.game_over = True
-                self.winner = attacker
+                self.state.game_over = True
+                self.state.winner = attacker
                 return True, f"{attacker.title()} wins the game!"
             else:
                 return True, f"{attacker.title()} wins battle, {defender} army weakened"
@@ -180,6 +485,22 @@ class GameEngine:
             elif data["owner"] == "ai" and location == "mine":
                 self.state.ai_resources["gold"] += data["income"] // 2
     
+    def state_value(self):
+        """Position value for the AI in [-1, 1]: the result if decided, else army and gold balance"""
+        if self.state.game_over:
+            return 1.0 if self.state.winner == "ai" else -1.0
+        ai_power = sum(self.state.ai_army.values())
+        human_power = sum(self.state.human_army.values())
+        army = (ai_power - human_power) / max(ai_power + human_power, 1)
+        ai_gold = self.state.ai_resources["gold"]
+        human_gold = self.state.human_resources["gold"]
+        gold = (ai_gold - human_gold) / max(ai_gold + human_gold, 1)
+        return 0.8 * army + 0.2 * gold
+    
+    def legal_actions(self, side="human"):
+        """Actions a side can take right now, without trying them"""
+        return legal_actions(self.state, side)
+    
     def get_game_status(self):
         """Get current game status for display"""
         return {
@@ -193,162 +514,6 @@ class GameEngine:
             "winner": self.state.winner
         }
 
-class GameUI:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.engine = GameEngine(self.update_display)
-        self.setup_ui()
-        self.update_display()
-        
-    def setup_ui(self):
-        self.root.title("Heroes III vs AI")
-        self.root.geometry("600x500")
-        
-        # Game status frame
-        status_frame = ttk.Frame(self.root)
-        status_frame.pack(fill="x", padx=10, pady=5)
-        
-        self.turn_label = ttk.Label(status_frame, text="Turn 1", font=("Arial", 12, "bold"))
-        self.turn_label.pack()
-        
-        # Resources frame
-        res_frame = ttk.LabelFrame(self.root, text="Resources")
-        res_frame.pack(fill="x", padx=10, pady=5)
-        
-        self.human_res_label = ttk.Label(res_frame, text="Your Gold: 1000")
-        self.human_res_label.pack(anchor="w")
-        
-        self.ai_res_label = ttk.Label(res_frame, text="AI Gold: 1000")
-        self.ai_res_label.pack(anchor="w")
-        
-        # Armies frame
-        army_frame = ttk.LabelFrame(self.root, text="Armies")
-        army_frame.pack(fill="x", padx=10, pady=5)
-        
-        self.human_army_label = ttk.Label(army_frame, text="Your Army: ")
-        self.human_army_label.pack(anchor="w")
-        
-        self.ai_army_label = ttk.Label(army_frame, text="AI Army: ")
-        self.ai_army_label.pack(anchor="w")
-        
-        # Map locations frame
-        map_frame = ttk.LabelFrame(self.root, text="Map Locations")
-        map_frame.pack(fill="x", padx=10, pady=5)
-        
-        self.map_label = ttk.Label(map_frame, text="")
-        self.map_label.pack(anchor="w")
-        
-        # Actions frame
-        action_frame = ttk.LabelFrame(self.root, text="Your Actions")
-        action_frame.pack(fill="x", padx=10, pady=5)
-        
-        btn_frame = ttk.Frame(action_frame)
-        btn_frame.pack(fill="x", pady=5)
-        
-        ttk.Button(btn_frame, text="Recruit Archers (600g)", 
-                  command=lambda: self.player_action("recruit", "archers", 10, 600)).pack(side="left", padx=5)
-        ttk.Button(btn_frame, text="Recruit Swordsmen (800g)", 
-                  command=lambda: self.player_action("recruit", "swordsmen", 8, 800)).pack(side="left", padx=5)
-        
-        btn_frame2 = ttk.Frame(action_frame)
-        btn_frame2.pack(fill="x", pady=5)
-        
-        ttk.Button(btn_frame2, text="Capture Mine", 
-                  command=lambda: self.player_action("capture", "mine")).pack(side="left", padx=5)
-        ttk.Button(btn_frame2, text="Capture Castle", 
-                  command=lambda: self.player_action("capture", "castle")).pack(side="left", padx=5)
-        ttk.Button(btn_frame2, text="Attack AI", 
-                  command=lambda: self.player_action("attack", "ai")).pack(side="left", padx=5)
-        
-        # End turn button
-        ttk.Button(self.root, text="End Turn", command=self.end_turn, 
-                  style="Accent.TButton").pack(pady=10)
-        
-        # Log area
-        ttk.Label(self.root, text="Game Log:").pack(anchor="w", padx=10)
-        self.log_text = tk.Text(self.root, height=8, wrap="word")
-        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=scrollbar.set)
-        
-        log_frame = ttk.Frame(self.root)
-        log_frame.pack(fill="both", expand=True, padx=10, pady=5)
-        self.log_text.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        self.log("Game started! Choose your actions and click End Turn.")
-        
-    def player_action(self, action_type, target, amount=0, cost=0):
-        """Handle player action"""
-        action = {
-            "type": action_type,
-            "target": target,
-            "amount": amount,
-            "cost": cost,
-            "units": target if action_type == "recruit" else None
-        }
-        
-        success, message = self.engine.process_human_action(action)
-        self.log(f"You: {message}")
-        self.update_display()
-        
-        if self.engine.state.game_over:
-            self.show_game_over()
-            
-    def end_turn(self):
-        """End current turn and let AI play"""
-        self.log("--- Turn ended ---")
-        
-        # AI turn
-        ai_result = self.engine.process_ai_turn()
-        self.log(f"AI: {ai_result}")
-        
-        # Next turn
-        self.engine.next_turn()
-        self.update_display()
-        
-        if self.engine.state.game_over:
-            self.show_game_over()
-        else:
-            self.log(f"--- Turn {self.engine.state.turn} begins ---")
-            
-    def update_display(self):
-        """Update all display elements"""
-        status = self.engine.get_game_status()
-        
-        self.turn_label.config(text=f"Turn {status['turn']}")
-        self.human_res_label.config(text=f"Your Gold: {status['human_resources']['gold']}")
-        self.ai_res_label.config(text=f"AI Gold: {status['ai_resources']['gold']}")
-        
-        human_army_text = ", ".join([f"{k}: {v}" for k, v in status['human_army'].items()])
-        ai_army_text = ", ".join([f"{k}: {v}" for k, v in status['ai_army'].items()])
-        
-        self.human_army_label.config(text=f"Your Army: {human_army_text}")
-        self.ai_army_label.config(text=f"AI Army: {ai_army_text}")
-        
-        map_text = ""
-        for location, data in status['map_locations'].items():
-            owner = data['owner'] or 'neutral'
-            map_text += f"{location.title()}: {owner}  "
-        self.map_label.config(text=map_text)
-        
-    def show_game_over(self):
-        """Show game over dialog"""
-        winner = self.engine.state.winner
-        if winner == "human":
-            messagebox.showinfo("Victory!", "Congratulations! You defeated the AI!")
-        else:
-            messagebox.showinfo("Defeat", "The AI has conquered your forces!")
-            
-    def log(self, message):
-        """Add message to game log"""
-        self.log_text.insert("end", f"{message}\n")
-        self.log_text.see("end")
-        self.root.update_idletasks()
-        
-    def run(self):
-        """Run the game"""
-        self.root.mainloop()
-
 if __name__ == "__main__":
-    game = GameUI()
-    game.run()
\ No newline at end of file
+    from homm3_simulator_gui import main
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Influence Maps
+Per-tile own and enemy strength, decayed by movement distance and by sighting age
+"""
+
+import numpy as np
+
+BASE_FALLOFF = 6.0  # Tiles over which a fresh sighting's influence drops by 1/e
+FALLOFF_PER_TURN = 8.0  # Extra spread per turn since a sighting, for where the hero may have gone
+AGE_DECAY = 0.85  # Strength kept per turn since a sighting
+MAX_SIGHTING_AGE = 10  # Sightings older than this are ignored
+
+class InfluenceMap:
+    """Own and enemy influence over the map, rebuilt per turn and patched per sighting"""
+    
+    # Influence falls off as exp(-|dx| / f) * exp(-|dy| / f). The kernel is
+    # separable, so summing all sources is one (height x n) @ (n x width)
+    # product, which is the convolution of the sparse source grid with the
+    # kernel. Within a turn a changed source is a rank-one patch.
+    
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.turn = 0
+        self.sources = {"own": {}, "enemy": {}}  # side -> key -> (x, y, strength, seen turn)
+        self.grids = {"own": None, "enemy": None}  # Cached per side, None when stale
+        self.rows = np.arange(height, dtype=np.float32)
+        self.columns = np.arange(width, dtype=np.float32)
+    
+    def weights(self, sources):
+        """Per-source kernel rows and columns, already scaled by aged strength"""
+        xs = np.array([s[0] for s in sources], dtype=np.float32)
+        ys = np.array([s[1] for s in sources], dtype=np.float32)
+        strength = np.array([s[2] for s in sources], dtype=np.float32)
+        age = np.array([self.turn - s[3] for s in sources], dtype=np.float32)
+        falloff = BASE_FALLOFF + FALLOFF_PER_TURN * age
+        vertical = np.exp(-np.abs(self.rows[:, None] - ys[None, :]) / falloff) * (strength * AGE_DECAY ** age)
+        horizontal = np.exp(-np.abs(self.columns[:, None] - xs[None, :]) / falloff)
+        return vertical, horizontal
+    
+    def active(self, source):
+        """Whether a source is recent enough to count"""
+        return source is not None and self.turn - source[3] <= MAX_SIGHTING_AGE
+    
+    def build(self, side):
+        """Influence grid of one side from all of its current sources"""
+        sources = [s for s in self.sources[side].values() if self.active(s)]
+        if not sources:
+            return np.zeros((self.height, self.width), dtype=np.float32)
+        vertical, horizontal = self.weights(sources)
+        return vertical @ horizontal.T
+    
+    def grid(self, side):
+        """Cached influence grid of "own" or "enemy" """
+        if self.grids[side] is None:
+            self.grids[side] = self.build(side)
+        return self.grids[side]
+    
+    def set_source(self, side, key, x, y, strength, turn=None):
+        """Add or move a unit or town; patches the cached grid in place"""
+        source = (x, y, strength, self.turn if turn is None else turn)
+        previous = self.sources[side].get(key)
+        self.sources[side][key] = source
+        grid = self.grids[side]
+        if grid is None:
+            return
+        if self.active(previous):
+            vertical, horizontal = self.weights([previous])
+            grid -= np.outer(vertical[:, 0], horizontal[:, 0])
+        if self.active(source):
+            vertical, horizontal = self.weights([source])
+            grid += np.outer(vertical[:, 0], horizontal[:, 0])
+    
+    def remove_source(self, side, key):
+        """Forget a unit, e.g. a defeated hero"""
+        if self.sources[side].pop(key, None) is not None:
+            self.grids[side] = None
+    
+    def advance_turn(self, turn=None):
+        """Age every sighting; the grids are rebuilt on next use"""
+        self.turn = self.turn + 1 if turn is None else turn
+        self.grids = {"own": None, "enemy": None}
+    
+    def control(self):
+        """Own minus enemy influence: positive where the AI dominates"""
+        return self.grid("own") - self.grid("enemy")
+    
+    def tension(self):
+        """Where both sides project strength, i.e. likely battlegrounds"""
+        return np.minimum(self.grid("own"), self.grid("enemy"))
+    
+    def pressure_at(self, tiles):
+        """Summed (own, enemy) influence over a list of (x, y) tiles"""
+        if not tiles:
+            return 0.0, 0.0
+        xs = np.array([t[0] for t in tiles], dtype=np.intp)
+        ys = np.array([t[1] for t in tiles], dtype=np.intp)
+        return float(self.grid("own")[ys, xs].sum()), float(self.grid("enemy")[ys, xs].sum())
+    
+    def safest_tiles(self, count=5):
+        """(x, y) of the tiles with the strongest own control"""
+        control = self.control()
+        best = np.argpartition(control.ravel(), -count)[-count:]
+        best = best[np.argsort(control.ravel()[best])[::-1]]
+        return [(int(i % self.width), int(i // self.width)) for i in best]
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Adventure Map Model
+Compact tile grid built from the adventure-map viewport and the minimap
+"""
+
+import numpy as np
+
+# Tile byte layout: low nibble is the terrain, high bits are flags
+TERRAIN_MASK = 0x0F
+OBSTACLE = 0x10
+OBJECT = 0x20
+FOG = 0x40
+
+TERRAINS = ("unknown", "dirt", "sand", "grass", "snow", "swamp", "rough",
+            "subterranean", "lava", "water", "rock")
+TERRAIN_INDEX = {name: i for i, name in enumerate(TERRAINS)}
+
+# Minimap colors per terrain: (open tile, blocked tile)
+MINIMAP_TERRAIN_COLORS = {
+    "dirt": ((82, 56, 8), (57, 40, 8)),
+    "sand": ((222, 207, 140), (165, 158, 107)),
+    "grass": ((0, 65, 0), (0, 48, 0)),
+    "snow": ((181, 199, 198), (140, 158, 156)),
+    "swamp": ((74, 134, 107), (33, 89, 66)),
+    "rough": ((132, 113, 49), (99, 81, 33)),
+    "subterranean": ((132, 48, 0), (90, 8, 0)),
+    "lava": ((74, 73, 74), (41, 40, 41)),
+    "water": ((8, 81, 148), (8, 81, 148)),
+    "rock": ((0, 0, 0), (0, 0, 0))
+}
+
+# Player flag colors; owned objects show up on the minimap in these
+PLAYER_COLORS = ((255, 0, 0), (49, 82, 255), (156, 115, 82), (66, 148, 41),
+                 (255, 132, 0), (140, 41, 165), (8, 156, 165), (198, 123, 140))
+
+TILE_SIZE = 32  # Adventure-map tile size in pixels on the 800x600 screen
+TILE_SAMPLE_STEP = 4  # Pixel stride used for per-tile viewport statistics
+
+def build_minimap_palette():
+    """Palette colors and the tile byte each one decodes to"""
+    colors = []
+    codes = []
+    for name, (open_color, blocked_color) in MINIMAP_TERRAIN_COLORS.items():
+        terrain = TERRAIN_INDEX[name]
+        if name == "rock":
+            continue  # Black is read as unexplored shroud
+        colors.append(open_color)
+        codes.append(terrain)
+        if blocked_color != open_color:
+            colors.append(blocked_color)
+            codes.append(terrain | OBSTACLE)
+    for color in PLAYER_COLORS:
+        colors.append(color)
+        codes.append(OBJECT | OBSTACLE)
+    colors.append((0, 0, 0))
+    codes.append(FOG)
+    return np.array(colors, dtype=np.int32), np.array(codes, dtype=np.uint8)
+
+MINIMAP_PALETTE, MINIMAP_CODES = build_minimap_palette()
+
+def nearest_palette_codes(pixels, palette, codes):
+    """Tile byte of the nearest palette color for each RGB pixel"""
+    # A minimap has only a few dozen distinct colors, so match each one once
+    pixels = pixels.reshape(-1, 3).astype(np.int32)
+    packed = (pixels[:, 0] << 16) | (pixels[:, 1] << 8) | pixels[:, 2]
+    colors, inverse = np.unique(packed, return_inverse=True)
+    unique = np.stack([colors >> 16, (colors >> 8) & 0xFF, colors & 0xFF], axis=1)
+    distances = ((unique[:, None, :] - palette[None, :, :]) ** 2).sum(axis=2)
+    return codes[distances.argmin(axis=1)][inverse.reshape(-1)]
+
+class AdventureMap:
+    """Tile grid of one adventure map, updated incrementally from screen captures"""
+    
+    def __init__(self, width, height, levels=1, object_threshold=40.0, fog_threshold=12.0):
+        self.width = width
+        self.height = height
+        self.tiles = np.full((levels, height, width), FOG, dtype=np.uint8)
+        self.level = 0  # Level currently shown (0 surface, 1 underground)
+        self.view_origin = None  # Map tile at the viewport's top-left corner
+        self.object_threshold = object_threshold  # Tile color spread that marks an object
+        self.fog_threshold = fog_threshold  # Mean brightness below which a tile is shroud
+        self.revision = 0
+        self.changes = []  # (level, y0, y1, x0, x1) rectangles changed since take_changes
+    
+    def mark_changed(self, y0, y1, x0, x1):
+        """Record a changed rectangle for consumers such as distance fields"""
+        self.revision += 1
+        self.changes.append((self.level, int(y0), int(y1), int(x0), int(x1)))
+    
+    def take_changes(self):
+        """Changed rectangles since the last call"""
+        changes, self.changes = self.changes, []
+        return changes
+    
+    def update_from_minimap(self, minimap):
+        """Refresh terrain, obstacles and fog for the whole level from the minimap"""
+        mh, mw = minimap.shape[:2]
+        
+        # Sample the centre pixel of each tile's minimap cell
+        ys = ((np.arange(self.height) + 0.5) * mh / self.height).astype(np.intp)
+        xs = ((np.arange(self.width) + 0.5) * mw / self.width).astype(np.intp)
+        samples = minimap[ys[:, None], xs[None, :], :3]
+        
+        # The white viewport frame is drawn over the terrain; cells it covers are read a pixel up and left,
+        # and those still covered keep what was last seen of them
+        frame = (minimap[:, :, :3] > 240).all(axis=2)
+        covered = frame[ys[:, None], xs[None, :]]
+        if covered.any():
+            ys_off, xs_off = np.maximum(ys - 1, 0), np.maximum(xs - 1, 0)
+            samples = np.where(covered[:, :, None], minimap[ys_off[:, None], xs_off[None, :], :3], samples)
+            covered &= frame[ys_off[:, None], xs_off[None, :]]
+        codes = nearest_palette_codes(samples, MINIMAP_PALETTE, MINIMAP_CODES).reshape(self.height, self.width)
+        level = self.tiles[self.level]
+        codes = np.where(covered, level, codes)
+        
+        # The shroud only ever lifts, so explored tiles keep what was last seen of them
+        codes = np.where((codes & FOG) & ~(level & FOG), level, codes)
+        
+        # Keep viewport-detected objects on tiles whose terrain did not change
+        keep = (level & TERRAIN_MASK) == (codes & TERRAIN_MASK)
+        codes = np.where(keep, codes | (level & OBJECT), codes)
+        
+        changed = np.argwhere(codes != level)
+        if changed.size:
+            level[...] = codes
+            (y0, x0), (y1, x1) = changed.min(axis=0), changed.max(axis=0) + 1
+            self.mark_changed(y0, y1, x0, x1)
+        
+        # The white viewport frame on the minimap gives the view position
+        frame = np.argwhere(frame)
+        if frame.size:
+            y, x = frame.min(axis=0)
+            self.view_origin = (int(x * self.width / mw), int(y * self.height / mh))
+    
+    def update_from_viewport(self, view, origin=None):
+        """Refresh fog and object flags for the tiles visible in the viewport"""
+        origin = origin or self.view_origin
+        if origin is None:
+            return
+        ox, oy = origin
+        rows = view.shape[0] // TILE_SIZE
+        cols = view.shape[1] // TILE_SIZE
+        
+        # Per-tile brightness mean and spread in one reshape, on a subsampled grid
+        step = TILE_SAMPLE_STEP
+        size = TILE_SIZE // step
+        tiles = view[:rows * TILE_SIZE:step, :cols * TILE_SIZE:step, :3].astype(np.float32)
+        tiles = tiles.reshape(rows, size, cols, size, 3).mean(axis=4)
+        mean = tiles.mean(axis=(1, 3))
+        spread = np.sqrt(np.maximum((tiles ** 2).mean(axis=(1, 3)) - mean ** 2, 0))
+        
+        # Clip the view against the map edges
+        y0, x0 = max(oy, 0), max(ox, 0)
+        y1, x1 = min(oy + rows, self.height), min(ox + cols, self.width)
+        if y0 >= y1 or x0 >= x1:
+            return
+        mean = mean[y0 - oy:y1 - oy, x0 - ox:x1 - ox]
+        spread = spread[y0 - oy:y1 - oy, x0 - ox:x1 - ox]
+        
+        window = self.tiles[self.level, y0:y1, x0:x1]
+        updated = window & np.uint8(~(FOG | OBJECT) & 0xFF)
+        fog = (mean < self.fog_threshold) & (window & FOG).astype(bool)
+        updated[fog] |= FOG
+        updated[~fog & (spread > self.object_threshold)] |= OBJECT
+        
+        changed = np.argwhere(updated != window)
+        if changed.size:
+            window[...] = updated
+            (cy0, cx0), (cy1, cx1) = changed.min(axis=0), changed.max(axis=0) + 1
+            self.mark_changed(y0 + cy0, y0 + cy1, x0 + cx0, x0 + cx1)
+    
+    def terrain(self, level=None):
+        """Terrain index per tile"""
+        return self.tiles[self.level if level is None else level] & TERRAIN_MASK
+    
+    def passable(self, level=None):
+        """Boolean grid of explored tiles a hero can walk on"""
+        tiles = self.tiles[self.level if level is None else level]
+        return (tiles & (OBSTACLE | FOG)) == 0
+    
+    def explored(self, level=None):
+        """Boolean grid of tiles that are not under the shroud"""
+        return (self.tiles[self.level if level is None else level] & FOG) == 0
+    
+    def objects(self, level=None):
+        """Coordinates (y, x) of tiles holding map objects"""
+        return np.argwhere(self.tiles[self.level if level is None else level] & OBJECT)
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Heroes III AI Opponent - Opening Book
+Deeply searched AI replies for the simulator's opening turns, stored as a compact table
+"""
+
+import array
+import bisect
+import hashlib
+import random
+import struct
+import sys
+
+from homm3_game_simulator import (GameEngine, GameState, HeroesAI, AI_ACTIONS, AI_ACTION_INDEX, action_key,
+                                  legal_actions, state_key)
+
+BOOK_MAGIC = b"H3OB"
+BOOK_VERSION = 1
+BOOK_TURNS = 3  # Opening turns covered by default
+BOOK_ITERATIONS = 4000  # Search iterations per book position
+OUTCOME_SAMPLES = 8  # Plays of each move used to find its distinct dice outcomes
+
+def state_hash(game_state):
+    """64-bit hash of a state, stable across processes and runs"""
+    digest = hashlib.blake2b(repr(state_key(game_state)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+class OpeningBook:
+    """Sorted 64-bit state hashes with one AI_ACTIONS index each, searched by bisection"""
+    
+    # File layout: magic, version and entry count, then the hashes as
+    # little-endian uint64 and the action indices as uint8, 9 bytes a position.
+    
+    def __init__(self, entries=None):
+        entries = sorted((entries or {}).items())
+        self.keys = array.array("Q", [key for key, _ in entries])
+        self.actions = array.array("B", [action for _, action in entries])
+    
+    def __len__(self):
+        return len(self.keys)
+    
+    def lookup(self, game_state):
+        """Book decision for a state, or None when it is not in the book"""
+        if not self.keys:
+            return None
+        key = state_hash(game_state)
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            return AI_ACTIONS[self.actions[position]]
+        return None
+    
+    def save(self, path):
+        """Write the table to a file"""
+        keys = array.array("Q", self.keys)
+        if keys.itemsize != 8:
+            raise ValueError("platform has no 64-bit array type")
+        if sys.byteorder == "big":
+            keys.byteswap()
+        with open(path, "wb") as f:
+            f.write(struct.pack("<4sHI", BOOK_MAGIC, BOOK_VERSION, len(keys)))
+            f.write(keys.tobytes())
+            f.write(self.actions.tobytes())
+    
+    @classmethod
+    def load(cls, path):
+        """Read a table written by save"""
+        with open(path, "rb") as f:
+            header = f.read(struct.calcsize("<4sHI"))
+            magic, version, count = struct.unpack("<4sHI", header)
+            if magic != BOOK_MAGIC or version != BOOK_VERSION:
+                raise ValueError(f"{path} is not an opening book")
+            book = cls()
+            book.keys.frombytes(f.read(8 * count))
+            book.actions.frombytes(f.read(count))
+        if sys.byteorder == "big":
+            book.keys.byteswap()
+        return book
+
+def outcomes(game_state, play, samples, rng):
+    """Distinct states reached by playing a move on copies of a state"""
+    reached = {}
+    for _ in range(samples):
+        engine = GameEngine()
+        engine.state = game_state.copy()
+        engine.rng = rng
+        play(engine)
+        reached.setdefault(state_key(engine.state), engine.state)
+    return list(reached.values())
+
+def human_replies(game_state, samples, rng):
+    """Every AI decision state one legal human action away, or none when the human's move fails"""
+    states = [game_state]
+    for action in legal_actions(game_state, "human"):
+        states += outcomes(game_state, lambda engine: engine.process_human_action(action), samples, rng)
+    return [state for state in states if not state.game_over]
+
+def search_position(task):
+    """Best AI_ACTIONS index for one book position after a long search"""
+    game_state, iterations, seed = task
+    ai = HeroesAI()
+    ai.rng.seed(seed)
+    ai.max_search_iterations = iterations
+    decision = None
+    for decision in ai.refine_decision(game_state):
+        pass
+    return None if decision is None else AI_ACTION_INDEX[action_key(decision)]
+
+def build_book(turns=BOOK_TURNS, iterations=BOOK_ITERATIONS, samples=OUTCOME_SAMPLES, seed=0, workers=None,
+               progress=None):
+    """Search every AI decision of the first turns against all human replies
+    
+    The AI side follows its own book move, so each turn expands the
+    positions by the human's legal actions and the dice outcomes of both
+    moves only.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    rng = random.Random(seed)
+    entries = {}
+    positions = human_replies(GameState(), samples, rng)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for turn in range(1, turns + 1):
+            positions = [state for state in positions if state_hash(state) not in entries]
+            tasks = [(state, iterations, seed + i) for i, state in enumerate(positions)]
+            moves = list(pool.map(search_position, tasks, chunksize=4))
+            following = []
+            for state, move in zip(positions, moves):
+                if move is None:
+                    continue
+                entries[state_hash(state)] = move
+                if turn == turns:
+                    continue
+                
+                def play(engine, move=move):
+                    engine.apply_ai_decision(AI_ACTIONS[move])
+                    engine.next_turn()
+                for reached in outcomes(state, play, samples, rng):
+                    if not reached.game_over:
+                        following += human_replies(reached, samples, rng)
+            if progress:
+                progress(turn, len(entries))
+            positions = list({state_key(state): state for state in following}.values())
+    return OpeningBook(entries)
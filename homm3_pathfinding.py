@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Pathfinding
+Hero movement over the adventure-map grid: A*/jump-point search and cached distance fields
+"""
+
+import heapq
+import numpy as np
+
+from homm3_map import TERRAINS, TERRAIN_MASK
+
+# Movement points per step out of a tile, by terrain (no roads or pathfinding skill)
+TERRAIN_MOVE_COSTS = {
+    "unknown": 100,
+    "dirt": 100,
+    "sand": 150,
+    "grass": 100,
+    "snow": 150,
+    "swamp": 175,
+    "rough": 125,
+    "subterranean": 100,
+    "lava": 100,
+    "water": None,  # Needs a boat
+    "rock": None
+}
+
+BLOCKED = 1 << 40  # Cost and distance of tiles no hero can stand on
+MAX_RELAX_PASSES = 64  # Relaxation passes before a field falls back to Dijkstra
+DIAGONAL_PERCENT = 141  # Diagonal steps cost about sqrt(2) times a straight one
+
+# Neighbour offsets as (dx, dy, diagonal)
+NEIGHBOURS = ((1, 0, False), (-1, 0, False), (0, 1, False), (0, -1, False),
+              (1, 1, True), (1, -1, True), (-1, 1, True), (-1, -1, True))
+
+def build_cost_table():
+    """Step cost per terrain index, BLOCKED for impassable terrain"""
+    return np.array([BLOCKED if TERRAIN_MOVE_COSTS[name] is None else TERRAIN_MOVE_COSTS[name]
+                     for name in TERRAINS] + [BLOCKED] * (16 - len(TERRAINS)), dtype=np.int64)
+
+TERRAIN_COST_TABLE = build_cost_table()
+
+def diagonal_cost(cost):
+    """Diagonal step cost for a straight step cost (array or int)"""
+    return cost * DIAGONAL_PERCENT // 100
+
+def line_indices(height, width):
+    """Flat tile indices along rows, columns, diagonals and anti-diagonals
+    
+    Each family is a (length, lines) matrix, one line per column so scans run
+    along the fast axis; short lines are padded at the end with the index
+    height * width, a sentinel slot that is always blocked.
+    """
+    grid = np.arange(height * width).reshape(height, width)
+    sentinel = height * width
+    
+    def pad(lines):
+        length = max(len(line) for line in lines)
+        matrix = np.full((length, len(lines)), sentinel, dtype=np.intp)
+        for i, line in enumerate(lines):
+            matrix[:len(line), i] = line
+        return matrix
+    
+    diagonals = [np.diagonal(grid, offset) for offset in range(-height + 1, width)]
+    anti_diagonals = [np.diagonal(grid[:, ::-1], offset) for offset in range(-height + 1, width)]
+    return (
+        (np.ascontiguousarray(grid.T), False),  # Rows
+        (grid, False),  # Columns
+        (pad(diagonals), True),
+        (pad(anti_diagonals), True)
+    )
+
+def line_step_costs(lines, costs):
+    """Per family (index, inclusive, exclusive) prefix sums of step costs along each line"""
+    prepared = []
+    for index, diagonal in lines:
+        line_costs = (costs[1] if diagonal else costs[0])[index]
+        inclusive = np.cumsum(line_costs, axis=0)
+        prepared.append((index, inclusive, inclusive - line_costs))
+    return prepared
+
+class DistanceField:
+    """Movement cost from every tile to the nearest of a set of source tiles"""
+    
+    # Relaxation runs min-plus prefix scans along every line family in both
+    # directions, so each pass follows straight and diagonal runs of any length
+    # at once; a few passes settle most maps. Winding mazes that have not
+    # settled after MAX_RELAX_PASSES are finished with Dijkstra instead.
+    
+    def __init__(self, sources, shape):
+        self.sources = tuple(sources)  # (x, y) tiles at distance zero
+        self.shape = shape
+        height, width = shape
+        self.distances = np.full(height * width + 1, BLOCKED, dtype=np.int64)  # Flat, plus sentinel
+        self.source_index = np.array([y * width + x for x, y in self.sources], dtype=np.intp)
+        self.passes = 0  # Relaxation passes of the last query, 0 when it was already up to date
+        self.dirty = True  # Needs relaxing before the next query
+    
+    def grid(self):
+        """Distances as a (height, width) view"""
+        return self.distances[:-1].reshape(self.shape)
+    
+    def reset(self):
+        """Forget all distances except the sources"""
+        self.distances[:] = BLOCKED
+        self.distances[self.source_index] = 0
+    
+    def invalidate(self, tiles):
+        """Drop distances that may have routed through tiles whose cost went up"""
+        # A path through tile r costs at least distance[r], so anything cheaper
+        # than the cheapest changed tile cannot have used the changed region
+        if tiles.size == 0:
+            return
+        threshold = self.distances[tiles].min()
+        stale = self.distances >= threshold
+        self.distances[stale] = BLOCKED
+        self.distances[self.source_index] = 0
+    
+    def relax(self, line_costs, max_passes=None):
+        """Lower distances from their current upper bounds; True once nothing changes"""
+        distances = self.distances
+        self.passes = 0
+        max_passes = MAX_RELAX_PASSES if max_passes is None else max_passes
+        while self.passes < max_passes:
+            self.passes += 1
+            before = distances.copy()
+            for index, inclusive, exclusive in line_costs:
+                values = distances[index]
+                
+                # Stepping towards the start of the line: d[i] <- d[j] + c[j+1..i]
+                np.minimum(values, np.minimum.accumulate(values - inclusive, axis=0) + inclusive, out=values)
+                
+                # Stepping towards the end of the line: d[i] <- d[j] + c[i..j-1]
+                ahead = np.minimum.accumulate((values + exclusive)[::-1], axis=0)[::-1] - exclusive
+                np.minimum(values, ahead, out=values)
+                
+                distances[index] = np.minimum(values, BLOCKED)
+            distances[-1] = BLOCKED
+            if np.array_equal(before, distances):
+                return True
+        return False
+    
+    def dijkstra(self, costs):
+        """Exact distances from the sources, for fields relaxation does not settle quickly"""
+        height, width = self.shape
+        straight = costs[0].tolist()
+        diagonal = costs[1].tolist()
+        distances = [BLOCKED] * (height * width)
+        frontier = []
+        for index in self.source_index.tolist():
+            distances[index] = 0
+            frontier.append((0, index))
+        heapq.heapify(frontier)
+        
+        # Searching outwards from the sources, a neighbour pays its own step cost to come in
+        while frontier:
+            distance, index = heapq.heappop(frontier)
+            if distance > distances[index]:
+                continue
+            y, x = divmod(index, width)
+            for dx, dy, is_diagonal in NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < width and 0 <= ny < height:
+                    neighbour = ny * width + nx
+                    step = diagonal[neighbour] if is_diagonal else straight[neighbour]
+                    if step >= BLOCKED:
+                        continue
+                    new_distance = distance + step
+                    if new_distance < distances[neighbour]:
+                        distances[neighbour] = new_distance
+                        heapq.heappush(frontier, (new_distance, neighbour))
+        self.distances[:-1] = np.minimum(np.array(distances, dtype=np.int64), BLOCKED)
+        self.distances[-1] = BLOCKED
+
+class PathFinder:
+    """Hero pathfinding over an AdventureMap, with cached multi-source distance fields"""
+    
+    def __init__(self, adventure_map):
+        self.map = adventure_map
+        self.height = adventure_map.height
+        self.width = adventure_map.width
+        self.lines = line_indices(self.height, self.width)
+        self.level = None
+        self.costs = None  # (straight, diagonal) flat step costs plus sentinel
+        self.line_costs = None  # Prefix sums of the costs along every line, for relaxation
+        self.step_costs = []  # Straight step costs as a list, for the per-node searches
+        self.fields = {}  # name -> DistanceField
+    
+    def tile_costs(self, level):
+        """Straight step cost out of every tile of a level"""
+        costs = TERRAIN_COST_TABLE[self.map.terrain(level)]
+        return np.where(self.map.passable(level), costs, BLOCKED)
+    
+    def set_costs(self, straight):
+        """Install new flat step costs and everything derived from them"""
+        self.costs = (straight, diagonal_cost(straight))
+        self.line_costs = line_step_costs(self.lines, self.costs)
+        self.step_costs = straight.tolist()
+    
+    def refresh(self):
+        """Apply map changes to the step costs and the cached distance fields"""
+        level = self.map.level
+        changes = self.map.take_changes()
+        if self.costs is None or level != self.level:
+            self.level = level
+            straight = np.append(self.tile_costs(level).reshape(-1), BLOCKED)
+            self.set_costs(straight)
+            self.fields.clear()
+            return
+        
+        straight = self.costs[0]
+        grid = straight[:-1].reshape(self.height, self.width)
+        current = None
+        for change_level, y0, y1, x0, x1 in changes:
+            if change_level != level:
+                continue
+            if current is None:
+                current = self.tile_costs(level)
+            old = grid[y0:y1, x0:x1].copy()
+            new = current[y0:y1, x0:x1]
+            if np.array_equal(old, new):
+                continue
+            grid[y0:y1, x0:x1] = new
+            
+            # Cheaper tiles only lower distances, which relaxation picks up;
+            # dearer ones invalidate whatever could have been routed through them
+            ys, xs = np.nonzero(new > old)
+            raised = (ys + y0) * self.width + (xs + x0)
+            for field in self.fields.values():
+                field.invalidate(raised)
+                field.dirty = True
+            self.set_costs(straight)
+    
+    def distance_field(self, name, sources):
+        """Cached distance field to a set of (x, y) source tiles, updated for map changes"""
+        self.refresh()
+        sources = tuple(sorted(sources))
+        field = self.fields.get(name)
+        if field is None or field.sources != sources:
+            field = DistanceField(sources, (self.height, self.width))
+            field.reset()
+            self.fields[name] = field
+        if not field.dirty:
+            field.passes = 0
+            return field
+        if not field.relax(self.line_costs):
+            field.dijkstra(self.costs)
+        field.dirty = False
+        return field
+    
+    def forget(self, name):
+        """Drop a cached distance field"""
+        self.fields.pop(name, None)
+    
+    def step_cost(self, index, diagonal):
+        """Cost of stepping out of a tile, by its terrain even if it is occupied"""
+        cost = self.step_costs[index]
+        if cost >= BLOCKED:
+            y, x = divmod(index, self.width)
+            cost = int(TERRAIN_COST_TABLE[self.map.tiles[self.level, y, x] & TERRAIN_MASK])
+        return diagonal_cost(cost) if diagonal else cost
+    
+    def descend(self, field, start, limit=None):
+        """Follow a distance field downhill from a start tile to its nearest source"""
+        # The start is usually a hero, which blocks its own tile, so its cost
+        # comes from the terrain and the path is read off the neighbours
+        distances = field.distances
+        x, y = start
+        path = [start]
+        total = 0
+        limit = limit or self.width * self.height
+        while distances[y * self.width + x] != 0 and len(path) <= limit:
+            best = None
+            for dx, dy, diagonal in NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                if 0 <= nx < self.width and 0 <= ny < self.height:
+                    value = int(distances[ny * self.width + nx])
+                    if value >= BLOCKED:
+                        continue
+                    value += self.step_cost(y * self.width + x, diagonal)
+                    if best is None or value < best[0]:
+                        best = (value, nx, ny, diagonal)
+            if best is None:
+                return None, None
+            total += self.step_cost(y * self.width + x, best[3])
+            x, y = best[1], best[2]
+            path.append((x, y))
+        return path, total
+    
+    def nearest_targets(self, name, targets, starts):
+        """Nearest target, its movement cost and the path for each start tile, from one field"""
+        field = self.distance_field(name, targets)
+        results = []
+        for start in starts:
+            path, cost = self.descend(field, start)
+            results.append(None if path is None else (path[-1], cost, path))
+        return results
+    
+    def uniform_terrain(self):
+        """Whether every passable tile costs the same, which lets jump-point search apply"""
+        straight = self.costs[0][:-1]
+        passable = straight[straight < BLOCKED]
+        return passable.size == 0 or passable.min() == passable.max()
+    
+    def find_path(self, start, goal):
+        """Cheapest (path, cost) between two tiles, or (None, None) if there is none"""
+        self.refresh()
+        if self.uniform_terrain():
+            return self.jump_point_search(start, goal)
+        return self.a_star(start, goal)
+    
+    def walkable(self, x, y):
+        """Whether a hero can step onto a tile"""
+        return (0 <= x < self.width and 0 <= y < self.height and
+                self.step_costs[y * self.width + x] < BLOCKED)
+    
+    def heuristic(self, x, y, goal, cost):
+        """Octile distance scaled by the cheapest step cost"""
+        dx, dy = abs(x - goal[0]), abs(y - goal[1])
+        return cost * max(dx, dy) + (diagonal_cost(cost) - cost) * min(dx, dy)
+    
+    def a_star(self, start, goal):
+        """Weighted A* over the 8-connected grid"""
+        straight = self.costs[0][:-1]
+        cheapest = int(straight.min()) if straight.size else 100
+        width = self.width
+        start_index = start[1] * width + start[0]
+        goal_index = goal[1] * width + goal[0]
+        
+        g_cost = {start_index: 0}
+        parents = {start_index: None}
+        frontier = [(self.heuristic(*start, goal, cheapest), 0, start_index)]
+        while frontier:
+            _, cost, index = heapq.heappop(frontier)
+            if index == goal_index:
+                return self.build_path(parents, index), cost
+            if cost > g_cost[index]:
+                continue
+            y, x = divmod(index, width)
+            for dx, dy, diagonal in NEIGHBOURS:
+                nx, ny = x + dx, y + dy
+                # The goal may be an occupied tile such as a resource pile
+                if not self.walkable(nx, ny) and (nx, ny) != goal:
+                    continue
+                neighbour = ny * width + nx
+                new_cost = cost + self.step_cost(index, diagonal)
+                if new_cost < g_cost.get(neighbour, BLOCKED):
+                    g_cost[neighbour] = new_cost
+                    parents[neighbour] = index
+                    heapq.heappush(frontier, (new_cost + self.heuristic(nx, ny, goal, cheapest), new_cost, neighbour))
+        return None, None
+    
+    def enterable(self, goal):
+        """Walkability test for a search towards a goal, which may be an occupied tile itself"""
+        width, height, step_costs = self.width, self.height, self.step_costs
+        gx, gy = goal
+        
+        def walkable(x, y):
+            return ((x == gx and y == gy) or
+                    (0 <= x < width and 0 <= y < height and step_costs[y * width + x] < BLOCKED))
+        return walkable
+    
+    def jump(self, x, y, dx, dy, goal, walkable):
+        """Next jump point from (x, y) in direction (dx, dy), or None"""
+        while True:
+            x, y = x + dx, y + dy
+            if not walkable(x, y):
+                return None
+            if (x, y) == goal:
+                return x, y
+            if dx and dy:
+                if ((walkable(x - dx, y + dy) and not walkable(x - dx, y)) or
+                        (walkable(x + dx, y - dy) and not walkable(x, y - dy))):
+                    return x, y
+                if self.jump(x, y, dx, 0, goal, walkable) or self.jump(x, y, 0, dy, goal, walkable):
+                    return x, y
+            elif dx:
+                if ((walkable(x + dx, y + 1) and not walkable(x, y + 1)) or
+                        (walkable(x + dx, y - 1) and not walkable(x, y - 1))):
+                    return x, y
+            else:
+                if ((walkable(x + 1, y + dy) and not walkable(x + 1, y)) or
+                        (walkable(x - 1, y + dy) and not walkable(x - 1, y))):
+                    return x, y
+    
+    def pruned_directions(self, x, y, parent, walkable):
+        """Directions worth searching from a jump point, given where it was reached from"""
+        if parent is None:
+            return [(dx, dy) for dx, dy, _ in NEIGHBOURS]
+        dx = (x > parent[0]) - (x < parent[0])
+        dy = (y > parent[1]) - (y < parent[1])
+        directions = []
+        if dx and dy:
+            directions += [(0, dy), (dx, 0), (dx, dy)]
+            if not walkable(x - dx, y):
+                directions.append((-dx, dy))
+            if not walkable(x, y - dy):
+                directions.append((dx, -dy))
+        elif dx:
+            directions.append((dx, 0))
+            if not walkable(x, y + 1):
+                directions.append((dx, 1))
+            if not walkable(x, y - 1):
+                directions.append((dx, -1))
+        else:
+            directions.append((0, dy))
+            if not walkable(x + 1, y):
+                directions.append((1, dy))
+            if not walkable(x - 1, y):
+                directions.append((-1, dy))
+        return directions
+    
+    def jump_point_search(self, start, goal):
+        """A* that only expands jump points; valid when every step costs the same"""
+        straight = self.costs[0][:-1]
+        passable = straight[straight < BLOCKED]
+        cost = int(passable[0]) if passable.size else 100
+        
+        # A blocked goal counts as open, or the forced neighbours that lead to it are missed
+        walkable = self.enterable(goal)
+        g_cost = {start: 0}
+        parents = {start: None}
+        frontier = [(self.heuristic(*start, goal, cost), 0, start)]
+        while frontier:
+            _, g, point = heapq.heappop(frontier)
+            if point == goal:
+                return self.expand_jumps(parents, point), g
+            if g > g_cost[point]:
+                continue
+            for dx, dy in self.pruned_directions(*point, parents[point], walkable):
+                jump_point = self.jump(*point, dx, dy, goal, walkable)
+                if jump_point is None:
+                    continue
+                new_cost = g + self.heuristic(*point, jump_point, cost)
+                if new_cost < g_cost.get(jump_point, BLOCKED):
+                    g_cost[jump_point] = new_cost
+                    parents[jump_point] = point
+                    heapq.heappush(frontier, (new_cost + self.heuristic(*jump_point, goal, cost), new_cost, jump_point))
+        return None, None
+    
+    def build_path(self, parents, index):
+        """Tile path from A* parent links"""
+        path = []
+        while index is not None:
+            y, x = divmod(index, self.width)
+            path.append((x, y))
+            index = parents[index]
+        return path[::-1]
+    
+    def expand_jumps(self, parents, point):
+        """Tile-by-tile path from jump-point parent links"""
+        jumps = []
+        while point is not None:
+            jumps.append(point)
+            point = parents[point]
+        jumps.reverse()
+        
+        path = [jumps[0]]
+        for (x0, y0), (x1, y1) in zip(jumps, jumps[1:]):
+            dx = (x1 > x0) - (x1 < x0)
+            dy = (y1 > y0) - (y1 < y0)
+            x, y = x0, y0
+            while (x, y) != (x1, y1):
+                x, y = x + dx, y + dy
+                path.append((x, y))
+        return path
@@ -4,33 +4,110 @@ Heroes of Might & Magic III Real Game AI
 AI that plays the actual HoMM3 game using computer vision and automation
 """
 
-import cv2
-import numpy as np
-import pyautogui
 import time
-import tkinter as tk
-from tkinter import ttk, messagebox
 import threading
-from PIL import Image, ImageTk
+import queue
 import os
+import logging
 
-# Disable pyautogui failsafe for smoother operation
-pyautogui.FAILSAFE = False
+from homm3_anytime import Deadline
+
+logger = logging.getLogger(__name__)
+
+def load_pyautogui():
+    """Import pyautogui on first use; it needs a display to load"""
+    import pyautogui
+    
+    # Disable pyautogui failsafe for smoother operation
+    pyautogui.FAILSAFE = False
+    return pyautogui
+
+def load_numpy():
+    """Import numpy on first use, so the module loads without it"""
+    import numpy
+    return numpy
+
+# Analysis fields, the detector that fills each one and the regions it reads
+DETECTOR_REGIONS = {
+    "turn_active": ("detect_player_turn", ("end_turn_button",)),
+    "hero_selected": ("detect_selected_hero", ("hero_portraits",)),
+    "town_screen": ("detect_town_screen", ("town_exit_button",)),
+    "combat_active": ("detect_combat_screen", ("combat_controls",)),
+    "resources": ("read_resources", ("resource_bar",))
+}
+
+# Screen-type fields, the template that decides each one, and the regions they hash from
+SCREEN_TYPE_TEMPLATES = {
+    "town_screen": "town_screen",
+    "combat_active": "combat_screen"
+}
+SCREEN_TYPE_REGIONS = ("town_exit_button", "combat_controls")
 
 class HoMM3GameAI:
-    def __init__(self):
+    def __init__(self, frame_source=None, layout=None):
         self.running = False
         self.game_window = None
         self.current_strategy = "exploration"
         self.last_action_time = 0
         self.action_delay = 2  # seconds between actions
         
+        # Region capture is built on first use; defaults to the live screen
+        self.frame_source = frame_source
+        self.layout = layout
+        self.region_capture = None
+        
+        # Skip detectors whose regions did not change since the last frame
+        self.frame_gating = True
+        self.change_detector = None
+        self.last_analysis = None
+        
+        # Screen-state templates, loaded on first detection
+        self.template_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+        self.template_matcher = None
+        self.detection_confidence = {}
+        
+        # Recurring screens are recognized from perceptual hashes instead of template matching
+        self.screen_class_cache = None
+        
+        # Resource bar digits, read with glyphs from templates/digits
+        self.resource_reader = None
+        
+        # Adventure-map tile model, refreshed from the viewport and minimap on demand
+        self.map_size = (72, 72)  # Tiles; S=36, M=72, L=108, XL=144
+        self.adventure_map = None
+        self.map_capture = None
+        self.map_regions = None  # Map regions grabbed by the capture thread on request, when it owns the screen
+        self.map_version = 0
+        self.map_requested = threading.Event()
+        self.map_wait = 1.0  # Seconds update_map_model waits for the capture thread's grab
+        self.pathfinder = None
+        self.visited_tiles = set()  # Map objects a hero has already been sent to
+        
+        # Pipelined mode: capture, analysis and action execution run in their own threads
+        self.pipelined = True
+        self.frame_interval = 0.1  # seconds between captures
+        self.analysis_workers = 1
+        self.frame_queue = queue.Queue(maxsize=1)  # Only the latest frame is kept
+        self.action_queue = queue.Queue(maxsize=8)
+        self.analysis_lock = threading.Lock()  # Detectors keep per-frame state; one analysis at a time
+        self.state_changed = threading.Condition()
+        self.latest_state = None
+        self.latest_frame_id = -1
+        self.state_version = 0
+        self.executing = False  # Set when actions are planned, cleared once the queue is worked off
+        self.dropped_actions = 0
+        self.capture_threaded = False  # Screen sources are not thread-safe; only capture_loop grabs
+        
+        # Optional screen recording and per-detector timing for benchmarks
+        self.recorder = None
+        self.detector_timings = None  # detector name -> list of seconds, when enabled
+    
     def find_game_window(self):
         """Locate Heroes III game window"""
         try:
             # Try to find HoMM3 window by taking screenshot and looking for UI elements
-            screenshot = pyautogui.screenshot()
-            screenshot_np = np.array(screenshot)
+            screenshot = load_pyautogui().screenshot()
+            screenshot_np = load_numpy().array(screenshot)
             
             # Look for characteristic HoMM3 UI elements (resource bar at bottom)
             # This is a simplified approach - in practice you'd need more sophisticated detection
@@ -41,56 +118,226 @@ class HoMM3GameAI:
     def take_game_screenshot(self):
         """Take screenshot of current game state"""
         try:
-            screenshot = pyautogui.screenshot()
-            return np.array(screenshot)
+            screenshot = load_pyautogui().screenshot()
+            return load_numpy().array(screenshot)
+        except Exception as e:
+            return None
+    
+    def capture_game_regions(self):
+        """Capture only the screen regions the detectors read"""
+        try:
+            if self.region_capture is None:
+                self.build_region_capture()
+            regions = self.region_capture.capture()
+            if regions is not None and self.recorder is not None:
+                self.recorder.record_frame(regions)
+            return regions
         except Exception as e:
             return None
     
-    def analyze_game_state(self, screenshot):
-        """Analyze current game state from screenshot"""
-        analysis = {
-            "turn_active": False,
-            "hero_selected": False,
-            "town_screen": False,
-            "combat_active": False,
-            "resources": {},
-            "hero_position": None,
-            "available_actions": []
-        }
+    def build_region_capture(self):
+        """Set up region capture from the configured frame source"""
+        from homm3_capture import RegionCapture, LiveScreenSource
+        
+        source = self.frame_source or LiveScreenSource()
+        self.region_capture = RegionCapture(source, self.layout)
+        return self.region_capture
+    
+    def build_map_capture(self):
+        """Set up capture of the large map regions from the detector capture's source"""
+        from homm3_capture import RegionCapture, MAP_REGION_NAMES
+        
+        if self.region_capture is None:
+            self.build_region_capture()
+        self.map_capture = RegionCapture(self.region_capture.source, self.region_capture.layout, MAP_REGION_NAMES)
+        return self.map_capture
+    
+    def update_map_model(self):
+        """Refresh the adventure-map grid from the current frame's map regions"""
+        try:
+            if self.adventure_map is None:
+                from homm3_map import AdventureMap
+                from homm3_pathfinding import PathFinder
+                
+                self.adventure_map = AdventureMap(*self.map_size)
+                self.pathfinder = PathFinder(self.adventure_map)
+            
+            # With a capture thread running, it grabs the map regions on request instead of this thread
+            if self.capture_threaded:
+                with self.state_changed:
+                    version = self.map_version
+                    self.map_requested.set()
+                    fresh = self.state_changed.wait_for(lambda: self.map_version != version or not self.running,
+                                                        timeout=self.map_wait)
+                    regions = self.map_regions if fresh and self.map_version != version else None
+            else:
+                if self.map_capture is None:
+                    self.build_map_capture()
+                regions = self.map_capture.capture(advance=False)
+            if regions is None:
+                return None
+            self.adventure_map.update_from_minimap(regions["minimap"])
+            self.adventure_map.update_from_viewport(regions["adventure_map"])
+            return self.adventure_map
+        except Exception as e:
+            return None
+    
+    def viewport_tiles(self):
+        """Screen box of the adventure-map view and its size in tiles"""
+        from homm3_capture import SCREEN_REGIONS
+        from homm3_map import TILE_SIZE
+        
+        _, _, width, height = SCREEN_REGIONS["adventure_map"]
+        return self.map_capture.boxes["adventure_map"], width // TILE_SIZE, height // TILE_SIZE
+    
+    def hero_tile(self):
+        """Map tile of the selected hero, which the game keeps centred in the view"""
+        if self.adventure_map is None or self.adventure_map.view_origin is None:
+            return None
+        _, cols, rows = self.viewport_tiles()
+        ox, oy = self.adventure_map.view_origin
+        return ox + cols // 2, oy + rows // 2
+    
+    def plan_move(self, target):
+        """Move action towards the nearest tile of a target kind, from the distance field"""
+        start = self.hero_tile()
+        if start is None or target != "nearest_resource":
+            return None
         
-        # Detect if it's player's turn (look for UI indicators)
-        # This would need computer vision to detect turn indicators
-        analysis["turn_active"] = self.detect_player_turn(screenshot)
+        # Map objects other than the hero's own tile are candidate pickups
+        tiles = [(int(x), int(y)) for y, x in self.adventure_map.objects()]
+        tiles = [tile for tile in tiles if tile != start and tile not in self.visited_tiles]
+        if not tiles:
+            return None
+        result = self.pathfinder.nearest_targets(target, tiles, [start])[0]
+        if result is None:
+            return None
+        tile, cost, path = result
+        return {"type": "move", "target": target, "tile": tile, "cost": cost, "path": path}
+    
+    def start_recording(self, path):
+        """Record every captured frame and executed action to a file"""
+        from homm3_capture import FrameRecorder
         
-        # Detect if hero is selected
-        analysis["hero_selected"] = self.detect_selected_hero(screenshot)
+        if self.region_capture is None:
+            self.build_region_capture()
+        self.recorder = FrameRecorder(path, self.region_capture.boxes, self.region_capture.layout)
+    
+    def stop_recording(self):
+        """Finish the current recording, if any"""
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+    
+    def analyze_game_state(self, regions):
+        """Analyze current game state from captured screen regions"""
+        changed = None
+        if self.frame_gating:
+            if self.change_detector is None:
+                from homm3_capture import RegionChangeDetector
+                self.change_detector = RegionChangeDetector()
+            changed = self.change_detector.update(regions)
+            if not changed and self.last_analysis is not None:
+                # Static screen: nothing to re-detect
+                return self.last_analysis
         
-        # Detect current screen type
-        analysis["town_screen"] = self.detect_town_screen(screenshot)
-        analysis["combat_active"] = self.detect_combat_screen(screenshot)
+        if self.last_analysis is None:
+            changed = None
+            analysis = {
+                "turn_active": False,
+                "hero_selected": False,
+                "town_screen": False,
+                "combat_active": False,
+                "resources": {},
+                "hero_position": None,
+                "available_actions": [],
+                "confidence": {}
+            }
+        else:
+            analysis = dict(self.last_analysis)
+        
+        # Re-run only the detectors whose regions changed (all of them on a fresh start)
+        fields = [field for field, (detector, region_names) in DETECTOR_REGIONS.items()
+                  if changed is None or not changed.isdisjoint(region_names)]
+        
+        screen_key = None
+        if any(field in SCREEN_TYPE_TEMPLATES for field in fields):
+            if self.screen_class_cache is None:
+                from homm3_vision import ScreenClassCache
+                self.screen_class_cache = ScreenClassCache()
+            screen_key = self.screen_class_cache.key(regions, SCREEN_TYPE_REGIONS)
+            cached = self.screen_class_cache.get(screen_key)
+            if cached is not None:
+                cached_fields, cached_confidence = cached
+                analysis.update(cached_fields)
+                self.detection_confidence.update(cached_confidence)
+                fields = [field for field in fields if field not in SCREEN_TYPE_TEMPLATES]
+                screen_key = None
+        
+        for field in fields:
+            detector = DETECTOR_REGIONS[field][0]
+            if self.detector_timings is None:
+                analysis[field] = getattr(self, detector)(regions)
+            else:
+                start = time.perf_counter()
+                analysis[field] = getattr(self, detector)(regions)
+                self.detector_timings.setdefault(detector, []).append(time.perf_counter() - start)
         
+        if screen_key is not None:
+            confidence = {name: self.detection_confidence[name] for name in SCREEN_TYPE_TEMPLATES.values()
+                          if name in self.detection_confidence}
+            if len(confidence) == len(SCREEN_TYPE_TEMPLATES):
+                self.screen_class_cache.put(screen_key, {field: analysis[field] for field in SCREEN_TYPE_TEMPLATES},
+                                            confidence)
+        analysis["confidence"] = dict(self.detection_confidence)
+        
+        self.last_analysis = analysis
         return analysis
     
-    def detect_player_turn(self, screenshot):
+    def match_screen_template(self, name, regions, default):
+        """Template detection result, or the default when the template is unavailable"""
+        if self.template_matcher is None:
+            from homm3_vision import TemplateMatcher
+            
+            scale = self.layout.width / 800 if self.layout else 1.0
+            self.template_matcher = TemplateMatcher(self.template_dir, scale=scale)
+        
+        confidence = self.template_matcher.detect(name, regions)
+        if confidence is None:
+            return default
+        self.detection_confidence[name] = confidence
+        return confidence >= self.template_matcher.threshold
+    
+    def detect_player_turn(self, regions):
         """Detect if it's currently player's turn"""
-        # Look for "End Turn" button or other turn indicators
-        # This is a placeholder - real implementation would use template matching
-        return True
+        # The "End Turn" button is only live on our own adventure-map turn
+        return self.match_screen_template("end_turn", regions, True)
     
-    def detect_selected_hero(self, screenshot):
+    def detect_selected_hero(self, regions):
         """Detect if a hero is currently selected"""
-        # Look for hero selection indicators
-        return True
+        # Look for the highlighted frame around a hero portrait
+        return self.match_screen_template("hero_selected", regions, True)
     
-    def detect_town_screen(self, screenshot):
+    def detect_town_screen(self, regions):
         """Detect if town management screen is open"""
-        # Look for town-specific UI elements
-        return False
+        # Look for the town screen's exit button
+        return self.match_screen_template("town_screen", regions, False)
     
-    def detect_combat_screen(self, screenshot):
+    def detect_combat_screen(self, regions):
         """Detect if combat screen is active"""
-        # Look for combat-specific UI elements
-        return False
+        # Look for the combat control panel
+        return self.match_screen_template("combat_screen", regions, False)
+    
+    def read_resources(self, regions):
+        """Read the seven resource amounts from the resource bar"""
+        if self.resource_reader is None:
+            from homm3_vision import ResourceReader
+            self.resource_reader = ResourceReader(os.path.join(self.template_dir, "digits"))
+        
+        resource_bar = regions.get("resource_bar")
+        if resource_bar is None or not self.resource_reader.has_glyphs():
+            return {}
+        return self.resource_reader.read(resource_bar)
     
     def make_ai_decision(self, game_state):
         """Make AI decision based on current game state"""
@@ -106,10 +353,13 @@ class HoMM3GameAI:
         actions = []
         
         if game_state["hero_selected"]:
+            # Movement targets are resolved against the current map grid
+            self.update_map_model()
+            
             if self.current_strategy == "exploration":
                 actions.append({"type": "move", "direction": "explore"})
             elif self.current_strategy == "resource_gathering":
-                actions.append({"type": "move", "target": "nearest_resource"})
+                actions.append(self.plan_move("nearest_resource") or {"type": "move", "target": "nearest_resource"})
             elif self.current_strategy == "aggressive":
                 actions.append({"type": "move", "target": "enemy_hero"})
         else:
@@ -133,6 +383,28 @@ class HoMM3GameAI:
     
     def execute_action(self, action):
         """Execute an AI action in the game"""
+        if not self.perform_action(action):
+            return False
+        
+        # The wait for the game to react goes into map and path upkeep first
+        pause = Deadline(self.action_delay)
+        self.idle_upkeep(pause)
+        pause.sleep_remaining()
+        return True
+    
+    def idle_upkeep(self, deadline):
+        """Refresh the map model and bring cached distance fields up to date before a deadline"""
+        if deadline.expired() or self.update_map_model() is None:
+            return
+        for name, field in list(self.pathfinder.fields.items()):
+            if deadline.expired():
+                break
+            self.pathfinder.distance_field(name, field.sources)
+    
+    def perform_action(self, action):
+        """Send an action's input to the game without waiting afterwards"""
+        if self.recorder is not None:
+            self.recorder.record_action(action)
         try:
             if action["type"] == "move":
                 self.execute_hero_movement(action)
@@ -147,30 +419,48 @@ class HoMM3GameAI:
             elif action["type"] == "end_turn":
                 self.end_turn()
             
-            time.sleep(self.action_delay)
             return True
         except Exception as e:
             return False
     
     def execute_hero_movement(self, action):
         """Move hero on adventure map"""
+        if action.get("path"):
+            # Click the furthest path tile still in view twice: once to plot, once to go
+            (x, y, w, h), cols, rows = self.viewport_tiles()
+            ox, oy = self.adventure_map.view_origin
+            visible = [(tx, ty) for tx, ty in action["path"] if 0 <= tx - ox < cols and 0 <= ty - oy < rows]
+            if visible:
+                tx, ty = visible[-1]
+                click_x = x + int((tx - ox + 0.5) * w / cols)
+                click_y = y + int((ty - oy + 0.5) * h / rows)
+                pyautogui = load_pyautogui()
+                pyautogui.click(click_x, click_y)
+                pyautogui.click(click_x, click_y)
+                if "tile" in action:
+                    self.visited_tiles.add(tuple(action["tile"]))
+                return
+        
         if action.get("direction") == "explore":
+            pyautogui = load_pyautogui()
+            offsets = load_numpy().random.randint(-200, 200, size=2)
+            
             # Simple exploration: click in a random direction
             screen_center = pyautogui.size()
-            x = screen_center[0] // 2 + np.random.randint(-200, 200)
-            y = screen_center[1] // 2 + np.random.randint(-200, 200)
+            x = screen_center[0] // 2 + offsets[0]
+            y = screen_center[1] // 2 + offsets[1]
             pyautogui.click(x, y)
-        
+    
     def select_hero(self):
         """Select first available hero"""
         # Look for hero portraits in UI and click first one
         # This is simplified - real implementation would use image recognition
-        pyautogui.click(50, 300)  # Approximate hero portrait location
+        load_pyautogui().click(50, 300)  # Approximate hero portrait location
     
     def activate_auto_combat(self):
         """Activate auto-combat during battle"""
         # Look for auto-combat button and click it
-        pyautogui.press('a')  # Common hotkey for auto-combat
+        load_pyautogui().press('a')  # Common hotkey for auto-combat
     
     def build_in_town(self):
         """Build structures in town"""
@@ -184,20 +474,20 @@ class HoMM3GameAI:
     
     def end_turn(self):
         """End current turn"""
-        pyautogui.press('enter')  # Common hotkey for end turn
+        load_pyautogui().press('enter')  # Common hotkey for end turn
     
     def ai_main_loop(self):
         """Main AI loop"""
         while self.running:
             try:
-                # Take screenshot
-                screenshot = self.take_game_screenshot()
-                if screenshot is None:
+                # Capture the regions the detectors need
+                regions = self.capture_game_regions()
+                if regions is None:
                     time.sleep(1)
                     continue
                 
                 # Analyze game state
-                game_state = self.analyze_game_state(screenshot)
+                game_state = self.analyze_game_state(regions)
                 
                 # Only act if it's player's turn
                 if game_state["turn_active"]:
@@ -218,144 +508,172 @@ class HoMM3GameAI:
                         self.execute_action({"type": "end_turn"})
                 
                 time.sleep(0.5)  # Check game state twice per second
+            
+            except Exception as e:
+                time.sleep(2)  # Wait on error
+    
+    def offer_latest(self, target_queue, item):
+        """Put an item on a bounded queue, dropping the stalest entry when full; returns what was dropped"""
+        dropped = []
+        while True:
+            try:
+                target_queue.put_nowait(item)
+                return dropped
+            except queue.Full:
+                try:
+                    dropped.append(target_queue.get_nowait())
+                except queue.Empty:
+                    pass
+    
+    def screen_mode(self, game_state):
+        """Which screen an analysis describes"""
+        if game_state["combat_active"]:
+            return "combat"
+        if game_state["town_screen"]:
+            return "town"
+        return "adventure"
+    
+    def capture_loop(self):
+        """Producer: capture regions at a fixed rate into the latest-frame queue"""
+        frame_id = 0
+        while self.running:
+            try:
+                regions = self.capture_game_regions()
+                if regions is None:
+                    time.sleep(1)
+                    continue
                 
+                # Capture buffers are reused, so hand the consumers a private copy
+                frame = {name: buffer.copy() for name, buffer in regions.items()}
+                
+                # The large map regions of the same frame, only when update_map_model asked for them
+                if self.map_requested.is_set():
+                    self.map_requested.clear()
+                    if self.map_capture is None:
+                        self.build_map_capture()
+                    map_regions = self.map_capture.capture(advance=False)
+                    if map_regions is not None:
+                        map_regions = {name: buffer.copy() for name, buffer in map_regions.items()}
+                    with self.state_changed:
+                        self.map_regions = map_regions
+                        self.map_version += 1
+                        self.state_changed.notify_all()
+                self.offer_latest(self.frame_queue, (frame_id, frame))
+                frame_id += 1
+                time.sleep(self.frame_interval)
             except Exception as e:
                 time.sleep(2)  # Wait on error
     
+    def analysis_loop(self):
+        """Worker: analyze the newest frame and publish the resulting state"""
+        while self.running:
+            try:
+                frame_id, frame = self.frame_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            try:
+                # The previous analysis, confidences, resource reader and lazy detectors are shared,
+                # so extra workers only overlap waiting on the queue with another worker's analysis
+                with self.analysis_lock:
+                    game_state = self.analyze_game_state(frame)
+            except Exception as e:
+                continue
+            
+            with self.state_changed:
+                # A slower worker may finish after a newer frame was published
+                if frame_id <= self.latest_frame_id:
+                    continue
+                self.latest_frame_id = frame_id
+                if game_state is not self.latest_state:
+                    self.latest_state = game_state
+                    self.state_version += 1
+                    self.state_changed.notify_all()
+    
+    def decision_loop(self):
+        """Plan actions on each new state, or every action_delay on a static turn, when idle"""
+        seen_version = 0
+        while self.running:
+            with self.state_changed:
+                self.state_changed.wait_for(lambda: self.state_version != seen_version or not self.running,
+                                            timeout=self.action_delay)
+                seen_version = self.state_version
+                game_state = self.latest_state
+            
+            if game_state is None or not game_state["turn_active"]:
+                continue
+            if self.executing or not self.action_queue.empty():
+                continue
+            
+            actions = self.make_ai_decision(game_state)
+            if not actions:
+                continue
+            actions = actions + [{"type": "end_turn"}]
+            mode = self.screen_mode(game_state)
+            
+            # Marked busy before the first action is queued, so the next state cannot plan the turn again
+            self.executing = True
+            for action in actions:
+                for _, dropped in self.offer_latest(self.action_queue, (mode, action)):
+                    self.dropped_actions += 1
+                    logger.warning("action queue full, dropped %s", dropped)
+    
+    def executor_loop(self):
+        """Execute queued actions, dropping those planned for a screen that has gone"""
+        while self.running:
+            try:
+                mode, action = self.action_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            
+            try:
+                with self.state_changed:
+                    game_state = self.latest_state
+                    version = self.state_version
+                if game_state is not None and self.screen_mode(game_state) != mode:
+                    logger.info("screen left %s mode, dropped %s", mode, action)
+                    continue
+                if not self.perform_action(action):
+                    continue
+                
+                # The wait for the screen to react goes into map and path upkeep first, capped at action_delay;
+                # the decision thread does not plan while executing is set, so the map model is ours
+                pause = Deadline(self.action_delay)
+                self.idle_upkeep(pause)
+                with self.state_changed:
+                    self.state_changed.wait_for(lambda: self.state_version != version or not self.running,
+                                                timeout=pause.remaining())
+            finally:
+                if self.action_queue.empty():
+                    self.executing = False
+    
     def start_ai(self):
         """Start AI operation"""
         if not self.find_game_window():
             return False, "Heroes III game window not found"
         
         self.running = True
-        self.ai_thread = threading.Thread(target=self.ai_main_loop, daemon=True)
-        self.ai_thread.start()
+        self.capture_threaded = self.pipelined
+        if self.pipelined:
+            loops = [self.capture_loop, self.decision_loop, self.executor_loop]
+            loops += [self.analysis_loop] * self.analysis_workers
+            self.ai_threads = [threading.Thread(target=loop, daemon=True) for loop in loops]
+            for thread in self.ai_threads:
+                thread.start()
+        else:
+            self.ai_thread = threading.Thread(target=self.ai_main_loop, daemon=True)
+            self.ai_thread.start()
         return True, "AI started successfully"
     
     def stop_ai(self):
         """Stop AI operation"""
         self.running = False
+        self.capture_threaded = False
+        with self.state_changed:
+            self.state_changed.notify_all()
+        self.stop_recording()
         return "AI stopped"
 
-class HoMM3AIController:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.ai = HoMM3GameAI()
-        self.setup_ui()
-        
-    def setup_ui(self):
-        self.root.title("Heroes III Game AI Controller")
-        self.root.geometry("500x400")
-        
-        # Title
-        title_label = ttk.Label(self.root, text="Heroes III Real Game AI", 
-                               font=("Arial", 16, "bold"))
-        title_label.pack(pady=10)
-        
-        # Instructions
-        instructions = """This AI will control the actual Heroes III game.
-        
-Prerequisites:
-1. Heroes III must be running and visible
-2. It should be your turn
-3. Game window should not be minimized
-
-The AI will:
-• Analyze the game screen using computer vision
-• Make strategic decisions based on game state
-• Control mouse and keyboard to play the game
-• Explore map, manage towns, fight battles
-        """
-        
-        inst_label = ttk.Label(self.root, text=instructions, justify="left")
-        inst_label.pack(padx=20, pady=10, fill="x")
-        
-        # Strategy selection
-        strategy_frame = ttk.LabelFrame(self.root, text="AI Strategy")
-        strategy_frame.pack(fill="x", padx=20, pady=10)
-        
-        self.strategy_var = tk.StringVar(value="exploration")
-        strategies = [
-            ("Exploration Focus", "exploration"),
-            ("Resource Gathering", "resource_gathering"), 
-            ("Aggressive Expansion", "aggressive")
-        ]
-        
-        for text, value in strategies:
-            ttk.Radiobutton(strategy_frame, text=text, variable=self.strategy_var, 
-                           value=value, command=self.update_strategy).pack(anchor="w", padx=10)
-        
-        # Control buttons
-        button_frame = ttk.Frame(self.root)
-        button_frame.pack(pady=20)
-        
-        self.start_button = ttk.Button(button_frame, text="Start AI", 
-                                      command=self.start_ai, style="Accent.TButton")
-        self.start_button.pack(side="left", padx=10)
-        
-        self.stop_button = ttk.Button(button_frame, text="Stop AI", 
-                                     command=self.stop_ai, state="disabled")
-        self.stop_button.pack(side="left", padx=10)
-        
-        # Status
-        self.status_label = ttk.Label(self.root, text="Status: Ready", 
-                                     font=("Arial", 10, "bold"))
-        self.status_label.pack(pady=10)
-        
-        # Log area
-        ttk.Label(self.root, text="AI Activity Log:").pack(anchor="w", padx=20)
-        self.log_text = tk.Text(self.root, height=8, wrap="word")
-        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.log_text.yview)
-        self.log_text.configure(yscrollcommand=scrollbar.set)
-        
-        log_frame = ttk.Frame(self.root)
-        log_frame.pack(fill="both", expand=True, padx=20, pady=10)
-        self.log_text.pack(side="left", fill="both", expand=True)
-        scrollbar.pack(side="right", fill="y")
-        
-        self.log("AI Controller ready. Start Heroes III and click 'Start AI'")
-        self.log("Make sure Heroes III window is visible and it's your turn")
-        
-    def update_strategy(self):
-        """Update AI strategy"""
-        self.ai.current_strategy = self.strategy_var.get()
-        self.log(f"Strategy changed to: {self.strategy_var.get()}")
-        
-    def start_ai(self):
-        """Start AI control"""
-        success, message = self.ai.start_ai()
-        if success:
-            self.start_button.config(state="disabled")
-            self.stop_button.config(state="normal")
-            self.status_label.config(text="Status: AI Active")
-            self.log("AI started - now controlling Heroes III game")
-        else:
-            messagebox.showerror("Error", message)
-            self.log(f"Failed to start: {message}")
-    
-    def stop_ai(self):
-        """Stop AI control"""
-        message = self.ai.stop_ai()
-        self.start_button.config(state="normal")
-        self.stop_button.config(state="disabled")
-        self.status_label.config(text="Status: Stopped")
-        self.log(message)
-    
-    def log(self, message):
-        """Add message to log"""
-        timestamp = time.strftime("%H:%M:%S")
-        self.log_text.insert("end", f"[{timestamp}] {message}\n")
-        self.log_text.see("end")
-        self.root.update_idletasks()
-        
-    def run(self):
-        """Run the controller"""
-        self.root.mainloop()
-
 if __name__ == "__main__":
-    try:
-        controller = HoMM3AIController()
-        controller.run()
-    except Exception as e:
-        print(f"Error: {e}")
-        input("Press Enter to exit...")
\ No newline at end of file
+    from homm3_real_gui import main
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Real Game AI - Controller
+Tk front end for the computer-vision game AI
+"""
+
+import time
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from homm3_real_ai import HoMM3GameAI
+
+class HoMM3AIController:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.ai = HoMM3GameAI()
+        self.setup_ui()
+        
+    def setup_ui(self):
+        self.root.title("Heroes III Game AI Controller")
+        self.root.geometry("500x400")
+        
+        # Title
+        title_label = ttk.Label(self.root, text="Heroes III Real Game AI", 
+                               font=("Arial", 16, "bold"))
+        title_label.pack(pady=10)
+        
+        # Instructions
+        instructions = """This AI will control the actual Heroes III game.
+        
+Prerequisites:
+1. Heroes III must be running and visible
+2. It should be your turn
+3. Game window should not be minimized
+
+The AI will:
+• Analyze the game screen using computer vision
+• Make strategic decisions based on game state
+• Control mouse and keyboard to play the game
+• Explore map, manage towns, fight battles
+        """
+        
+        inst_label = ttk.Label(self.root, text=instructions, justify="left")
+        inst_label.pack(padx=20, pady=10, fill="x")
+        
+        # Strategy selection
+        strategy_frame = ttk.LabelFrame(self.root, text="AI Strategy")
+        strategy_frame.pack(fill="x", padx=20, pady=10)
+        
+        self.strategy_var = tk.StringVar(value="exploration")
+        strategies = [
+            ("Exploration Focus", "exploration"),
+            ("Resource Gathering", "resource_gathering"), 
+            ("Aggressive Expansion", "aggressive")
+        ]
+        
+        for text, value in strategies:
+            ttk.Radiobutton(strategy_frame, text=text, variable=self.strategy_var, 
+                           value=value, command=self.update_strategy).pack(anchor="w", padx=10)
+        
+        # Control buttons
+        button_frame = ttk.Frame(self.root)
+        button_frame.pack(pady=20)
+        
+        self.start_button = ttk.Button(button_frame, text="Start AI", 
+                                      command=self.start_ai, style="Accent.TButton")
+        self.start_button.pack(side="left", padx=10)
+        
+        self.stop_button = ttk.Button(button_frame, text="Stop AI", 
+                                     command=self.stop_ai, state="disabled")
+        self.stop_button.pack(side="left", padx=10)
+        
+        # Status
+        self.status_label = ttk.Label(self.root, text="Status: Ready", 
+                                     font=("Arial", 10, "bold"))
+        self.status_label.pack(pady=10)
+        
+        # Log area
+        ttk.Label(self.root, text="AI Activity Log:").pack(anchor="w", padx=20)
+        self.log_text = tk.Text(self.root, height=8, wrap="word")
+        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.log_text.yview)
+        self.log_text.configure(yscrollcommand=scrollbar.set)
+        
+        log_frame = ttk.Frame(self.root)
+        log_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        self.log_text.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        self.log("AI Controller ready. Start Heroes III and click 'Start AI'")
+        self.log("Make sure Heroes III window is visible and it's your turn")
+        
+    def update_strategy(self):
+        """Update AI strategy"""
+        self.ai.current_strategy = self.strategy_var.get()
+        self.log(f"Strategy changed to: {self.strategy_var.get()}")
+        
+    def start_ai(self):
+        """Start AI control"""
+        success, message = self.ai.start_ai()
+        if success:
+            self.start_button.config(state="disabled")
+            self.stop_button.config(state="normal")
+            self.status_label.config(text="Status: AI Active")
+            self.log("AI started - now controlling Heroes III game")
+        else:
+            messagebox.showerror("Error", message)
+            self.log(f"Failed to start: {message}")
+    
+    def stop_ai(self):
+        """Stop AI control"""
+        message = self.ai.stop_ai()
+        self.start_button.config(state="normal")
+        self.stop_button.config(state="disabled")
+        self.status_label.config(text="Status: Stopped")
+        self.log(message)
+    
+    def log(self, message):
+        """Add message to log"""
+        timestamp = time.strftime("%H:%M:%S")
+        self.log_text.insert("end", f"[{timestamp}] {message}\n")
+        self.log_text.see("end")
+        self.root.update_idletasks()
+        
+    def run(self):
+        """Run the controller"""
+        self.root.mainloop()
+
+def main():
+    """Launch the real game AI controller window"""
+    try:
+        controller = HoMM3AIController()
+        controller.run()
+    except Exception as e:
+        print(f"Error: {e}")
+        input("Press Enter to exit...")
+
+if __name__ == "__main__":
+    main()
@@ -4,35 +4,48 @@ Heroes of Might & Magic III Realistic AI Opponent
 AI that plays exactly like a human - respects fog of war, hides town management, fair competition
 """
 
-import tkinter as tk
-from tkinter import ttk, messagebox
 import threading
 import time
-import pyautogui
 import random
 import json
 from datetime import datetime
+from homm3_fog import FogOfWar, HERO_SIGHT_RADIUS
+from homm3_anytime import Deadline, TurnScheduler, run_anytime
+
+# Share of each turn's time budget per sub-decision
+TURN_PHASES = {"decision": 1.0, "execution": 2.0, "planning": 1.0}
 
 class RealisticHoMM3AI:
     def __init__(self):
         self.running = False
         self.difficulty = "normal"
         self.ai_player_number = None  # Which player slot AI controls
-        self.known_map = set()  # Only tiles AI has explored
+        self.map_size = (144, 144)  # Tiles; XL by default, the bitsets stay small
+        self.map_levels = 2  # Surface and underground
+        self.known_map = FogOfWar(*self.map_size, levels=self.map_levels)  # Only tiles AI has explored
         self.hidden_actions = True  # Keep AI actions private in towns
         self.fog_of_war_respect = True  # AI can't see through fog
         self.realistic_timing = True  # Human-like decision timing
+        self.turn_seconds = 30  # Turn length with realistic timing, shared by TURN_PHASES
+        self.threat_radius = 20  # Tiles an enemy hero can cover in a turn
         
         # AI knowledge is limited to what it can legitimately see
         self.ai_knowledge = {
-            "explored_tiles": set(),
+            "explored_tiles": self.known_map,
             "own_heroes": [],
             "own_towns": [],
             "visible_enemies": {},  # Only enemies in sight range
             "discovered_resources": [],
             "last_seen_positions": {}  # Where enemies were last spotted
         }
-        
+        self.current_turn = 1
+        self.current_level = 0  # Map level the AI's heroes are on
+        self.influence = None  # InfluenceMap, created on first positional assessment
+        self.enemy_tracker = None  # EnemyTracker particle filters, created on the first sighting
+        self.own_positions = {}  # Unit id -> (x, y) of the AI's own heroes and towns
+        self.sighted_this_turn = set()
+        self.exploration_target = None  # (x, y, gain) chosen by explore_unknown_area
+    
     def detect_ai_player_turn(self):
         """Detect when it's specifically this AI player's turn"""
         try:
@@ -50,6 +63,63 @@ class RealisticHoMM3AI:
         # Return True only when it's the designated AI player's turn
         return False  # Placeholder
     
+    def reveal_around_hero(self, x, y, level=0, radius=HERO_SIGHT_RADIUS):
+        """Mark the tiles in a hero's sight as explored; returns how many were new"""
+        return self.known_map.reveal(x, y, radius, level)
+    
+    def influence_map(self):
+        """Own and enemy influence over the map, created on first use"""
+        if self.influence is None:
+            from homm3_influence import InfluenceMap
+            
+            self.influence = InfluenceMap(*self.map_size)
+            self.influence.advance_turn(self.current_turn)
+            for key, sighting in self.ai_knowledge["last_seen_positions"].items():
+                self.influence.set_source("enemy", key, sighting["x"], sighting["y"],
+                                          sighting["strength"], sighting["turn"])
+        return self.influence
+    
+    def enemy_beliefs(self):
+        """Particle-filter tracker of enemy heroes, seeded from past sightings"""
+        if self.enemy_tracker is None:
+            from homm3_beliefs import EnemyTracker
+            
+            self.enemy_tracker = EnemyTracker(*self.map_size)
+            for key, sighting in self.ai_knowledge["last_seen_positions"].items():
+                self.enemy_tracker.sighting(key, sighting["x"], sighting["y"], sighting["strength"])
+                for _ in range(self.current_turn - sighting["turn"]):
+                    self.enemy_tracker.beliefs[key].predict()
+        return self.enemy_tracker
+    
+    def record_enemy_sighting(self, enemy_id, x, y, strength):
+        """Remember where an enemy was seen and how strong it looked"""
+        sighting = {"x": x, "y": y, "strength": strength, "turn": self.current_turn}
+        self.ai_knowledge["last_seen_positions"][enemy_id] = sighting
+        self.sighted_this_turn.add(enemy_id)
+        if self.influence is not None:
+            self.influence.set_source("enemy", enemy_id, x, y, strength, self.current_turn)
+        if self.enemy_tracker is None:
+            self.enemy_beliefs()
+        else:
+            self.enemy_tracker.sighting(enemy_id, x, y, strength)
+    
+    def record_own_position(self, unit_id, x, y, strength):
+        """Place one of the AI's heroes or towns on the influence map"""
+        self.own_positions[unit_id] = (x, y)
+        self.influence_map().set_source("own", unit_id, x, y, strength, self.current_turn)
+    
+    def positional_strength(self, visible_data):
+        """(own, enemy) influence summed over the AI's positioned heroes, or None"""
+        positions = [hero["position"] for hero in visible_data.get("ai_heroes_visible", []) if "position" in hero]
+        if not positions or not self.ai_knowledge["last_seen_positions"]:
+            return None
+        
+        for i, hero in enumerate(visible_data["ai_heroes_visible"]):
+            if "position" in hero:
+                x, y = hero["position"][:2]
+                self.record_own_position(hero.get("name", i), x, y, hero.get("army_size", 0))
+        return self.influence_map().pressure_at(positions)
+    
     def analyze_visible_information_only(self):
         """Analyze only what AI can legitimately see"""
         visible_data = {
@@ -58,6 +128,9 @@ class RealisticHoMM3AI:
             "enemy_units_in_sight": [],
             "neutral_objects_visible": [],
             "explored_terrain": [],
+            "explored_area": self.known_map.explored_count(),
+            "frontier_size": self.known_map.frontier_size(self.current_level),
+            "enemy_estimates": self.enemy_tracker.estimates() if self.enemy_tracker else {},
             "resource_income": 0  # AI's actual resource income
         }
         
@@ -91,11 +164,34 @@ class RealisticHoMM3AI:
         else:
             return {"action": "explore", "reasoning": "default exploration"}
     
+    def decide(self, visible_data, deadline=None):
+        """Best decision refined before the deadline; the quick one without a deadline"""
+        return run_anytime(self.refine_decision(visible_data), deadline)
+    
+    def refine_decision(self, visible_data):
+        """Yield the quick strategic decision, then versions refined with map knowledge"""
+        decision = self.make_realistic_decision(visible_data)
+        yield decision
+        
+        # Exploration gets a concrete frontier tile
+        if decision["action"] in ("explore_nearest_unknown", "explore_strategic_areas"):
+            target = self.known_map.best_frontier(self.current_level)
+            if target is not None:
+                decision = dict(decision, target=target)
+                yield decision
+        
+        # Aggression is reconsidered against enemies believed to be near, even unseen
+        if decision["action"] == "aggressive_expansion" and self.enemy_tracker and self.own_positions:
+            hidden_threat = max(self.enemy_tracker.threat_within(x, y, self.threat_radius)
+                                for x, y in self.own_positions.values())
+            if hidden_threat > self.estimate_own_strength(visible_data):
+                yield {"action": "cautious_probing", "reasoning": "likely enemy strength nearby"}
+    
     def determine_game_phase(self, visible_data):
         """Determine current game phase from visible information"""
         hero_count = len(visible_data.get("ai_heroes_visible", []))
         enemy_sightings = len(visible_data.get("enemy_units_in_sight", []))
-        explored_area = len(visible_data.get("explored_terrain", []))
+        explored_area = visible_data.get("explored_area", len(visible_data.get("explored_terrain", [])))
         
         if hero_count == 0 or explored_area < 20:
             return "early_exploration"
@@ -128,6 +224,11 @@ class RealisticHoMM3AI:
         enemy_strength = self.estimate_visible_enemy_strength(visible_data)
         ai_strength = self.estimate_own_strength(visible_data)
         
+        # With positions known, weigh strength where the AI's heroes actually stand
+        positional = self.positional_strength(visible_data)
+        if positional is not None:
+            ai_strength, enemy_strength = positional
+        
         if ai_strength > enemy_strength * 1.3:
             return {"action": "aggressive_expansion", "reasoning": "strength advantage"}
         elif ai_strength < enemy_strength * 0.7:
@@ -163,81 +264,91 @@ class RealisticHoMM3AI:
         
         return strategies[0]  # Fallback
     
-    def execute_hidden_action(self, decision):
-        """Execute action while keeping AI strategy private"""
+    def pace(self, deadline, low, high):
+        """Human-like pause of low to high seconds, cut short by the deadline; none without realistic timing"""
+        if self.realistic_timing:
+            deadline.sleep_remaining(at_most=random.uniform(low, high))
+    
+    def execute_hidden_action(self, decision, deadline=None):
+        """Execute action while keeping AI strategy private, paced within the deadline"""
+        deadline = deadline or Deadline()
         try:
             # Add realistic human-like delays
-            time.sleep(random.uniform(2, 8))
+            self.pace(deadline, 2, 8)
             
             action = decision["action"]
             
             if action == "recruit_hero":
-                return self.recruit_hero_privately()
+                return self.recruit_hero_privately(deadline)
             elif action == "explore_nearest_unknown":
-                return self.explore_unknown_area()
+                return self.explore_unknown_area(deadline)
             elif action == "build_town_structure":
-                return self.manage_town_privately()
+                return self.manage_town_privately(deadline)
             elif action == "recruit_army":
-                return self.recruit_units_privately()
+                return self.recruit_units_privately(deadline)
             elif action == "aggressive_expansion":
-                return self.execute_aggressive_move()
+                return self.execute_aggressive_move(deadline)
             elif action == "defensive_consolidation":
-                return self.consolidate_position()
+                return self.consolidate_position(deadline)
             elif action == "cautious_probing":
-                return self.probe_enemy_carefully()
+                return self.probe_enemy_carefully(deadline)
             else:
-                return self.default_action()
-                
+                return self.default_action(deadline)
+        
         except Exception as e:
             return False
     
-    def recruit_hero_privately(self):
+    def recruit_hero_privately(self, deadline):
         """Recruit hero without showing player the selection process"""
         # AI goes to tavern, makes selection privately
         # Human player doesn't see which hero AI chose until it appears
-        time.sleep(random.uniform(3, 7))  # Realistic decision time
+        self.pace(deadline, 3, 7)  # Realistic decision time
         return True
     
-    def explore_unknown_area(self):
+    def explore_unknown_area(self, deadline):
         """Move heroes to unexplored areas"""
         # AI moves heroes to reveal map gradually
         # Movement follows same rules as human player
-        time.sleep(random.uniform(1, 4))
+        # The frontier tile that would reveal the most comes from the maintained ranking
+        self.exploration_target = self.known_map.best_frontier(self.current_level)
+        self.pace(deadline, 1, 4)
         return True
     
-    def manage_town_privately(self):
+    def manage_town_privately(self, deadline):
         """Manage town development behind fog of war"""
         # When AI enters town screen, human can't see what's being built
         # AI makes building decisions privately like human would
         # Only results become visible when complete
-        time.sleep(random.uniform(5, 15))  # Town management takes time
+        self.pace(deadline, 5, 15)  # Town management takes time
         return True
     
-    def recruit_units_privately(self):
+    def recruit_units_privately(self, deadline):
         """Recruit army units privately in towns"""
         # AI recruitment happens in town screen
         # Human doesn't see unit composition until combat or scouting
-        time.sleep(random.uniform(3, 8))
+        self.pace(deadline, 3, 8)
         return True
     
-    def execute_aggressive_move(self):
+    def execute_aggressive_move(self, deadline):
         """Execute aggressive tactical move"""
-        time.sleep(random.uniform(2, 6))
+        self.pace(deadline, 2, 6)
         return True
     
-    def consolidate_position(self):
+    def consolidate_position(self, deadline):
         """Defensive positioning and strengthening"""
-        time.sleep(random.uniform(4, 10))
+        self.pace(deadline, 4, 10)
         return True
     
-    def probe_enemy_carefully(self):
+    def probe_enemy_carefully(self, deadline):
         """Cautious reconnaissance and positioning"""
-        time.sleep(random.uniform(3, 8))
+        self.pace(deadline, 3, 8)
         return True
     
-    def default_action(self):
+    def default_action(self, deadline):
         """Default exploration or end turn"""
-        time.sleep(random.uniform(1, 3))
+        import pyautogui
+        
+        self.pace(deadline, 1, 3)
         pyautogui.press('enter')  # End turn
         return True
     
@@ -247,33 +358,56 @@ class RealisticHoMM3AI:
             try:
                 if self.detect_ai_player_turn():
                     # AI takes turn with realistic timing
-                    turn_start = time.time()
+                    turn = Deadline(self.turn_seconds)
+                    scheduler = TurnScheduler(turn, TURN_PHASES)
                     
                     # Analyze visible situation (like human looking at screen)
-                    time.sleep(random.uniform(1, 3))  # "Thinking" time
                     visible_data = self.analyze_visible_information_only()
                     
-                    # Make strategic decision
-                    decision = self.make_realistic_decision(visible_data)
+                    # Make strategic decision, refining it with the thinking time
+                    thinking = scheduler.allot("decision")
+                    decision = self.decide(visible_data, thinking)
+                    self.pace(thinking, 1, 3)
                     
                     # Execute action privately
-                    success = self.execute_hidden_action(decision)
+                    success = self.execute_hidden_action(decision, scheduler.allot("execution"))
                     
-                    # End turn after actions (or timeout like human)
-                    turn_duration = time.time() - turn_start
-                    if turn_duration < 30:  # Minimum turn time
-                        time.sleep(30 - turn_duration)
+                    # Time left over goes into the estimates the next turn starts from
+                    self.end_of_turn()
+                    self.prepare_next_turn(scheduler.allot("planning"))
                     
-                    # End turn
+                    # End turn after actions (or timeout like human)
+                    if self.realistic_timing:
+                        turn.sleep_remaining()
+                    import pyautogui
                     pyautogui.press('enter')
-                    
+                
                 else:
                     # Wait during other players' turns
                     time.sleep(2)
-                    
+            
             except Exception as e:
                 time.sleep(3)
     
+    def end_of_turn(self):
+        """Advance the turn counter; sightings age by one turn"""
+        self.current_turn += 1
+        if self.influence is not None:
+            self.influence.advance_turn(self.current_turn)
+        if self.enemy_tracker is not None:
+            # Enemies not spotted near the AI's own heroes are probably elsewhere
+            viewers = [(x, y, HERO_SIGHT_RADIUS) for x, y in self.own_positions.values()]
+            self.enemy_tracker.advance_turn(viewers, self.sighted_this_turn)
+        self.sighted_this_turn = set()
+    
+    def prepare_next_turn(self, deadline):
+        """Bring influence grids, enemy estimates and the exploration target up to date before a deadline"""
+        self.exploration_target = self.known_map.best_frontier(self.current_level)
+        if self.influence is not None and not deadline.expired():
+            self.influence.control()  # Rebuilds both sides' grids after the turn's decay
+        if self.enemy_tracker is not None and not deadline.expired():
+            self.ai_knowledge["enemy_estimates"] = self.enemy_tracker.estimates()
+    
     def start_realistic_ai(self):
         """Start realistic fair-play AI"""
         self.running = True
@@ -286,124 +420,6 @@ class RealisticHoMM3AI:
         self.running = False
         return "Realistic AI stopped"
 
-class RealisticAIController:
-    def __init__(self):
-        self.root = tk.Tk()
-        self.ai = RealisticHoMM3AI()
-        self.setup_ui()
-        
-    def setup_ui(self):
-        self.root.title("Heroes III Realistic AI Opponent")
-        self.root.geometry("520x500")
-        
-        # Realism guarantee
-        realism_frame = ttk.LabelFrame(self.root, text="Realistic Competition")
-        realism_frame.pack(fill="x", padx=20, pady=10)
-        
-        realism_text = """🎮 HUMAN-LIKE AI OPPONENT:
-        
-• Respects fog of war completely
-• Town management stays private (like human players)
-• No knowledge of your strategies or resources
-• Realistic decision timing and "thinking" pauses
-• Makes mistakes and suboptimal choices occasionally
-• Learns from visible information only
-• Fair competitive gameplay
-        """
-        
-        ttk.Label(realism_frame, text=realism_text, justify="left").pack(padx=10, pady=10)
-        
-        # AI personality settings
-        personality_frame = ttk.LabelFrame(self.root, text="AI Personality")
-        personality_frame.pack(fill="x", padx=20, pady=10)
-        
-        self.personality_var = tk.StringVar(value="balanced")
-        
-        personalities = [
-            ("Cautious Explorer", "cautious"),
-            ("Balanced Strategist", "balanced"),
-            ("Aggressive Conqueror", "aggressive"),
-            ("Economic Builder", "economic")
-        ]
-        
-        for text, value in personalities:
-            ttk.Radiobutton(personality_frame, text=text, variable=self.personality_var, 
-                           value=value).pack(anchor="w", padx=10)
-        
-        # Difficulty settings
-        difficulty_frame = ttk.LabelFrame(self.root, text="Challenge Level")
-        difficulty_frame.pack(fill="x", padx=20, pady=10)
-        
-        self.difficulty_var = tk.StringVar(value="normal")
-        
-        ttk.Radiobutton(difficulty_frame, text="Beginner (Makes obvious mistakes)", 
-                       variable=self.difficulty_var, value="easy").pack(anchor="w", padx=10)
-        ttk.Radiobutton(difficulty_frame, text="Intermediate (Good strategic play)", 
-                       variable=self.difficulty_var, value="normal").pack(anchor="w", padx=10)
-        ttk.Radiobutton(difficulty_frame, text="Expert (Nearly optimal decisions)", 
-                       variable=self.difficulty_var, value="hard").pack(anchor="w", padx=10)
-        
-        # Instructions
-        instructions_frame = ttk.LabelFrame(self.root, text="Setup Instructions")
-        instructions_frame.pack(fill="x", padx=20, pady=10)
-        
-        instructions = """1. Start Heroes III and create multiplayer game
-2. Set one player slot as "Computer" opponent
-3. Start this Realistic AI Controller
-4. Begin game - AI will control computer player realistically
-5. Enjoy fair competitive gameplay!
-
-The AI will play exactly like a skilled human opponent - no cheating, no unfair advantages, just pure strategic competition."""
-        
-        ttk.Label(instructions_frame, text=instructions, justify="left").pack(padx=10, pady=10)
-        
-        # Control buttons
-        button_frame = ttk.Frame(self.root)
-        button_frame.pack(pady=20)
-        
-        self.start_button = ttk.Button(button_frame, text="Start Realistic AI", 
-                                      command=self.start_realistic_ai, style="Accent.TButton")
-        self.start_button.pack(side="left", padx=10)
-        
-        self.stop_button = ttk.Button(button_frame, text="Stop AI", 
-                                     command=self.stop_ai, state="disabled")
-        self.stop_button.pack(side="left", padx=10)
-        
-        # Status
-        self.status_label = ttk.Label(self.root, text="Status: Ready for realistic competition", 
-                                     font=("Arial", 10, "bold"))
-        self.status_label.pack(pady=10)
-        
-    def start_realistic_ai(self):
-        """Start realistic AI opponent"""
-        self.ai.difficulty = self.difficulty_var.get()
-        self.ai.personality = self.personality_var.get()
-        
-        success, message = self.ai.start_realistic_ai()
-        
-        if success:
-            self.start_button.config(state="disabled")
-            self.stop_button.config(state="normal")
-            self.status_label.config(text="Status: Realistic AI active - fair competition mode")
-            messagebox.showinfo("Realistic Competition", 
-                              "AI is now playing like a human opponent!\n\n" +
-                              "• Respects fog of war\n" +
-                              "• Keeps strategies private\n" +
-                              "• Fair competitive gameplay")
-        else:
-            messagebox.showerror("Error", message)
-    
-    def stop_ai(self):
-        """Stop AI"""
-        message = self.ai.stop_ai()
-        self.start_button.config(state="normal")
-        self.stop_button.config(state="disabled")
-        self.status_label.config(text="Status: Stopped")
-        
-    def run(self):
-        """Run the controller"""
-        self.root.mainloop()
-
 if __name__ == "__main__":
-    controller = RealisticAIController()
-    controller.run()
\ No newline at end of file
+    from homm3_realistic_gui import main
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Realistic AI Opponent - Controller
+Tk front end for the fair-play realistic AI
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from homm3_realistic_ai import RealisticHoMM3AI
+
+class RealisticAIController:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.ai = RealisticHoMM3AI()
+        self.setup_ui()
+        
+    def setup_ui(self):
+        self.root.title("Heroes III Realistic AI Opponent")
+        self.root.geometry("520x500")
+        
+        # Realism guarantee
+        realism_frame = ttk.LabelFrame(self.root, text="Realistic Competition")
+        realism_frame.pack(fill="x", padx=20, pady=10)
+        
+        realism_text = """🎮 HUMAN-LIKE AI OPPONENT:
+        
+• Respects fog of war completely
+• Town management stays private (like human players)
+• No knowledge of your strategies or resources
+• Realistic decision timing and "thinking" pauses
+• Makes mistakes and suboptimal choices occasionally
+• Learns from visible information only
+• Fair competitive gameplay
+        """
+        
+        ttk.Label(realism_frame, text=realism_text, justify="left").pack(padx=10, pady=10)
+        
+        # AI personality settings
+        personality_frame = ttk.LabelFrame(self.root, text="AI Personality")
+        personality_frame.pack(fill="x", padx=20, pady=10)
+        
+        self.personality_var = tk.StringVar(value="balanced")
+        
+        personalities = [
+            ("Cautious Explorer", "cautious"),
+            ("Balanced Strategist", "balanced"),
+            ("Aggressive Conqueror", "aggressive"),
+            ("Economic Builder", "economic")
+        ]
+        
+        for text, value in personalities:
+            ttk.Radiobutton(personality_frame, text=text, variable=self.personality_var, 
+                           value=value).pack(anchor="w", padx=10)
+        
+        # Difficulty settings
+        difficulty_frame = ttk.LabelFrame(self.root, text="Challenge Level")
+        difficulty_frame.pack(fill="x", padx=20, pady=10)
+        
+        self.difficulty_var = tk.StringVar(value="normal")
+        
+        ttk.Radiobutton(difficulty_frame, text="Beginner (Makes obvious mistakes)", 
+                       variable=self.difficulty_var, value="easy").pack(anchor="w", padx=10)
+        ttk.Radiobutton(difficulty_frame, text="Intermediate (Good strategic play)", 
+                       variable=self.difficulty_var, value="normal").pack(anchor="w", padx=10)
+        ttk.Radiobutton(difficulty_frame, text="Expert (Nearly optimal decisions)", 
+                       variable=self.difficulty_var, value="hard").pack(anchor="w", padx=10)
+        
+        # Instructions
+        instructions_frame = ttk.LabelFrame(self.root, text="Setup Instructions")
+        instructions_frame.pack(fill="x", padx=20, pady=10)
+        
+        instructions = """1. Start Heroes III and create multiplayer game
+2. Set one player slot as "Computer" opponent
+3. Start this Realistic AI Controller
+4. Begin game - AI will control computer player realistically
+5. Enjoy fair competitive gameplay!
+
+The AI will play exactly like a skilled human opponent - no cheating, no unfair advantages, just pure strategic competition."""
+        
+        ttk.Label(instructions_frame, text=instructions, justify="left").pack(padx=10, pady=10)
+        
+        # Control buttons
+        button_frame = ttk.Frame(self.root)
+        button_frame.pack(pady=20)
+        
+        self.start_button = ttk.Button(button_frame, text="Start Realistic AI", 
+                                      command=self.start_realistic_ai, style="Accent.TButton")
+        self.start_button.pack(side="left", padx=10)
+        
+        self.stop_button = ttk.Button(button_frame, text="Stop AI", 
+                                     command=self.stop_ai, state="disabled")
+        self.stop_button.pack(side="left", padx=10)
+        
+        # Status
+        self.status_label = ttk.Label(self.root, text="Status: Ready for realistic competition", 
+                                     font=("Arial", 10, "bold"))
+        self.status_label.pack(pady=10)
+        
+    def start_realistic_ai(self):
+        """Start realistic AI opponent"""
+        self.ai.difficulty = self.difficulty_var.get()
+        self.ai.personality = self.personality_var.get()
+        
+        success, message = self.ai.start_realistic_ai()
+        
+        if success:
+            self.start_button.config(state="disabled")
+            self.stop_button.config(state="normal")
+            self.status_label.config(text="Status: Realistic AI active - fair competition mode")
+            messagebox.showinfo("Realistic Competition", 
+                              "AI is now playing like a human opponent!\n\n" +
+                              "• Respects fog of war\n" +
+                              "• Keeps strategies private\n" +
+                              "• Fair competitive gameplay")
+        else:
+            messagebox.showerror("Error", message)
+    
+    def stop_ai(self):
+        """Stop AI"""
+        message = self.ai.stop_ai()
+        self.start_button.config(state="normal")
+        self.stop_button.config(state="disabled")
+        self.status_label.config(text="Status: Stopped")
+        
+    def run(self):
+        """Run the controller"""
+        self.root.mainloop()
+
+def main():
+    """Launch the realistic AI controller window"""
+    controller = RealisticAIController()
+    controller.run()
+
+if __name__ == "__main__":
+    main()
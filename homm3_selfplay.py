@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Heroes III AI Opponent - Self-Play Datasets
+Simulator self-play written as memory-mapped column shards for training
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+
+from homm3_batch_simulator import BatchSimulator, FEATURE_NAMES, HUMAN, AI, random_policy, legal_rule_policy
+
+SHARD_ROWS = 1 << 20  # Row capacity per shard; shards hold whole games, so they end a little short
+GAMES_PER_BATCH = 4096  # Games played in lockstep per simulator batch
+MAX_TURNS = 40
+EXPLORATION_RATE = 0.2  # Share of AI moves drawn from the legal actions instead of the rules
+INDEX_FILE = "index.json"
+SHARD_FILE = "shard.json"  # Row count of a finished shard, written before it is renamed into place
+
+# name -> (dtype, values per row)
+COLUMNS = {
+    "features": (np.float32, len(FEATURE_NAMES)),
+    "side": (np.int8, 1),  # HUMAN or AI, the side that moved
+    "action": (np.int8, 1),  # Index into that side's action list
+    "outcome": (np.int8, 1),  # 1 if the mover went on to win, -1 if it lost, 0 if undecided
+    "game": (np.int64, 1),  # Game number, unique across the dataset
+}
+
+def shard_name(shard):
+    """Folder of one shard's column files"""
+    return f"shard-{shard:05d}"
+
+def exploring_rule_policy(rate=EXPLORATION_RATE):
+    """Rule-based AI, kept to legal moves, that plays a random legal action in a share of its games each turn"""
+    explore = random_policy(AI)
+    def policy(simulator):
+        actions = legal_rule_policy(simulator)
+        chosen = simulator.rng.random(simulator.games) < rate
+        return np.where(chosen, explore(simulator), actions)
+    return policy
+
+def play_batch(simulator, turns=MAX_TURNS):
+    """Self-play one batch of games; rows of every move with the final outcome"""
+    simulator.reset()
+    policies = ((HUMAN, random_policy(HUMAN)), (AI, exploring_rule_policy()))
+    moves = []  # (side, moved games, features, actions)
+    for _ in range(turns):
+        if simulator.done.all():
+            break
+        for side, policy in policies:
+            moved = np.nonzero(~simulator.done)[0]
+            features = simulator.features()[moved]
+            actions = policy(simulator)
+            simulator.apply(side, actions)
+            moves.append((side, moved, features, actions[moved]))
+        simulator.next_turn()
+    
+    rows = {name: [] for name in COLUMNS}
+    for side, moved, features, actions in moves:
+        winner = simulator.winner[moved]
+        rows["features"].append(features)
+        rows["side"].append(np.full(moved.size, side, dtype=np.int8))
+        rows["action"].append(actions.astype(np.int8))
+        rows["outcome"].append(np.where(winner == side, 1, np.where(winner == 1 - side, -1, 0)).astype(np.int8))
+        rows["game"].append(moved)
+    
+    # Grouped by game, in move order within each, so a batch can be cut between games
+    rows = {name: np.concatenate(parts) for name, parts in rows.items()}
+    order = np.argsort(rows["game"], kind="stable")
+    return {name: values[order] for name, values in rows.items()}
+
+def whole_games(games, limit):
+    """Rows of the complete games that fit in a limit, for rows grouped by game"""
+    if limit >= len(games):
+        return len(games)
+    # The first row of the game that would be cut is where the rows stop
+    return int(np.searchsorted(games, games[limit], side="left"))
+
+def write_shard(directory, shard, seed, rows=SHARD_ROWS, games=GAMES_PER_BATCH, turns=MAX_TURNS):
+    """Fill one shard with whole games; written to a temporary folder and renamed when complete"""
+    final = os.path.join(directory, shard_name(shard))
+    partial = final + ".partial"
+    shutil.rmtree(partial, ignore_errors=True)
+    os.makedirs(partial)
+    columns = {name: np.lib.format.open_memmap(os.path.join(partial, name + ".npy"), mode="w+",
+                                               dtype=dtype, shape=(rows, width) if width > 1 else (rows,))
+               for name, (dtype, width) in COLUMNS.items()}
+    
+    # Seeded per shard, so a shard redone after a crash holds the same rows
+    simulator = BatchSimulator(games, seed=[seed, shard])
+    filled = 0
+    batch = 0
+    while filled < rows:
+        data = play_batch(simulator, turns)
+        take = whole_games(data["game"], rows - filled)
+        if take == 0:
+            break
+        data["game"] += (shard << 32) + batch * games
+        for name, column in columns.items():
+            column[filled:filled + take] = data[name][:take]
+        filled += take
+        batch += 1
+    
+    for column in columns.values():
+        column.flush()
+    del columns
+    with open(os.path.join(partial, SHARD_FILE), "w") as f:
+        json.dump({"rows": filled}, f)
+    
+    # A finished copy left by an earlier run that never reached the index is replaced
+    shutil.rmtree(final, ignore_errors=True)
+    os.replace(partial, final)
+    return shard, filled
+
+def finished_shard(directory, shard):
+    """Row count of a shard folder that was completed, or None"""
+    path = os.path.join(directory, shard_name(shard), SHARD_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)["rows"]
+
+def read_index(directory):
+    """Dataset index, or None for a folder without one"""
+    path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+def write_index(directory, index):
+    """Replace the index atomically, so a crash never leaves it half written"""
+    path = os.path.join(directory, INDEX_FILE)
+    with open(path + ".tmp", "w") as f:
+        json.dump(index, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def generate(directory, shards, seed=0, workers=None, rows=SHARD_ROWS, turns=MAX_TURNS, progress=None):
+    """Write shards in worker processes; shards already in the index are kept, so a rerun resumes"""
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    os.makedirs(directory, exist_ok=True)
+    index = read_index(directory) or {
+        "columns": {name: [np.dtype(dtype).name, width] for name, (dtype, width) in COLUMNS.items()},
+        "feature_names": list(FEATURE_NAMES),
+        "shard_rows": rows,
+        "seed": seed,
+        "turns": turns,
+        "shards": {},  # Shard number (as a string) -> rows
+    }
+    if index["shard_rows"] != rows or index["seed"] != seed or index["turns"] != turns:
+        raise ValueError(f"{directory} was generated with different settings")
+    
+    def record(shard, filled):
+        index["shards"][str(shard)] = filled
+        index["shards"] = dict(sorted(index["shards"].items(), key=lambda item: int(item[0])))
+        write_index(directory, index)
+        if progress:
+            progress(len(index["shards"]), shards)
+    
+    # Shards finished by a run that stopped before indexing them are adopted as they are
+    todo = []
+    for shard in range(shards):
+        if str(shard) in index["shards"]:
+            continue
+        filled = finished_shard(directory, shard)
+        if filled is None:
+            todo.append(shard)
+        else:
+            record(shard, filled)
+    
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(write_shard, directory, shard, seed, rows, GAMES_PER_BATCH, turns)
+                   for shard in todo]
+        for future in as_completed(futures):
+            record(*future.result())
+    return index
+
+class SelfPlayDataset:
+    """Read-only view of a generated dataset; columns stay on disk until sliced"""
+    
+    def __init__(self, directory):
+        self.directory = directory
+        self.index = read_index(directory)
+        if self.index is None:
+            raise FileNotFoundError(f"no {INDEX_FILE} in {directory}")
+        self.shards = []
+        for shard, filled in self.index["shards"].items():
+            folder = os.path.join(directory, shard_name(int(shard)))
+            self.shards.append({name: np.load(os.path.join(folder, name + ".npy"), mmap_mode="r")[:filled]
+                                for name in COLUMNS})
+        self.offsets = np.cumsum([0] + list(self.index["shards"].values()))  # First global row of each shard
+    
+    def __len__(self):
+        return int(self.offsets[-1])
+    
+    def rows(self, start, stop):
+        """Columns for a range of global row numbers"""
+        parts = {name: [] for name in COLUMNS}
+        while start < stop:
+            shard = int(np.searchsorted(self.offsets, start, side="right")) - 1
+            local = start - self.offsets[shard]
+            end = min(local + stop - start, self.offsets[shard + 1] - self.offsets[shard])
+            for name, column in self.shards[shard].items():
+                parts[name].append(np.asarray(column[local:end]))
+            start += end - local
+        return {name: np.concatenate(chunks) for name, chunks in parts.items()}
+    
+    def batches(self, batch_size, rng=None, side=None):
+        """Shuffled minibatches, optionally one side's moves only
+        
+        Shards are visited in random order and shuffled within, so only one
+        shard's pages are touched at a time and no dataset-wide permutation
+        is ever held in memory.
+        """
+        rng = rng or np.random.default_rng()
+        for shard in rng.permutation(len(self.shards)):
+            columns = self.shards[shard]
+            size = len(columns["side"])
+            order = rng.permutation(size)
+            for start in range(0, size, batch_size):
+                rows = np.sort(order[start:start + batch_size])
+                batch = {name: column[rows] for name, column in columns.items()}
+                if side is not None:
+                    keep = batch["side"] == side
+                    batch = {name: values[keep] for name, values in batch.items()}
+                yield batch
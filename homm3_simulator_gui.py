@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Heroes III AI Opponent - Standalone Game Simulator UI
+Tk front end for playing the simulator against the AI
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from homm3_game_simulator import GameEngine
+
+class GameUI:
+    def __init__(self):
+        self.root = tk.Tk()
+        self.engine = GameEngine(self.update_display)
+        self.setup_ui()
+        self.update_display()
+        
+    def setup_ui(self):
+        self.root.title("Heroes III vs AI")
+        self.root.geometry("600x500")
+        
+        # Game status frame
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.turn_label = ttk.Label(status_frame, text="Turn 1", font=("Arial", 12, "bold"))
+        self.turn_label.pack()
+        
+        # Resources frame
+        res_frame = ttk.LabelFrame(self.root, text="Resources")
+        res_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.human_res_label = ttk.Label(res_frame, text="Your Gold: 1000")
+        self.human_res_label.pack(anchor="w")
+        
+        self.ai_res_label = ttk.Label(res_frame, text="AI Gold: 1000")
+        self.ai_res_label.pack(anchor="w")
+        
+        # Armies frame
+        army_frame = ttk.LabelFrame(self.root, text="Armies")
+        army_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.human_army_label = ttk.Label(army_frame, text="Your Army: ")
+        self.human_army_label.pack(anchor="w")
+        
+        self.ai_army_label = ttk.Label(army_frame, text="AI Army: ")
+        self.ai_army_label.pack(anchor="w")
+        
+        # Map locations frame
+        map_frame = ttk.LabelFrame(self.root, text="Map Locations")
+        map_frame.pack(fill="x", padx=10, pady=5)
+        
+        self.map_label = ttk.Label(map_frame, text="")
+        self.map_label.pack(anchor="w")
+        
+        # Actions frame
+        action_frame = ttk.LabelFrame(self.root, text="Your Actions")
+        action_frame.pack(fill="x", padx=10, pady=5)
+        
+        btn_frame = ttk.Frame(action_frame)
+        btn_frame.pack(fill="x", pady=5)
+        
+        ttk.Button(btn_frame, text="Recruit Archers (600g)", 
+                  command=lambda: self.player_action("recruit", "archers", 10, 600)).pack(side="left", padx=5)
+        ttk.Button(btn_frame, text="Recruit Swordsmen (800g)", 
+                  command=lambda: self.player_action("recruit", "swordsmen", 8, 800)).pack(side="left", padx=5)
+        
+        btn_frame2 = ttk.Frame(action_frame)
+        btn_frame2.pack(fill="x", pady=5)
+        
+        ttk.Button(btn_frame2, text="Capture Mine", 
+                  command=lambda: self.player_action("capture", "mine")).pack(side="left", padx=5)
+        ttk.Button(btn_frame2, text="Capture Castle", 
+                  command=lambda: self.player_action("capture", "castle")).pack(side="left", padx=5)
+        ttk.Button(btn_frame2, text="Attack AI", 
+                  command=lambda: self.player_action("attack", "ai")).pack(side="left", padx=5)
+        
+        # End turn button
+        ttk.Button(self.root, text="End Turn", command=self.end_turn, 
+                  style="Accent.TButton").pack(pady=10)
+        
+        # Log area
+        ttk.Label(self.root, text="Game Log:").pack(anchor="w", padx=10)
+        self.log_text = tk.Text(self.root, height=8, wrap="word")
+        scrollbar = ttk.Scrollbar(self.root, orient="vertical", command=self.log_text.yview)
+        self.log_text.configure(yscrollcommand=scrollbar.set)
+        
+        log_frame = ttk.Frame(self.root)
+        log_frame.pack(fill="both", expand=True, padx=10, pady=5)
+        self.log_text.pack(side="left", fill="both", expand=True)
+        scrollbar.pack(side="right", fill="y")
+        
+        self.log("Game started! Choose your actions and click End Turn.")
+        
+    def player_action(self, action_type, target, amount=0, cost=0):
+        """Handle player action"""
+        action = {
+            "type": action_type,
+            "target": target,
+            "amount": amount,
+            "cost": cost,
+            "units": target if action_type == "recruit" else None
+        }
+        
+        success, message = self.engine.process_human_action(action)
+        self.log(f"You: {message}")
+        self.update_display()
+        
+        if self.engine.state.game_over:
+            self.show_game_over()
+            
+    def end_turn(self):
+        """End current turn and let AI play"""
+        self.log("--- Turn ended ---")
+        
+        # AI turn
+        ai_result = self.engine.process_ai_turn()
+        self.log(f"AI: {ai_result}")
+        
+        # Next turn
+        self.engine.next_turn()
+        self.update_display()
+        
+        if self.engine.state.game_over:
+            self.show_game_over()
+        else:
+            self.log(f"--- Turn {self.engine.state.turn} begins ---")
+            
+    def update_display(self):
+        """Update all display elements"""
+        status = self.engine.get_game_status()
+        
+        self.turn_label.config(text=f"Turn {status['turn']}")
+        self.human_res_label.config(text=f"Your Gold: {status['human_resources']['gold']}")
+        self.ai_res_label.config(text=f"AI Gold: {status['ai_resources']['gold']}")
+        
+        human_army_text = ", ".join([f"{k}: {v}" for k, v in status['human_army'].items()])
+        ai_army_text = ", ".join([f"{k}: {v}" for k, v in status['ai_army'].items()])
+        
+        self.human_army_label.config(text=f"Your Army: {human_army_text}")
+        self.ai_army_label.config(text=f"AI Army: {ai_army_text}")
+        
+        map_text = ""
+        for location, data in status['map_locations'].items():
+            owner = data['owner'] or 'neutral'
+            map_text += f"{location.title()}: {owner}  "
+        self.map_label.config(text=map_text)
+        
+    def show_game_over(self):
+        """Show game over dialog"""
+        winner = self.engine.state.winner
+        if winner == "human":
+            messagebox.showinfo("Victory!", "Congratulations! You defeated the AI!")
+        else:
+            messagebox.showinfo("Defeat", "The AI has conquered your forces!")
+            
+    def log(self, message):
+        """Add message to game log"""
+        self.log_text.insert("end", f"{message}\n")
+        self.log_text.see("end")
+        self.root.update_idletasks()
+        
+    def run(self):
+        """Run the game"""
+        self.root.mainloop()
+
+def main():
+    """Launch the simulator game window"""
+    game = GameUI()
+    game.run()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Heroes of Might & Magic III Screen Vision
+Cached multi-scale template matching for screen-state detection
+"""
+
+import os
+from collections import OrderedDict
+import cv2
+import numpy as np
+
+# Screen-state templates and the capture region each one is searched in
+SCREEN_TEMPLATES = {
+    "end_turn": "end_turn_button",
+    "hero_selected": "hero_portraits",
+    "town_screen": "town_exit_button",
+    "combat_screen": "combat_controls"
+}
+
+MIN_PYRAMID_SIZE = 8  # Smallest template side worth matching at a coarse level
+
+def to_gray(image):
+    """Grayscale view of an RGB, RGBA or already gray image"""
+    if image.ndim == 2:
+        return image
+    if image.shape[2] == 4:
+        return cv2.cvtColor(image, cv2.COLOR_RGBA2GRAY)
+    return cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+
+def build_pyramid(image, levels):
+    """Image pyramid from full resolution down, stopping before it gets too small"""
+    pyramid = [image]
+    while len(pyramid) < levels and min(pyramid[-1].shape[:2]) // 2 >= MIN_PYRAMID_SIZE:
+        pyramid.append(cv2.pyrDown(pyramid[-1]))
+    return pyramid
+
+class TemplateMatcher:
+    """Preloaded template pyramids matched coarse-to-fine inside capture regions"""
+    
+    def __init__(self, template_dir=None, scale=1.0, levels=3, threshold=0.8):
+        self.scale = scale  # Game window size relative to the 800x600 templates
+        self.levels = levels
+        self.threshold = threshold
+        self.templates = {}  # name -> grayscale pyramid, finest level first
+        if template_dir and os.path.isdir(template_dir):
+            self.load_folder(template_dir)
+    
+    def load_folder(self, template_dir):
+        """Load every <name>.png in a folder as a template"""
+        for filename in sorted(os.listdir(template_dir)):
+            name, ext = os.path.splitext(filename)
+            if ext.lower() != ".png":
+                continue
+            image = cv2.imread(os.path.join(template_dir, filename), cv2.IMREAD_GRAYSCALE)
+            if image is not None:
+                self.add_template(name, image)
+    
+    def add_template(self, name, image):
+        """Cache a template's scaled pyramid under a name"""
+        gray = to_gray(np.asarray(image, dtype=np.uint8))
+        if self.scale != 1.0:
+            size = (max(1, round(gray.shape[1] * self.scale)), max(1, round(gray.shape[0] * self.scale)))
+            gray = cv2.resize(gray, size, interpolation=cv2.INTER_AREA)
+        self.templates[name] = build_pyramid(gray, self.levels)
+    
+    def has_template(self, name):
+        """Whether a template with this name is loaded"""
+        return name in self.templates
+    
+    def match(self, name, region):
+        """Best (confidence, (x, y)) of a template inside a region image"""
+        template_pyramid = self.templates[name]
+        template = template_pyramid[0]
+        gray = to_gray(region)
+        if gray.shape[0] < template.shape[0] or gray.shape[1] < template.shape[1]:
+            return 0.0, None
+        
+        # Coarsest level where both the template and the region still fit
+        region_pyramid = build_pyramid(gray, len(template_pyramid))
+        level = min(len(template_pyramid), len(region_pyramid)) - 1
+        while level > 0 and (region_pyramid[level].shape[0] < template_pyramid[level].shape[0] or
+                             region_pyramid[level].shape[1] < template_pyramid[level].shape[1]):
+            level -= 1
+        
+        scores = cv2.matchTemplate(region_pyramid[level], template_pyramid[level], cv2.TM_CCOEFF_NORMED)
+        _, confidence, _, (x, y) = cv2.minMaxLoc(np.nan_to_num(scores, nan=0.0, posinf=0.0, neginf=0.0))
+        
+        # Refine down the pyramid in a small window around the coarse hit
+        while level > 0:
+            level -= 1
+            x, y = x * 2, y * 2
+            image = region_pyramid[level]
+            template = template_pyramid[level]
+            margin = 2
+            x0, y0 = max(0, x - margin), max(0, y - margin)
+            x1 = min(image.shape[1], x + template.shape[1] + margin)
+            y1 = min(image.shape[0], y + template.shape[0] + margin)
+            window = image[y0:y1, x0:x1]
+            if window.shape[0] < template.shape[0] or window.shape[1] < template.shape[1]:
+                continue
+            scores = cv2.matchTemplate(window, template, cv2.TM_CCOEFF_NORMED)
+            _, confidence, _, (dx, dy) = cv2.minMaxLoc(np.nan_to_num(scores, nan=0.0, posinf=0.0, neginf=0.0))
+            x, y = x0 + dx, y0 + dy
+        
+        return float(confidence), (x, y)
+    
+    def detect(self, name, regions):
+        """Confidence that a screen template is visible, or None if it is not loaded"""
+        if name not in self.templates:
+            return None
+        region = regions.get(SCREEN_TEMPLATES.get(name))
+        if region is None:
+            return None
+        confidence, _ = self.match(name, region)
+        return confidence
+
+def dhash(image):
+    """64-bit difference hash of an image region"""
+    small = cv2.resize(to_gray(image), (9, 8), interpolation=cv2.INTER_AREA)
+    bits = small[:, 1:] > small[:, :-1]
+    return int.from_bytes(np.packbits(bits).tobytes(), "big")
+
+class ScreenClassCache:
+    """Bounded LRU map from perceptual hashes of key regions to screen classifications"""
+    
+    def __init__(self, capacity=256, high=0.85, low=0.4):
+        self.capacity = capacity
+        self.high = high  # Confidences at or above this are a clear match
+        self.low = low  # Confidences at or below this are a clear miss
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def key(self, regions, region_names):
+        """Hash the named regions into a cache key"""
+        return tuple(dhash(regions[name]) for name in region_names)
+    
+    def get(self, key):
+        """Cached (fields, confidences) for a key, or None"""
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def put(self, key, fields, confidences):
+        """Cache a classification if every confidence is decisive; True if stored"""
+        if not confidences or any(self.low < value < self.high for value in confidences.values()):
+            return False
+        self.entries[key] = (dict(fields), dict(confidences))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+        return True
+    
+    def clear(self):
+        """Forget every cached classification"""
+        self.entries.clear()
+
+# Digit fields of the seven resources, as (x, width) inside the 800x600 resource bar region
+RESOURCE_FIELDS = (
+    ("wood", 33, 46),
+    ("mercury", 117, 46),
+    ("ore", 201, 46),
+    ("sulfur", 285, 46),
+    ("crystal", 369, 46),
+    ("gems", 453, 46),
+    ("gold", 537, 58)
+)
+
+RESOURCE_BAR_SIZE = (597, 20)  # Reference (width, height) of the resource bar region
+
+def glyph_key(mask):
+    """Lookup key of a cropped binary glyph: its shape plus packed pixels"""
+    return mask.shape, np.packbits(mask).tobytes()
+
+def split_glyphs(mask):
+    """Crop a binary text mask into per-character masks, left to right"""
+    rows = np.flatnonzero(mask.any(axis=1))
+    if rows.size == 0:
+        return []
+    mask = mask[rows[0]:rows[-1] + 1]
+    
+    columns = mask.any(axis=0)
+    glyphs = []
+    start = None
+    for x, ink in enumerate(columns):
+        if ink and start is None:
+            start = x
+        elif not ink and start is not None:
+            glyphs.append(mask[:, start:x])
+            start = None
+    if start is not None:
+        glyphs.append(mask[:, start:])
+    return glyphs
+
+class ResourceReader:
+    """Reads resource bar numbers from glyph masks through a lookup table"""
+    
+    def __init__(self, glyph_dir=None, ink_threshold=160):
+        self.ink_threshold = ink_threshold  # Gray level above which a pixel is text
+        self.lookup = {}  # glyph key -> digit character
+        self.masks = []  # (digit, mask) for nearest-match fallback
+        self.previous = {}  # resource -> (field pixels, value) from the last read
+        if glyph_dir and os.path.isdir(glyph_dir):
+            self.load_folder(glyph_dir)
+    
+    def load_folder(self, glyph_dir):
+        """Load 0.png ... 9.png glyph images from a folder"""
+        for digit in "0123456789":
+            path = os.path.join(glyph_dir, f"{digit}.png")
+            if not os.path.exists(path):
+                continue  # cv2.imread warns about every missing file
+            image = cv2.imread(path, cv2.IMREAD_GRAYSCALE)
+            if image is not None:
+                self.add_glyph(digit, image)
+    
+    def add_glyph(self, digit, image):
+        """Register one digit glyph image"""
+        glyphs = split_glyphs(to_gray(np.asarray(image, dtype=np.uint8)) > self.ink_threshold)
+        if len(glyphs) == 1:
+            self.lookup[glyph_key(glyphs[0])] = digit
+            self.masks.append((digit, glyphs[0]))
+    
+    def has_glyphs(self):
+        """Whether any digit glyphs are loaded"""
+        return bool(self.lookup)
+    
+    def read_digit(self, glyph):
+        """Digit for one glyph mask, by exact lookup or the closest same-size mask"""
+        digit = self.lookup.get(glyph_key(glyph))
+        if digit is not None:
+            return digit
+        
+        best_digit, best_distance = None, glyph.size // 4  # Reject anything too far off
+        for candidate, mask in self.masks:
+            if mask.shape == glyph.shape:
+                distance = np.count_nonzero(mask != glyph)
+                if distance < best_distance:
+                    best_digit, best_distance = candidate, distance
+        return best_digit
+    
+    def read_field(self, field):
+        """Integer shown in one field, or None when it cannot be read"""
+        digits = []
+        for glyph in split_glyphs(to_gray(field) > self.ink_threshold):
+            digit = self.read_digit(glyph)
+            if digit is None:
+                return None
+            digits.append(digit)
+        return int("".join(digits)) if digits else None
+    
+    def read(self, resource_bar):
+        """All seven resource amounts from a resource bar capture"""
+        width, height = RESOURCE_BAR_SIZE
+        if resource_bar.shape[:2] != (height, width):
+            resource_bar = cv2.resize(resource_bar, (width, height), interpolation=cv2.INTER_NEAREST)
+        
+        resources = {}
+        for name, x, field_width in RESOURCE_FIELDS:
+            field = resource_bar[:, x:x + field_width]
+            
+            # Digits only change when their pixels do
+            previous = self.previous.get(name)
+            if previous is not None and np.array_equal(previous[0], field):
+                value = previous[1]
+            else:
+                value = self.read_field(field)
+                self.previous[name] = (field.copy(), value)
+            
+            if value is not None:
+                resources[name] = value
+        return resources